@@ -0,0 +1,197 @@
+"""Process pool that runs analyses for the async views.
+
+Extraction and NLP are CPU-bound and hold the GIL, so under ASGI they are
+handed to a bounded ProcessPoolExecutor. Each pool process sets Django up
+once, warms the models and then analyzes stored ResumeAnalysis rows by id.
+The event loop stays free for status, history and results requests.
+
+At most ``ANALYZER_POOL_WORKERS * ANALYZER_POOL_MAX_IN_FLIGHT`` analyses
+are submitted at a time. Further requests wait for a slot up to
+``ANALYZER_POOL_QUEUE_TIMEOUT`` seconds and are then refused with
+PoolBusy, rather than piling up in the executor's unbounded queue.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+# Set in each pool process by _init_worker
+_analyzer = None
+
+
+class PoolBusy(Exception):
+    """Raised when no analysis slot frees up within the queue timeout"""
+
+
+def pool_capacity():
+    return max(1, settings.ANALYZER_POOL_WORKERS) * max(1, settings.ANALYZER_POOL_MAX_IN_FLIGHT)
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+    from .services import create_resume_processor
+    from .utils.model_registry import model_registry
+
+    global _analyzer
+    # Lower priority so request handling wins the CPU when cores are scarce
+    if settings.ANALYZER_POOL_NICE:
+        os.nice(settings.ANALYZER_POOL_NICE)
+    model_registry.warm_up()
+    _analyzer = create_resume_processor()
+
+
+def _run_analysis(analysis_id):
+    from django.db import close_old_connections
+
+    from .models import ResumeAnalysis
+    from .services import complete_from_cache, fail_analyses, run_analysis
+
+    close_old_connections()
+    analysis = ResumeAnalysis.objects.select_related('job_posting').get(id=analysis_id)
+    try:
+        if not complete_from_cache(analysis):
+            run_analysis(analysis, _analyzer)
+    except Exception as e:
+        fail_analyses([analysis], e)
+        raise
+    return analysis.status
+
+
+def _run_batch(job_posting_id, analysis_ids):
+    from django.db import close_old_connections
+
+    from .models import JobPosting, ResumeAnalysis
+    from .services import screen_analyses
+
+    close_old_connections()
+    job_posting = JobPosting.objects.get(id=job_posting_id)
+    analyses = list(ResumeAnalysis.objects.filter(id__in=analysis_ids).order_by('id'))
+    return [(analysis.id, analysis.rank) for analysis in screen_analyses(job_posting, analyses, _analyzer)]
+
+
+def _run_match(resume_file_path, k):
+    from django.db import close_old_connections
+
+    from .matching import match_resume_to_postings
+
+    close_old_connections()
+    return match_resume_to_postings(resume_file_path, k=k, analyzer=_analyzer)
+
+
+def _compute_job_features(job_posting_id):
+    from django.db import close_old_connections
+
+    from .models import JobPosting
+    from .services import get_job_features
+
+    close_old_connections()
+    get_job_features(JobPosting.objects.get(id=job_posting_id), _analyzer)
+
+
+def get_executor():
+    """The shared pool, started on first use ("spawn" keeps it clear of the server's threads)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.ANALYZER_POOL_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+            logger.info(f"Started analysis pool with {settings.ANALYZER_POOL_WORKERS} processes")
+        return _executor
+
+
+def _reset_executor(broken):
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _try_acquire():
+    global _in_flight
+    with _in_flight_lock:
+        if _in_flight >= pool_capacity():
+            return False
+        _in_flight += 1
+        return True
+
+
+def _release():
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight -= 1
+
+
+def in_flight():
+    return _in_flight
+
+
+async def _acquire_slot(timeout):
+    # Polled rather than an asyncio.Semaphore, which is tied to one event
+    # loop; under WSGI every async request runs in a loop of its own.
+    deadline = time.monotonic() + timeout
+    while not _try_acquire():
+        if time.monotonic() >= deadline:
+            raise PoolBusy(f"All {pool_capacity()} analysis slots are busy")
+        await asyncio.sleep(0.05)
+
+
+async def _submit(func, *args):
+    if settings.ANALYZER_POOL_WORKERS <= 0:
+        # No pool: run in a worker thread (development and tests)
+        global _analyzer
+        if _analyzer is None:
+            from .services import create_resume_processor
+            _analyzer = create_resume_processor()
+        return await sync_to_async(func, thread_sensitive=False)(*args)
+
+    await _acquire_slot(settings.ANALYZER_POOL_QUEUE_TIMEOUT)
+    executor = get_executor()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        # A pool process died (e.g. killed for memory); start a fresh pool next time
+        logger.error("Analysis pool broke, restarting it")
+        _reset_executor(executor)
+        raise
+    finally:
+        _release()
+
+
+async def analyze_in_pool(analysis_id):
+    """Analyze a stored ResumeAnalysis in the pool; returns its final status"""
+    return await _submit(_run_analysis, analysis_id)
+
+
+async def screen_in_pool(job_posting_id, analysis_ids):
+    """Screen stored analyses against a job posting in one pool task; returns (id, rank) pairs"""
+    return await _submit(_run_batch, job_posting_id, analysis_ids)
+
+
+async def match_in_pool(resume_file_path, k=None):
+    """Rank open job postings for a resume file in the pool; returns ``(matches, elapsed_ms)``"""
+    return await _submit(_run_match, resume_file_path, k)
+
+
+async def job_features_in_pool(job_posting_id):
+    """Compute and store a posting's keywords and embedding in the pool"""
+    return await _submit(_compute_job_features, job_posting_id)
@@ -0,0 +1,27 @@
+import logging
+import os
+
+from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyzerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'analyzer'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        # Uploads are streamed here before being moved into MEDIA_ROOT
+        os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+
+        # Load models at worker boot instead of on the first analysis
+        if settings.ANALYZER_PRELOAD_MODELS:
+            from .utils.model_registry import model_registry
+
+            try:
+                model_registry.warm_up()
+            except Exception as e:
+                logger.error(f"Model warm-up failed, models will load on first use: {str(e)}")
@@ -0,0 +1,136 @@
+"""Candidate search: rank every stored resume against a job posting.
+
+Completed analyses keep the resume embedding, so a posting can be matched
+against all past applicants without touching the model again. The vectors
+live in a per-process nearest-neighbour index that loads everything once
+and afterwards only pulls analyses completed since its last refresh.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+
+from .models import ResumeAnalysis
+from .services import get_job_features
+from .utils.embeddings import RESUME_EMBEDDING_DTYPE, embedding_from_bytes
+from .utils.nlp_processor import embedding_model_version
+from .utils.vector_index import create_index
+
+logger = logging.getLogger(__name__)
+
+# Re-read analyses completed shortly before the last refresh, in case their
+# transaction committed after it ran
+REFRESH_OVERLAP = timedelta(seconds=60)
+LOAD_CHUNK_SIZE = 5000
+# Extra hits fetched so analyses dropped since indexing don't shorten the list
+SEARCH_OVERFETCH = 10
+
+
+class CandidateIndex:
+    """Resume embeddings of completed analyses, refreshed incrementally"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._version = None
+        self._watermark = None
+
+    def __len__(self):
+        return len(self._index) if self._index is not None else 0
+
+    def refresh(self):
+        """Add analyses completed since the last refresh; returns how many were read"""
+        with self._lock:
+            version = embedding_model_version()
+            if version != self._version:
+                # Vectors from another model are not comparable: start over
+                self._index = None
+                self._version = version
+                self._watermark = None
+
+            analyses = ResumeAnalysis.objects.filter(
+                status=ResumeAnalysis.STATUS_COMPLETED,
+                embedding_version=version,
+                embedding__isnull=False
+            )
+            if self._watermark is not None:
+                analyses = analyses.filter(completed_at__gte=self._watermark - REFRESH_OVERLAP)
+
+            loaded = 0
+            ids, vectors = [], []
+            watermark = self._watermark
+            for analysis_id, embedding, completed_at in analyses.values_list(
+                'id', 'embedding', 'completed_at'
+            ).iterator(chunk_size=LOAD_CHUNK_SIZE):
+                ids.append(analysis_id)
+                vectors.append(embedding_from_bytes(embedding, RESUME_EMBEDDING_DTYPE))
+                if completed_at and (watermark is None or completed_at > watermark):
+                    watermark = completed_at
+                if len(ids) == LOAD_CHUNK_SIZE:
+                    self._add(ids, vectors)
+                    loaded += len(ids)
+                    ids, vectors = [], []
+
+            if ids:
+                self._add(ids, vectors)
+                loaded += len(ids)
+            self._watermark = watermark
+            return loaded
+
+    def search(self, embedding, k):
+        """Top-k ``(analysis_id, score)`` pairs for a query embedding"""
+        self.refresh()
+        with self._lock:
+            if self._index is None:
+                return []
+            return self._index.search(embedding, k)
+
+    def remove(self, ids):
+        """Drop analyses that were deleted or are no longer completed"""
+        with self._lock:
+            if self._index is not None:
+                self._index.remove(ids)
+
+    def _add(self, ids, vectors):
+        matrix = np.vstack(vectors)
+        if self._index is None:
+            self._index = create_index(settings.ANALYZER_VECTOR_INDEX, matrix.shape[1])
+        self._index.add(ids, matrix)
+
+
+candidate_index = CandidateIndex()
+
+
+def find_candidates(job_posting, k=None, analyzer=None):
+    """Best-matching stored resumes for a job posting.
+
+    Returns ``(results, elapsed_ms)`` where results are ``(analysis, score)``
+    pairs, best first; ``score`` is the cosine similarity in [-1, 1].
+    """
+    k = k or settings.ANALYZER_CANDIDATES_TOP_K
+    features = get_job_features(job_posting, analyzer)
+
+    start = time.perf_counter()
+    while True:
+        hits = candidate_index.search(features['embedding'], k + SEARCH_OVERFETCH)
+        analyses = ResumeAnalysis.objects.filter(status=ResumeAnalysis.STATUS_COMPLETED).select_related(
+            'job_posting'
+        ).defer('embedding').in_bulk([analysis_id for analysis_id, _ in hits])
+        results = [
+            (analyses[analysis_id], score) for analysis_id, score in hits if analysis_id in analyses
+        ][:k]
+
+        # Deleted or re-queued since they were indexed; a re-scored analysis
+        # comes back with the refresh after it completes
+        dropped = [analysis_id for analysis_id, _ in hits if analysis_id not in analyses]
+        if dropped:
+            candidate_index.remove(dropped)
+        if not dropped or len(results) >= k:
+            break
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    logger.info(f"Candidate search over {len(candidate_index)} resumes took {elapsed_ms:.1f}ms")
+    return results, elapsed_ms
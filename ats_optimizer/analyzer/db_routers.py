@@ -0,0 +1,61 @@
+"""Routing of read-heavy pages to an optional read replica.
+
+Writes always go to the primary ("default"). Reads of analyzer models go
+to the "replica" database only inside ``replica_reads()``, which
+ReplicaReadMixin wraps around the results and history views, and only when
+DATABASE_REPLICA_URL configured one. Everything else reads from the primary, so code that
+writes and then reads back never sees replication lag.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = 'replica'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    """Send the reads made inside the block to the replica, if there is one"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaReadMixin:
+    """Serve a view's queries from the read replica"""
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Related objects come from the database their parent came from
+            return instance._state.db
+        # Sessions and auth stay on the primary: a fresh session may not be replicated yet
+        if _replica_reads.get() and model._meta.app_label == 'analyzer' and replica_configured():
+            return REPLICA_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DB_ALIAS
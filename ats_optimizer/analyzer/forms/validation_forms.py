@@ -1,4 +1,5 @@
 from django import forms
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from ..models import JobPosting
 
@@ -156,3 +157,88 @@ class CombinedUploadForm(forms.Form):
             raise ValidationError("Job description must be at least 50 characters long.")
         
         return job_description.strip()
+
+class MultipleFileInput(forms.ClearableFileInput):
+    """File input that accepts several files at once"""
+    
+    allow_multiple_selected = True
+
+class MultipleFileField(forms.FileField):
+    """File field that cleans a list of uploaded files"""
+    
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('widget', MultipleFileInput())
+        super().__init__(*args, **kwargs)
+    
+    def clean(self, data, initial=None):
+        single_file_clean = super().clean
+        if isinstance(data, (list, tuple)):
+            return [single_file_clean(item, initial) for item in data]
+        return [single_file_clean(data, initial)]
+
+class BatchUploadForm(CombinedUploadForm):
+    """Job posting plus many resumes to screen against it"""
+    
+    resume_file = None
+    resume_files = MultipleFileField(
+        widget=MultipleFileInput(attrs={
+            'class': 'form-control',
+            'accept': '.pdf,.docx,.txt'
+        })
+    )
+    
+    def clean_resume_files(self):
+        """Validate every uploaded resume"""
+        resume_files = self.cleaned_data.get('resume_files') or []
+        
+        if not resume_files:
+            raise ValidationError("Please select at least one resume file to upload.")
+        
+        if len(resume_files) > settings.ANALYZER_MAX_BATCH_FILES:
+            raise ValidationError(
+                f"You can screen at most {settings.ANALYZER_MAX_BATCH_FILES} resumes at once."
+            )
+        
+        allowed_extensions = ['.pdf', '.docx', '.txt']
+        for resume_file in resume_files:
+            if resume_file.size > 10 * 1024 * 1024:
+                raise ValidationError(f"{resume_file.name}: file size cannot exceed 10MB.")
+            
+            if not any(resume_file.name.lower().endswith(ext) for ext in allowed_extensions):
+                raise ValidationError(f"{resume_file.name}: only PDF, DOCX, and TXT files are allowed.")
+        
+        return resume_files
+
+class AnalysisAPIForm(CombinedUploadForm):
+    """One resume plus either job fields or the id of an existing job posting"""
+    
+    job_posting_id = forms.IntegerField(required=False)
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in ['job_title', 'company_name', 'job_description']:
+            self.fields[name].required = False
+    
+    def clean_job_description(self):
+        """Validate the job description when one is given"""
+        if not self.cleaned_data.get('job_description'):
+            return ''
+        return super().clean_job_description()
+    
+    def clean(self):
+        """Resolve the job posting, or require the fields to create one"""
+        cleaned_data = super().clean()
+        job_posting_id = cleaned_data.get('job_posting_id')
+        
+        if job_posting_id is not None:
+            try:
+                cleaned_data['job_posting'] = JobPosting.objects.get(id=job_posting_id)
+            except JobPosting.DoesNotExist:
+                self.add_error('job_posting_id', "Job posting not found.")
+        else:
+            cleaned_data['job_posting'] = None
+            for name in ['job_title', 'company_name', 'job_description']:
+                if not cleaned_data.get(name) and name not in self.errors:
+                    self.add_error(name, "This field is required unless job_posting_id is given.")
+        
+        return cleaned_data
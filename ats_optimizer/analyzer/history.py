@@ -0,0 +1,80 @@
+"""Keyset (cursor) pagination over the analysis history.
+
+Pages are ordered by ``(created_at, id)`` descending and each page is
+fetched with a ``WHERE (created_at, id) < cursor ... LIMIT n+1`` query on
+the composite index, so page 10,000 costs the same as page 1. There is no
+OFFSET and no COUNT. Large columns are deferred and the job posting comes
+from the same query.
+"""
+import base64
+from collections import namedtuple
+from datetime import datetime
+
+from django.db.models import Q
+
+from .models import ResumeAnalysis
+
+HISTORY_DEFERRED_FIELDS = [
+    'feedback', 'embedding', 'section_scores', 'matching_keywords', 'missing_keywords',
+    'skills', 'job_posting__description', 'job_posting__keywords', 'job_posting__embedding',
+]
+
+# items: analyses newest first; a cursor is None when there is no page in that direction
+HistoryPage = namedtuple('HistoryPage', ['items', 'next_cursor', 'previous_cursor'])
+
+
+class CursorError(ValueError):
+    """Raised for cursors that were not produced by encode_cursor"""
+
+
+def encode_cursor(analysis):
+    value = f"{analysis.created_at.isoformat()}|{analysis.id}"
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, analysis_id = value.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(analysis_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise CursorError(f"Invalid cursor: {cursor}") from e
+
+
+def history_queryset():
+    return ResumeAnalysis.objects.select_related('job_posting').defer(*HISTORY_DEFERRED_FIELDS)
+
+
+def history_page(queryset=None, after=None, before=None, page_size=20):
+    """One page of analyses, newest first.
+
+    ``after`` continues with older analyses than the cursor (the next page)
+    and ``before`` goes back to newer ones (the previous page); with neither
+    the newest analyses are returned.
+    """
+    queryset = history_queryset() if queryset is None else queryset
+
+    if before:
+        created_at, analysis_id = decode_cursor(before)
+        rows = list(queryset.filter(
+            Q(created_at__gt=created_at) | Q(id__gt=analysis_id), created_at__gte=created_at
+        ).order_by('created_at', 'id')[:page_size + 1])
+        if len(rows) <= page_size:
+            # Back at the newest analyses: show a full first page
+            return history_page(queryset, page_size=page_size)
+        items = rows[:page_size][::-1]
+        return HistoryPage(items, encode_cursor(items[-1]), encode_cursor(items[0]))
+
+    if after:
+        created_at, analysis_id = decode_cursor(after)
+        # The bare created_at bound lets the database seek the index
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(id__lt=analysis_id), created_at__lte=created_at
+        )
+    rows = list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+    items = rows[:page_size]
+    return HistoryPage(
+        items,
+        encode_cursor(items[-1]) if len(rows) > page_size else None,
+        encode_cursor(items[0]) if items and after else None,
+    )
@@ -0,0 +1,281 @@
+"""Bulk ingestion of resumes from a directory or zip archive.
+
+Files are read one at a time (zip members straight from the archive) and
+saved to storage under a content-addressed name. A process pool, sized to
+the cores, analyzes them, and the results (and their parsed texts) are
+written with ``bulk_create`` in batches. bulk_create sends no post_save signals, so each batch is added
+to the keyword index explicitly.
+
+After each batch, the names of the files it contained are recorded in a
+JSON checkpoint, and an interrupted run resumes where it stopped. Storage
+names are content-addressed, so a batch that was written just before a
+crash is recognised and not inserted twice.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import defaultdict, namedtuple
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+
+from .metrics import stage_totals, timed
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+MAX_FILE_BYTES = 10 * 1024 * 1024
+
+# name: path inside the source, read: returns the file's bytes
+SourceFile = namedtuple('SourceFile', ['name', 'size', 'read'])
+
+# Set in each pool process by _init_worker
+_analyzer = None
+_job_description = None
+_job_features = None
+
+
+def file_format(name):
+    return os.path.splitext(name)[1].lower().lstrip('.') or 'none'
+
+
+def iter_source(path):
+    """Files of a directory (recursively) or zip archive in name order, without unpacking"""
+    if zipfile.is_zipfile(path):
+        # Closed when the generator finishes or is closed early
+        with zipfile.ZipFile(path) as archive:
+            members = sorted(
+                (info for info in archive.infolist()
+                 if not info.is_dir() and not info.filename.startswith('__MACOSX/')),
+                key=lambda info: info.filename
+            )
+            for info in members:
+                yield SourceFile(info.filename, info.file_size, lambda info=info: archive.read(info))
+        return
+
+    if not os.path.isdir(path):
+        raise ValueError(f"{path} is neither a directory nor a zip archive")
+    names = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        names.extend(
+            os.path.relpath(os.path.join(root, name), path) for name in files if not name.startswith('.')
+        )
+    for name in sorted(names):
+        full_path = os.path.join(path, name)
+
+        def read(full_path=full_path):
+            with open(full_path, 'rb') as f:
+                return f.read()
+
+        yield SourceFile(name, os.path.getsize(full_path), read)
+
+
+def default_checkpoint_path(source, job_posting_id):
+    source_id = hashlib.sha256(os.path.abspath(source).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(settings.MEDIA_ROOT, 'ingest', f'job{job_posting_id}-{source_id}.json')
+
+
+class Checkpoint:
+    """Names of the source files already ingested, saved after every batch"""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f)['done'])
+
+    def save(self, names):
+        self.done.update(names)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump({'done': sorted(self.done)}, f)
+        os.replace(temp_path, self.path)  # Never leave a half-written checkpoint
+
+
+def store_file(name, content):
+    """Save file bytes under a content-addressed name; returns the storage name"""
+    digest = hashlib.sha256(content).hexdigest()
+    storage_name = f"resumes/ingest/{digest[:24]}-{get_valid_filename(os.path.basename(name))}"
+    if not default_storage.exists(storage_name):
+        storage_name = default_storage.save(storage_name, ContentFile(content))
+    return storage_name
+
+
+def _init_worker(job_posting_id):
+    import django
+    django.setup()
+
+    from .models import JobPosting
+    from .services import create_resume_processor, get_job_features
+
+    global _analyzer, _job_description, _job_features
+    _analyzer = create_resume_processor()
+    job_posting = JobPosting.objects.get(id=job_posting_id)
+    _job_description = job_posting.description
+    _job_features = get_job_features(job_posting, _analyzer)
+
+
+def _analyze_file(storage_name):
+    """Pool task: analyze one stored file; returns the result and the stage time it took"""
+    before = stage_totals()
+    result = _analyzer.analyze_resume(
+        default_storage.path(storage_name), _job_description, job_features=_job_features
+    )
+    after = stage_totals()
+    stages = {
+        stage: (seconds - before.get(stage, (0.0, 0))[0], count - before.get(stage, (0.0, 0))[1])
+        for stage, (seconds, count) in after.items()
+    }
+    return result, stages
+
+
+class IngestReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seen = 0
+        self.skipped = 0
+        self.created = 0
+        self.completed = 0
+        self.formats = defaultdict(lambda: defaultdict(int))
+        self.stages = defaultdict(lambda: [0.0, 0])
+
+    def count(self, name, outcome):
+        self.formats[file_format(name)][outcome] += 1
+
+    def add_stages(self, stages):
+        for stage, (seconds, count) in stages.items():
+            self.stages[stage][0] += seconds
+            self.stages[stage][1] += count
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def files_per_second(self):
+        processed = self.seen - self.skipped
+        return processed / self.elapsed if self.elapsed else 0.0
+
+
+def ingest(source, job_posting, checkpoint, workers=None, batch_size=200, progress=None):
+    """Analyze every supported file in ``source`` against ``job_posting``; returns an IngestReport"""
+    # Imported here: pool processes load this module before Django is set up
+    from .keyword_index import index_analyses
+    from .models import ResumeAnalysis, ResumeText
+    from .services import apply_result
+
+    workers = workers or os.cpu_count() or 1
+    report = IngestReport()
+    pending = {}  # future -> (source name, storage name)
+    rows = []  # (source name, analysis, parsed text)
+
+    def write_batch():
+        if not rows:
+            return
+        names = [name for name, _, _ in rows]
+        with timed('ingest_write'), transaction.atomic():
+            existing = set(ResumeAnalysis.objects.filter(
+                job_posting=job_posting,
+                resume_file__in=[analysis.resume_file.name for _, analysis, _ in rows]
+            ).values_list('resume_file', flat=True))
+            new_rows = [
+                (analysis, text) for _, analysis, text in rows if analysis.resume_file.name not in existing
+            ]
+            new = [analysis for analysis, _ in new_rows]
+            stored_texts = ResumeText.objects.store_many([text for _, text in new_rows])
+            for analysis, stored_text in zip(new, stored_texts):
+                analysis.stored_text = stored_text
+            # Stamped at insert, not when the result arrived: CandidateIndex.refresh
+            # only looks a short way behind its completed_at watermark
+            completed_at = timezone.now()
+            for analysis in new:
+                analysis.completed_at = completed_at
+            created = ResumeAnalysis.objects.bulk_create(new)
+            index_analyses(created)
+        checkpoint.save(names)
+        report.created += len(created)
+        rows.clear()
+
+    def collect(futures):
+        for future in futures:
+            name, storage_name = pending.pop(future)
+            try:
+                result, stages = future.result()
+            except Exception as e:
+                logger.error(f"Ingesting {name} failed: {str(e)}")
+                report.count(name, 'error')
+                continue
+
+            report.add_stages(stages)
+            analysis = ResumeAnalysis(
+                job_posting=job_posting, resume_file=storage_name, attempts=1, started_at=timezone.now()
+            )
+            apply_result(analysis, result, store_text=False)
+            report.count(name, analysis.status)
+            if analysis.status == ResumeAnalysis.STATUS_COMPLETED:
+                report.completed += 1
+            rows.append((name, analysis, result['resume_text']))
+            if len(rows) >= batch_size:
+                write_batch()
+
+        if progress:
+            progress(report)
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(job_posting.id,)
+    )
+    try:
+        with closing(iter_source(source)) as source_files:
+            for source_file in source_files:
+                report.seen += 1
+                if source_file.name in checkpoint.done:
+                    report.skipped += 1
+                    continue
+                if not source_file.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    report.count(source_file.name, 'unsupported')
+                    continue
+                if source_file.size > MAX_FILE_BYTES:
+                    report.count(source_file.name, 'too_large')
+                    continue
+
+                try:
+                    with timed('ingest_store', file_format(source_file.name)):
+                        storage_name = store_file(source_file.name, source_file.read())
+                except (OSError, zipfile.BadZipFile) as e:
+                    logger.error(f"Reading {source_file.name} failed: {str(e)}")
+                    report.count(source_file.name, 'unreadable')
+                    continue
+
+                pending[executor.submit(_analyze_file, storage_name)] = (source_file.name, storage_name)
+                # Keep a few files per process queued without reading the whole source ahead
+                if len(pending) >= workers * 4:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+        write_batch()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    report.add_stages({
+        stage: totals for stage, totals in stage_totals().items() if stage.startswith('ingest_')
+    })
+    return report
@@ -0,0 +1,160 @@
+"""Database-backed analysis job queue.
+
+Each ResumeAnalysis row is its own job: it is created as ``pending`` at
+upload time, claimed by a worker (``manage.py run_analysis_worker``) with a
+conditional UPDATE so two workers can never take the same row, and finished
+as ``completed`` or ``failed``.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .metrics import JOBS, timed
+from .models import ResumeAnalysis
+from .services import complete_from_cache, create_resume_processor, refresh_job_features, run_analysis
+
+logger = logging.getLogger(__name__)
+
+CLAIM_CANDIDATES = 10
+
+
+def enqueue_analysis(job_posting, resume_file):
+    """Create a pending analysis for an uploaded resume.
+
+    A resume already analyzed against the same job is completed straight
+    from the result cache and never reaches the queue.
+    """
+    analysis = ResumeAnalysis.objects.create(
+        job_posting=job_posting,
+        resume_file=resume_file,
+        status=ResumeAnalysis.STATUS_PENDING
+    )
+
+    try:
+        complete_from_cache(analysis)
+    except Exception as e:
+        logger.warning(f"Result cache lookup failed for analysis {analysis.id}: {str(e)}")
+    return analysis
+
+
+def claim_next_job():
+    """Atomically mark the oldest pending analysis as processing and return it"""
+    candidate_ids = (
+        ResumeAnalysis.objects
+        .filter(status=ResumeAnalysis.STATUS_PENDING)
+        .order_by('created_at')
+        .values_list('id', flat=True)[:CLAIM_CANDIDATES]
+    )
+
+    for analysis_id in candidate_ids:
+        claimed = ResumeAnalysis.objects.filter(
+            id=analysis_id,
+            status=ResumeAnalysis.STATUS_PENDING
+        ).update(
+            status=ResumeAnalysis.STATUS_PROCESSING,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1
+        )
+        if claimed:
+            return ResumeAnalysis.objects.select_related('job_posting').get(id=analysis_id)
+
+    return None
+
+
+def process_job(analysis, analyzer=None):
+    """Run a claimed analysis, re-queueing it if it crashes and retries are left.
+
+    An analysis that finishes as failed (e.g. an unreadable file) would fail
+    the same way again, so only crashes, such as model or database errors,
+    are retried.
+    """
+    with timed('job') as span:
+        try:
+            run_analysis(analysis, analyzer)
+            outcome = 'completed' if analysis.status == ResumeAnalysis.STATUS_COMPLETED else 'failed'
+        except Exception as e:
+            logger.error(f"Analysis {analysis.id} crashed: {str(e)}")
+            analysis.feedback = f"Analysis failed: {str(e)}"
+            if analysis.attempts <= settings.ANALYZER_JOB_MAX_RETRIES:
+                logger.warning(f"Retrying analysis {analysis.id} (attempt {analysis.attempts})")
+                analysis.status = ResumeAnalysis.STATUS_PENDING
+                analysis.completed_at = None
+                outcome = 'retried'
+            else:
+                analysis.status = ResumeAnalysis.STATUS_FAILED
+                analysis.completed_at = timezone.now()
+                outcome = 'failed'
+            analysis.save(update_fields=['status', 'feedback', 'completed_at'])
+        span['outcome'] = outcome
+
+    JOBS.inc(outcome=outcome)
+    return analysis
+
+
+def reclaim_stuck_jobs():
+    """Return jobs whose worker died to the queue, or fail them when out of retries"""
+    cutoff = timezone.now() - timedelta(seconds=settings.ANALYZER_JOB_STUCK_TIMEOUT)
+    stuck = ResumeAnalysis.objects.filter(
+        status=ResumeAnalysis.STATUS_PROCESSING,
+        started_at__lt=cutoff
+    )
+
+    failed = stuck.filter(attempts__gt=settings.ANALYZER_JOB_MAX_RETRIES).update(
+        status=ResumeAnalysis.STATUS_FAILED,
+        feedback='Analysis failed: the job timed out too many times.',
+        completed_at=timezone.now()
+    )
+    requeued = stuck.update(status=ResumeAnalysis.STATUS_PENDING)
+
+    if failed or requeued:
+        logger.warning(f"Reclaimed stuck jobs: {requeued} re-queued, {failed} failed")
+    return requeued, failed
+
+
+def refresh_stale_postings(analyzer):
+    """Compute one batch of stale job posting features; returns how many were refreshed"""
+    try:
+        return refresh_job_features(analyzer, limit=settings.ANALYZER_BATCH_SIZE)
+    except Exception as e:
+        logger.error(f"Refreshing job posting features failed: {str(e)}")
+        return 0
+
+
+def run_worker(poll_interval=None, stop_when_empty=False, should_stop=None):
+    """Process jobs until stopped; polls the database when the queue is empty.
+
+    Stuck jobs are reclaimed every ANALYZER_JOB_RECLAIM_INTERVAL seconds, so
+    a crashed job is retried even while the queue never runs empty. While
+    idle, the worker computes the features of stale job postings, which
+    reverse matching skips.
+    """
+    poll_interval = poll_interval or settings.ANALYZER_WORKER_POLL_INTERVAL
+    analyzer = create_resume_processor()
+    processed = 0
+    next_reclaim = 0.0
+
+    while not (should_stop and should_stop()):
+        close_old_connections()
+        if time.monotonic() >= next_reclaim:
+            reclaim_stuck_jobs()
+            next_reclaim = time.monotonic() + settings.ANALYZER_JOB_RECLAIM_INTERVAL
+
+        analysis = claim_next_job()
+
+        if analysis is None:
+            if stop_when_empty:
+                break
+            if not refresh_stale_postings(analyzer):
+                time.sleep(poll_interval)
+            continue
+
+        logger.info(f"Processing analysis {analysis.id} (attempt {analysis.attempts})")
+        process_job(analysis, analyzer)
+        processed += 1
+
+    return processed
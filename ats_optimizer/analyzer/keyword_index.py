@@ -0,0 +1,207 @@
+"""Inverted keyword index over completed analyses.
+
+Every completed ResumeAnalysis is indexed under its resume's skills and the
+job keywords it matched (KeywordIndexEntry rows, kept up to date by a
+post_save signal). Boolean queries such as
+``python AND (kubernetes OR docker) NOT java`` are answered by fetching
+the sorted posting list of each term and combining them with sorted-array
+intersections, unions and differences, never touching the analyses
+themselves.
+"""
+import re
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .models import KeywordIndexEntry, ResumeAnalysis
+from .utils.skill_matcher import canonical_skill
+
+KEYWORD_MAX_LENGTH = 100
+OPERATORS = {'AND', 'OR', 'NOT'}
+TOKEN_PATTERN = re.compile(r'"([^"]+)"|(\()|(\))|([^\s()"]+)')
+
+
+class QueryError(ValueError):
+    """Raised for malformed boolean queries"""
+
+
+def analysis_keywords(analysis):
+    """Terms an analysis is indexed under"""
+    terms = set(analysis.skills or []) | set(analysis.matching_keywords or [])
+    return {term.strip().lower()[:KEYWORD_MAX_LENGTH] for term in terms if term and term.strip()}
+
+
+def index_analysis(analysis):
+    """Replace the index entries of one analysis (none unless it is completed)"""
+    with transaction.atomic():
+        KeywordIndexEntry.objects.filter(analysis_id=analysis.id).delete()
+        if analysis.status == ResumeAnalysis.STATUS_COMPLETED:
+            KeywordIndexEntry.objects.bulk_create([
+                KeywordIndexEntry(keyword=keyword, analysis_id=analysis.id)
+                for keyword in analysis_keywords(analysis)
+            ])
+
+
+def index_analyses(analyses, batch_size=5000):
+    """Bulk-insert index entries for analyses that have none yet"""
+    entries = [
+        KeywordIndexEntry(keyword=keyword, analysis_id=analysis.id)
+        for analysis in analyses
+        if analysis.status == ResumeAnalysis.STATUS_COMPLETED
+        for keyword in analysis_keywords(analysis)
+    ]
+    KeywordIndexEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
+
+
+# Query parsing
+
+def tokenize(query):
+    tokens = []
+    for phrase, open_paren, close_paren, word in TOKEN_PATTERN.findall(query):
+        if open_paren or close_paren:
+            tokens.append(open_paren or close_paren)
+        elif word.upper() in OPERATORS:
+            tokens.append(word.upper())
+        else:
+            tokens.append(('TERM', phrase or word))
+    return tokens
+
+
+def parse_query(query):
+    """Parse a boolean query into a nested tuple tree.
+
+    Terms are words or "quoted phrases"; AND binds tighter than OR, NOT
+    applies to the following term or group, and adjacent terms are ANDed.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        raise QueryError("Empty query")
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() == 'OR':
+            take()
+            node = ('OR', node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() not in (None, 'OR', ')'):
+            if peek() == 'AND':
+                take()
+            node = ('AND', node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == 'NOT':
+            take()
+            return ('NOT', parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        token = take() if peek() is not None else None
+        if token == '(':
+            node = parse_or()
+            if peek() != ')':
+                raise QueryError("Missing closing parenthesis")
+            take()
+            return node
+        if isinstance(token, tuple):
+            return ('TERM', canonical_skill(token[1], settings.ANALYZER_SKILL_TAXONOMY))
+        raise QueryError(f"Unexpected {token or 'end of query'}")
+
+    tree = parse_or()
+    if peek() is not None:
+        raise QueryError(f"Unexpected {peek()}")
+    return tree
+
+
+def query_terms(tree):
+    if tree[0] == 'TERM':
+        return {tree[1]}
+    return set().union(*(query_terms(child) for child in tree[1:]))
+
+
+# Evaluation on sorted id arrays. A result is (ids, negated): negated means
+# "every analysis except ids", which lets "a NOT b" run as a difference
+# without materialising the set of all analyses.
+
+def _and(left, right):
+    (a, a_negated), (b, b_negated) = left, right
+    if not a_negated and not b_negated:
+        return np.intersect1d(a, b, assume_unique=True), False
+    if a_negated and b_negated:
+        return np.union1d(a, b), True
+    if a_negated:
+        a, b = b, a
+    return np.setdiff1d(a, b, assume_unique=True), False
+
+
+def _or(left, right):
+    (a, a_negated), (b, b_negated) = left, right
+    if not a_negated and not b_negated:
+        return np.union1d(a, b), False
+    if a_negated and b_negated:
+        return np.intersect1d(a, b, assume_unique=True), True
+    if a_negated:
+        a, b = b, a
+    return np.setdiff1d(b, a, assume_unique=True), True
+
+
+def evaluate(tree, postings, universe):
+    """Evaluate a parsed query.
+
+    ``postings(term)`` returns the sorted id array of a term and
+    ``universe()`` the sorted ids of every indexed analysis; the latter is
+    only called for queries that are negative as a whole ("NOT java").
+    """
+    def visit(node):
+        if node[0] == 'TERM':
+            return postings(node[1]), False
+        if node[0] == 'NOT':
+            ids, negated = visit(node[1])
+            return ids, not negated
+        combine = _and if node[0] == 'AND' else _or
+        return combine(visit(node[1]), visit(node[2]))
+
+    ids, negated = visit(tree)
+    if negated:
+        ids = np.setdiff1d(universe(), ids, assume_unique=True)
+    return ids
+
+
+def load_postings(terms):
+    """Sorted posting lists for the given terms, read from the index table"""
+    postings = {}
+    for term in terms:
+        ids = KeywordIndexEntry.objects.filter(keyword=term).order_by('analysis_id').values_list(
+            'analysis_id', flat=True
+        )
+        postings[term] = np.fromiter(ids.iterator(chunk_size=10000), dtype=np.int64)
+    return postings
+
+
+def all_indexed_ids():
+    ids = ResumeAnalysis.objects.filter(
+        status=ResumeAnalysis.STATUS_COMPLETED
+    ).order_by('id').values_list('id', flat=True)
+    return np.fromiter(ids.iterator(chunk_size=10000), dtype=np.int64)
+
+
+def search(query):
+    """Ids of analyses matching a boolean keyword query, newest first"""
+    tree = parse_query(query)
+    postings = load_postings(query_terms(tree))
+    ids = evaluate(tree, postings.__getitem__, all_indexed_ids)
+    return ids[::-1]
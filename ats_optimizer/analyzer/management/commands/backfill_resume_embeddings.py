@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from ...models import ResumeAnalysis
+from ...utils.content_cache import invalidate_cached_results
+
+
+class Command(BaseCommand):
+    help = (
+        "Store resume embeddings for completed analyses that have none (or one from another model), "
+        "so they show up in candidate search"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=64, help="Analyses encoded per batch")
+
+    def handle(self, *args, **options):
+        from ...utils.embeddings import RESUME_EMBEDDING_DTYPE, embedding_to_bytes, mean_embedding
+        from ...utils.nlp_processor import NLPProcessor, embedding_model_version
+
+        processor = NLPProcessor()
+        version = embedding_model_version()
+        stale = ResumeAnalysis.objects.filter(
+            status=ResumeAnalysis.STATUS_COMPLETED
+        ).exclude(embedding_version=version).exclude(stored_text__isnull=True)
+
+        updated = 0
+        last_id = 0
+        while True:
+            batch = list(stale.filter(id__gt=last_id).order_by('id').select_related('stored_text').only(
+                'id', 'stored_text'
+            )[:options['batch_size']])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            documents = processor.embed_documents([analysis.parsed_text for analysis in batch])
+            for analysis, (chunks, chunk_embeddings) in zip(batch, documents):
+                if chunks:
+                    analysis.embedding = embedding_to_bytes(mean_embedding(chunk_embeddings), RESUME_EMBEDDING_DTYPE)
+                    analysis.embedding_version = version
+            ResumeAnalysis.objects.bulk_update(batch, ['embedding', 'embedding_version'])
+            invalidate_cached_results([analysis.id for analysis in batch])  # bulk_update sends no post_save
+            updated += len(batch)
+            self.stdout.write(f"Embedded {updated} analyses...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {updated} resume embeddings. Running processes pick them up on restart."
+        ))
@@ -0,0 +1,116 @@
+import json
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+TEXT = (
+    "Backend engineer with six years of Python, building Django and Flask services "
+    "containerised with Docker and deployed to AWS."
+)
+
+
+def run_client(mode, requests, texts_per_request, ready, start, results):
+    """One simulated web worker: encode small requests back to back"""
+    import django
+    django.setup()
+
+    from ...utils.embedding_server import EmbeddingClient
+    from ...utils.model_registry import current_rss_mb, load_local_similarity_model
+
+    if mode == 'server':
+        model = EmbeddingClient(settings.ANALYZER_EMBEDDING_SERVER_SOCKET)
+    else:
+        model = load_local_similarity_model()
+    texts = [f"{TEXT} #{index}" for index in range(texts_per_request)]
+    model.encode(texts)
+
+    ready.release()
+    start.wait()
+    for _ in range(requests):
+        model.encode(texts)
+    results.put({'finished_at': time.time(), 'rss_mb': current_rss_mb()})
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare in-process encoding with the shared embedding server: total RSS of the "
+        "clients (plus server) and texts/s with several concurrent clients"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=4, help="Concurrent client processes")
+        parser.add_argument('--requests', type=int, default=50, help="Encode calls per client")
+        parser.add_argument('--texts-per-request', type=int, default=1)
+        parser.add_argument('--modes', default='local,server', help="local, server or both")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        from ...utils.embedding_server import EmbeddingClient
+
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        if set(modes) - {'local', 'server'}:
+            raise CommandError("Modes must be local and/or server")
+
+        report = {}
+        for mode in modes:
+            server_rss = 0.0
+            if mode == 'server':
+                if not settings.ANALYZER_EMBEDDING_SERVER_SOCKET:
+                    raise CommandError("Set ANALYZER_EMBEDDING_SERVER_SOCKET and start run_embedding_server")
+                client = EmbeddingClient(settings.ANALYZER_EMBEDDING_SERVER_SOCKET)
+                try:
+                    stats_before = client.server_stats()
+                except OSError as e:
+                    raise CommandError(f"Embedding server is not reachable: {str(e)}")
+
+            self.stderr.write(f"Running {options['clients']} {mode} clients...")
+            elapsed, client_rss = self._run_clients(mode, options)
+            texts = options['clients'] * options['requests'] * options['texts_per_request']
+            report[mode] = {
+                'clients': options['clients'],
+                'texts': texts,
+                'seconds': round(elapsed, 3),
+                'texts_per_s': round(texts / elapsed, 1),
+                'client_rss_mb': round(client_rss, 1),
+            }
+            if mode == 'server':
+                stats = client.server_stats()
+                server_rss = stats['rss_mb']
+                batches = stats['batches'] - stats_before['batches']
+                report[mode]['server_rss_mb'] = round(server_rss, 1)
+                report[mode]['mean_batch_texts'] = round((stats['texts'] - stats_before['texts']) / max(batches, 1), 1)
+            report[mode]['total_rss_mb'] = round(client_rss + server_rss, 1)
+
+        self.stdout.write(json.dumps(report, indent=2))
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(json.dumps(report, indent=2))
+
+    def _run_clients(self, mode, options):
+        context = multiprocessing.get_context('spawn')
+        ready = context.Semaphore(0)
+        start = context.Event()
+        results = context.Queue()
+        processes = [
+            context.Process(target=run_client, args=(
+                mode, options['requests'], options['texts_per_request'], ready, start, results
+            ))
+            for _ in range(options['clients'])
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            if not ready.acquire(timeout=600):
+                for process in processes:
+                    process.terminate()
+                raise CommandError("Clients did not start; check that the model loads")
+
+        started_at = time.time()
+        start.set()
+        finished = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = max(result['finished_at'] for result in finished) - started_at
+        return elapsed, sum(result['rss_mb'] for result in finished)
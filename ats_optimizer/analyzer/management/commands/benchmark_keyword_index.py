@@ -0,0 +1,94 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...keyword_index import analysis_keywords, index_analyses, parse_query, search
+from ...models import JobPosting, ResumeAnalysis
+from ...utils.skill_matcher import load_taxonomy
+
+QUERIES = [
+    'python AND kubernetes',
+    'python AND kubernetes NOT java',
+    '(react OR angular) AND typescript',
+    '"machine learning" AND python NOT r',
+    'aws OR azure OR gcp',
+    'NOT python',
+]
+
+
+def matches(tree, terms):
+    """Evaluate a parsed query against one analysis' keyword set (the scan baseline)"""
+    if tree[0] == 'TERM':
+        return tree[1] in terms
+    if tree[0] == 'NOT':
+        return not matches(tree[1], terms)
+    if tree[0] == 'AND':
+        return matches(tree[1], terms) and matches(tree[2], terms)
+    return matches(tree[1], terms) or matches(tree[2], terms)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare boolean keyword queries via the inverted index with scanning JSON fields, "
+        "on synthetic analyses that are rolled back afterwards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyses', type=int, default=100000)
+        parser.add_argument('--runs', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        skills = list(load_taxonomy(settings.ANALYZER_SKILL_TAXONOMY))
+        # Popular skills appear far more often than niche ones
+        weights = [1 / (rank + 1) for rank in range(len(skills))]
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            job_posting = JobPosting.objects.create(title='Benchmark', company='Benchmark', description='benchmark')
+            analyses = ResumeAnalysis.objects.bulk_create([
+                ResumeAnalysis(
+                    job_posting=job_posting,
+                    resume_file=f'resumes/benchmark_{index}.txt',
+                    status=ResumeAnalysis.STATUS_COMPLETED,
+                    skills=sorted(set(rng.choices(skills, weights, k=rng.randint(5, 25)))),
+                    matching_keywords=[],
+                )
+                for index in range(options['analyses'])
+            ], batch_size=5000)
+            if analyses[0].id is None:
+                analyses = list(ResumeAnalysis.objects.filter(job_posting=job_posting))
+            entries = index_analyses(analyses)
+            self.stdout.write(
+                f"Created {len(analyses)} analyses with {entries} postings in {time.perf_counter() - start:.1f}s"
+            )
+
+            self.stdout.write(f"{'query':<40}{'hits':>8}{'scan ms':>10}{'index ms':>10}{'speed-up':>10}")
+            for query in QUERIES:
+                tree = parse_query(query)
+                scan_ms, scan_hits = self._time(lambda: self._scan(tree), options['runs'])
+                index_ms, index_hits = self._time(lambda: len(search(query)), options['runs'])
+                if scan_hits != index_hits:
+                    self.stderr.write(f"Result mismatch for {query!r}: scan {scan_hits}, index {index_hits}")
+                self.stdout.write(
+                    f"{query:<40}{index_hits:>8}{scan_ms:>10.1f}{index_ms:>10.1f}{scan_ms / index_ms:>9.1f}x"
+                )
+
+            transaction.set_rollback(True)
+
+    def _scan(self, tree):
+        # What a query costs without the index: load and decode every row's JSON
+        rows = ResumeAnalysis.objects.filter(
+            status=ResumeAnalysis.STATUS_COMPLETED
+        ).only('skills', 'matching_keywords').iterator(chunk_size=5000)
+        return sum(1 for analysis in rows if matches(tree, analysis_keywords(analysis)))
+
+    def _time(self, func, runs):
+        result = func()
+        start = time.perf_counter()
+        for _ in range(runs):
+            func()
+        return (time.perf_counter() - start) * 1000 / runs, result
@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SAMPLE_RESUME = (
+    "Jane Doe - Senior Software Engineer. jane.doe@example.com, (555) 123-4567. "
+    "Experience: Built Django and Flask REST APIs in Python, deployed on AWS with "
+    "Docker and Kubernetes. Led a team of five engineers delivering machine learning "
+    "features for search ranking. Skills: Python, SQL, PostgreSQL, React, TypeScript, "
+    "Git, CI/CD. Education: BSc Computer Science, University of Somewhere. "
+)
+
+
+class Command(BaseCommand):
+    help = "Compare the legacy two-pass spaCy analysis with the single-pass analyze_document"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="Resume files to use instead of the built-in sample")
+        parser.add_argument('--runs', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=8,
+                            help="Times the built-in sample is repeated to make a multi-page resume")
+
+    def handle(self, *args, **options):
+        import spacy
+
+        from ...utils.extract_utils import extract_text_from_file
+        from ...utils.model_registry import resolve_model_path
+        from ...utils.nlp_processor import NLPProcessor
+
+        if options['files']:
+            texts = [extract_text_from_file(path) for path in options['files']]
+        else:
+            texts = [SAMPLE_RESUME * options['repeat']]
+
+        processor = NLPProcessor()
+        # The old code ran the full pipeline (including the parser) twice per resume
+        full_pipeline = spacy.load(resolve_model_path(settings.ANALYZER_SPACY_MODEL))
+
+        def two_pass(text):
+            full_pipeline(text.lower())
+            full_pipeline(text)
+
+        def single_pass(text):
+            processor.analyze_document(text)
+
+        before = self._time(two_pass, texts, options['runs'])
+        after = self._time(single_pass, texts, options['runs'])
+
+        self.stdout.write(f"{'':<24}{'mean ms':>10}{'p95 ms':>10}")
+        for label, timings in [('two-pass (before)', before), ('single-pass (after)', after)]:
+            self.stdout.write(f"{label:<24}{statistics.mean(timings):>10.1f}{self._p95(timings):>10.1f}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Speed-up: {statistics.mean(before) / statistics.mean(after):.2f}x"
+        ))
+
+    def _time(self, func, texts, runs):
+        func(texts[0])  # Warm up
+        timings = []
+        for _ in range(runs):
+            for text in texts:
+                start = time.perf_counter()
+                func(text)
+                timings.append((time.perf_counter() - start) * 1000)
+        return timings
+
+    def _p95(self, timings):
+        ordered = sorted(timings)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
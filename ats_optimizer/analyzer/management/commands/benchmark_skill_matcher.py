@@ -0,0 +1,78 @@
+import random
+import re
+import string
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SAMPLE_RESUME = (
+    "Senior engineer with 8 years of Python, Django and React experience. Ran k8s clusters "
+    "on AWS, built ML pipelines with PyTorch and scikit-learn, and maintained CI/CD in "
+    "GitHub Actions. Comfortable with PostgreSQL, Redis, Kafka and Terraform. "
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark skill matching time as the taxonomy grows (PhraseMatcher vs. regex)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='40,500,5000,50000',
+                            help="Comma-separated taxonomy sizes")
+        parser.add_argument('--runs', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=10,
+                            help="Times the sample resume is repeated")
+        parser.add_argument('--regex-max', type=int, default=5000,
+                            help="Largest taxonomy to time with the legacy regex approach")
+
+    def handle(self, *args, **options):
+        import spacy
+
+        from ...utils.skill_matcher import SkillMatcher, load_taxonomy
+
+        nlp = spacy.blank('en')  # Matching only needs the tokenizer
+        base = load_taxonomy(settings.ANALYZER_SKILL_TAXONOMY)
+        doc = nlp(SAMPLE_RESUME * options['repeat'])
+        rng = random.Random(42)
+
+        self.stdout.write(
+            f"{'skills':>8}{'build s':>10}{'match ms':>11}{'regex ms':>11}{'found':>7}"
+        )
+        for size in [int(value) for value in options['sizes'].split(',')]:
+            taxonomy = self._synthetic_taxonomy(base, size, rng)
+
+            start = time.perf_counter()
+            matcher = SkillMatcher(nlp, taxonomy)
+            build_seconds = time.perf_counter() - start
+
+            found = matcher.match(doc)
+            match_ms = self._time(lambda: matcher.match(doc), options['runs'])
+
+            regex_ms = '-'
+            if size <= options['regex_max']:
+                regex_ms = f"{self._time(lambda: self._regex_match(taxonomy, doc.text), options['runs']):.2f}"
+
+            self.stdout.write(
+                f"{size:>8}{build_seconds:>10.2f}{match_ms:>11.2f}{regex_ms:>11}{len(found):>7}"
+            )
+
+    def _synthetic_taxonomy(self, base, size, rng):
+        taxonomy = dict(list(base.items())[:size])
+        while len(taxonomy) < size:
+            name = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12)))
+            if rng.random() < 0.3:
+                name += ' ' + ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            taxonomy[name] = [name.replace(' ', '')] if ' ' in name else []
+        return taxonomy
+
+    def _regex_match(self, taxonomy, text):
+        # The previous implementation: build alternation regexes on every call
+        terms = [re.escape(term) for name, aliases in taxonomy.items() for term in [name, *aliases]]
+        pattern = r'\b(?:' + '|'.join(terms) + r')\b'
+        return set(re.findall(pattern, text.lower()))
+
+    def _time(self, func, runs):
+        start = time.perf_counter()
+        for _ in range(runs):
+            func()
+        return (time.perf_counter() - start) * 1000 / runs
@@ -0,0 +1,80 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...models import ResumeAnalysis, ResumeText
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete orphaned upload files (stale temp uploads and resumes no analysis refers to) "
+        "and stored resume texts no analysis refers to"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age', type=int, default=3600,
+            help="Only delete files and texts older than this many seconds (default: 3600)"
+        )
+        parser.add_argument('--dry-run', action='store_true', help="List files without deleting them")
+
+    def handle(self, *args, **options):
+        cutoff = time.time() - options['max_age']
+        media_root = str(settings.MEDIA_ROOT)
+        candidates = []
+
+        # Temp uploads left behind by requests that died mid-upload
+        candidates.extend(self._files_in(settings.FILE_UPLOAD_TEMP_DIR))
+
+        # Temp copies written by the old upload flow
+        candidates.extend(
+            path for path in self._files_in(media_root)
+            if os.path.basename(path).startswith('temp_resume_')
+        )
+
+        # Stored resumes whose analysis row is gone
+        referenced = {
+            os.path.normpath(os.path.join(media_root, name))
+            for name in ResumeAnalysis.objects.values_list('resume_file', flat=True).iterator()
+        }
+        candidates.extend(
+            path for path in self._files_in(os.path.join(media_root, 'resumes'))
+            if os.path.normpath(path) not in referenced
+        )
+
+        removed = 0
+        freed = 0
+        for path in candidates:
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime > cutoff:
+                    continue
+                if not options['dry_run']:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+            freed += stat.st_size
+            self.stdout.write(f"{'Would remove' if options['dry_run'] else 'Removed'} {path}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{removed} orphaned files, {freed / (1024 * 1024):.1f} MB"
+            f"{' (dry run)' if options['dry_run'] else ' freed'}"
+        ))
+
+        if options['dry_run']:
+            texts = ResumeText.objects.unreferenced(options['max_age']).count()
+        else:
+            texts = ResumeText.objects.prune(options['max_age'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{texts} orphaned resume texts{' (dry run)' if options['dry_run'] else ' deleted'}"
+        ))
+
+    def _files_in(self, directory):
+        try:
+            with os.scandir(directory) as entries:
+                return [entry.path for entry in entries if entry.is_file()]
+        except FileNotFoundError:
+            return []
@@ -0,0 +1,134 @@
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.utils import timezone
+
+from ...models import JobPosting, ResumeAnalysis, ResumeText
+
+CHECK_TITLE = 'db_concurrency_check'
+
+
+def run_operations(database, job_posting_id, seconds, seed):
+    """Mix of the app's write and read patterns; returns operation and error counts"""
+    from ...history import history_page, history_queryset
+
+    rng = random.Random(seed)
+    operations, errors = Counter(), Counter()
+    deadline = time.monotonic() + seconds
+    analyses = ResumeAnalysis.objects.using(database)
+
+    while time.monotonic() < deadline:
+        kind = rng.choice(['create', 'create', 'complete', 'claim', 'history', 'history'])
+        try:
+            if kind == 'create':
+                # An upload: the text row is looked up, then the analysis inserted
+                with transaction.atomic(using=database):
+                    stored_text = ResumeText.objects.db_manager(database).store(f"resume {rng.randrange(500)}")
+                    analyses.create(
+                        job_posting_id=job_posting_id, resume_file='resumes/check.txt', stored_text=stored_text
+                    )
+            elif kind == 'complete':
+                # A worker saving results: read the row, then update it
+                with transaction.atomic(using=database):
+                    analysis = analyses.filter(job_posting_id=job_posting_id).order_by('?').first()
+                    if analysis:
+                        analysis.status = ResumeAnalysis.STATUS_COMPLETED
+                        analysis.completed_at = timezone.now()
+                        analysis.save(update_fields=['status', 'completed_at'])
+            elif kind == 'claim':
+                candidate = analyses.filter(
+                    job_posting_id=job_posting_id, status=ResumeAnalysis.STATUS_PENDING
+                ).values_list('id', flat=True).first()
+                if candidate:
+                    analyses.filter(id=candidate, status=ResumeAnalysis.STATUS_PENDING).update(
+                        status=ResumeAnalysis.STATUS_PROCESSING, started_at=timezone.now()
+                    )
+            else:
+                history_page(history_queryset().using(database), page_size=20)
+            operations[kind] += 1
+        except OperationalError as e:
+            errors[str(e)] += 1
+
+    connections[database].close()
+    return dict(operations), dict(errors)
+
+
+def run_process(database, job_posting_id, seconds, threads, seed, results):
+    outcomes = []
+
+    def worker(index):
+        outcomes.append(run_operations(database, job_posting_id, seconds, seed * 1000 + index))
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    results.put(outcomes)
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the database with concurrent uploads, worker updates, job claims and history reads "
+        "from several processes and report any lock errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument('--threads', type=int, default=2, help="Threads per process")
+        parser.add_argument('--seconds', type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        database = options['database']
+        if database not in connections:
+            raise CommandError(f"Unknown database: {database}")
+
+        job_posting = JobPosting.objects.using(database).create(
+            title=CHECK_TITLE, company=CHECK_TITLE, description=CHECK_TITLE
+        )
+        self.stderr.write(
+            f"Running {options['processes']} processes x {options['threads']} threads against "
+            f"{connections[database].vendor} for {options['seconds']:.0f}s..."
+        )
+
+        # Children must not inherit the parent's open connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        processes = [
+            context.Process(target=run_process, args=(
+                database, job_posting.id, options['seconds'], options['threads'], index, results
+            ))
+            for index in range(options['processes'])
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [outcome for _ in processes for outcome in results.get()]
+        for process in processes:
+            process.join()
+
+        operations, errors = Counter(), Counter()
+        for process_operations, process_errors in outcomes:
+            operations.update(process_operations)
+            errors.update(process_errors)
+
+        # Deleting the posting removes the analyses it created
+        JobPosting.objects.using(database).filter(id=job_posting.id).delete()
+
+        self.stdout.write(json.dumps({
+            'database': database,
+            'vendor': connections[database].vendor,
+            'operations': dict(operations),
+            'operations_per_s': round(sum(operations.values()) / options['seconds'], 1),
+            'errors': dict(errors),
+        }, indent=2))
+        if errors:
+            raise CommandError(f"{sum(errors.values())} operations failed with database errors")
+        self.stdout.write(self.style.SUCCESS("No lock errors"))
@@ -0,0 +1,70 @@
+import importlib
+import os
+import shutil
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Save the spaCy and similarity models under ANALYZER_MODEL_DIR so analyses load them "
+        "from disk without contacting the model hub"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-dir', default=str(settings.ANALYZER_MODEL_DIR))
+        parser.add_argument('--only', choices=['spacy', 'similarity'], help="Save just one of the models")
+        parser.add_argument('--force', action='store_true', help="Replace models that are already saved")
+
+    def handle(self, *args, **options):
+        # This command is the one place allowed to reach the hub
+        os.environ['HF_HUB_OFFLINE'] = '0'
+        os.environ['TRANSFORMERS_OFFLINE'] = '0'
+
+        model_dir = Path(options['model_dir'])
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        savers = {
+            'spacy': (settings.ANALYZER_SPACY_MODEL, self._save_spacy),
+            'similarity': (settings.ANALYZER_SIMILARITY_MODEL, self._save_similarity),
+        }
+        for kind, (name, save) in savers.items():
+            if options['only'] and options['only'] != kind:
+                continue
+
+            target = model_dir / name
+            if target.is_dir() and not options['force']:
+                self.stdout.write(f"{name} is already saved in {target}")
+                continue
+
+            self.stdout.write(f"Saving {name} to {target}...")
+            partial = target.with_name(target.name + '.partial')
+            shutil.rmtree(partial, ignore_errors=True)
+            try:
+                save(name, partial)
+            except ImportError as e:
+                raise CommandError(f"Cannot save {name}: {str(e)}")
+            # Swap in the complete copy so a failed download never leaves half a model
+            shutil.rmtree(target, ignore_errors=True)
+            partial.rename(target)
+
+        self.stdout.write(self.style.SUCCESS(f"Models saved in {model_dir}"))
+
+    def _save_spacy(self, name, path):
+        import spacy
+
+        try:
+            nlp = spacy.load(name)
+        except OSError:
+            from spacy.cli import download
+            download(name)
+            importlib.invalidate_caches()  # So the freshly installed package is found
+            nlp = spacy.load(name)
+        nlp.to_disk(path)
+
+    def _save_similarity(self, name, path):
+        from sentence_transformers import SentenceTransformer
+
+        SentenceTransformer(name, device='cpu').save(str(path))
@@ -0,0 +1,136 @@
+import multiprocessing
+import statistics
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...utils.embedding_backends import BACKEND_ONNX, BACKEND_ONNX_INT8, BACKEND_TORCH
+from ...utils.embedding_backends import export_onnx, load_embedding_model
+from ...utils.model_registry import current_rss_mb, resolve_model_path
+
+# Job description / resume pairs whose similarity scores must agree across backends
+PARITY_PAIRS = [
+    (
+        "Senior Python developer to build Django REST APIs deployed on AWS with Docker.",
+        "Backend engineer, six years of Python. Built Django and Flask services, "
+        "containerised with Docker and deployed to AWS ECS.",
+    ),
+    (
+        "Data scientist with machine learning, pandas and SQL experience.",
+        "Analyst using Excel and Tableau dashboards for quarterly sales reporting.",
+    ),
+    (
+        "Frontend engineer: React, TypeScript, accessibility and design systems.",
+        "Built a React and TypeScript component library with WCAG-compliant widgets.",
+    ),
+    (
+        "DevOps engineer to run Kubernetes clusters and Terraform infrastructure.",
+        "Registered nurse with ten years of intensive care experience.",
+    ),
+    (
+        "Java backend developer, Spring Boot, Kafka and PostgreSQL.",
+        "Microservices in Java 17 with Spring Boot, event streaming on Kafka, Postgres.",
+    ),
+    (
+        "Mobile developer with Swift and Kotlin for iOS and Android apps.",
+        "Shipped three iOS apps in Swift and an Android app in Kotlin to the stores.",
+    ),
+]
+
+
+def measure_backend(backend, model_name, model_dir, texts, runs, batch_size):
+    """Load one backend and time it; runs in a fresh process so RSS is not shared"""
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    model = load_embedding_model(backend, model_name, onnx_model_dir=model_dir)
+    load_seconds = time.perf_counter() - start
+
+    embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'embeddings': np.asarray(embeddings, dtype=np.float32),
+        'load_seconds': load_seconds,
+        'batch_ms': statistics.median(timings),
+        'rss_mb': current_rss_mb() - rss_before,
+    }
+
+
+def pair_similarities(embeddings):
+    """Cosine similarity of each (job, resume) pair of consecutive rows"""
+    jobs, resumes = embeddings[0::2], embeddings[1::2]
+    norms = np.linalg.norm(jobs, axis=1) * np.linalg.norm(resumes, axis=1)
+    return (jobs * resumes).sum(axis=1) / np.clip(norms, 1e-12, None)
+
+
+class Command(BaseCommand):
+    help = "Export the similarity model to ONNX (fp32 and int8) and verify it against PyTorch"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=settings.ANALYZER_SIMILARITY_MODEL)
+        parser.add_argument('--output-dir', default=str(settings.ANALYZER_ONNX_MODEL_DIR))
+        parser.add_argument('--no-quantize', action='store_true', help="Skip the int8 model")
+        parser.add_argument('--verify-only', action='store_true',
+                            help="Check an existing export without re-exporting")
+        parser.add_argument('--tolerance', type=float, default=0.01,
+                            help="Max similarity score difference for the fp32 ONNX model")
+        parser.add_argument('--int8-tolerance', type=float, default=0.03,
+                            help="Max similarity score difference for the int8 model")
+        parser.add_argument('--runs', type=int, default=10)
+        parser.add_argument('--batch-size', type=int, default=settings.ANALYZER_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        model_name, output_dir = resolve_model_path(options['model']), options['output_dir']
+
+        if not options['verify_only']:
+            self.stdout.write(f"Exporting {model_name} to {output_dir}...")
+            try:
+                export_onnx(model_name, output_dir, quantize=not options['no_quantize'])
+            except ImportError as e:
+                raise CommandError(f"Export needs torch, sentence-transformers, onnx and onnxruntime: {str(e)}")
+
+        backends = [BACKEND_TORCH, BACKEND_ONNX]
+        if not options['no_quantize']:
+            backends.append(BACKEND_ONNX_INT8)
+        tolerances = {BACKEND_ONNX: options['tolerance'], BACKEND_ONNX_INT8: options['int8_tolerance']}
+
+        # Texts repeated to a realistic batch, job/resume pairs alternating
+        texts = [text for pair in PARITY_PAIRS for text in pair] * 4
+
+        reports = {}
+        context = multiprocessing.get_context('spawn')
+        for backend in backends:
+            with context.Pool(1) as pool:
+                try:
+                    reports[backend] = pool.apply(
+                        measure_backend,
+                        (backend, model_name, output_dir, texts, options['runs'], options['batch_size'])
+                    )
+                except (ImportError, FileNotFoundError) as e:
+                    raise CommandError(f"Cannot load the {backend} backend: {str(e)}")
+
+        reference = pair_similarities(reports[BACKEND_TORCH]['embeddings'])
+        self.stdout.write(
+            f"{'backend':<12}{'load s':>8}{'RSS MB':>9}{'batch ms':>10}{'ms/text':>9}{'max diff':>10}"
+        )
+        failed = []
+        for backend, report in reports.items():
+            max_diff = float(np.abs(pair_similarities(report['embeddings']) - reference).max())
+            self.stdout.write(
+                f"{backend:<12}{report['load_seconds']:>8.2f}{report['rss_mb']:>9.0f}"
+                f"{report['batch_ms']:>10.1f}{report['batch_ms'] / len(texts):>9.2f}{max_diff:>10.4f}"
+            )
+            if backend in tolerances and max_diff > tolerances[backend]:
+                failed.append(f"{backend} differs by {max_diff:.4f} (tolerance {tolerances[backend]})")
+
+        if failed:
+            raise CommandError("Parity check failed: " + "; ".join(failed))
+        self.stdout.write(self.style.SUCCESS(
+            "Parity check passed. Set ANALYZER_EMBEDDING_BACKEND=onnx or onnx-int8 to use the export."
+        ))
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import JobPosting
+
+
+class Command(BaseCommand):
+    help = (
+        "Screen every resume in a directory or zip archive against a job posting, using a process "
+        "pool and batched inserts; interrupted runs resume from a checkpoint"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="Directory or .zip archive of PDF, DOCX and TXT resumes")
+        parser.add_argument('--job', type=int, required=True, help="ID of the job posting to screen against")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Analysis processes (default: one per core)")
+        parser.add_argument('--batch-size', type=int, default=200, help="Analyses per bulk insert")
+        parser.add_argument('--checkpoint', help="Checkpoint file (default: under MEDIA_ROOT/ingest/)")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+
+    def handle(self, *args, **options):
+        from ...ingest import Checkpoint, default_checkpoint_path, ingest
+
+        if not os.path.exists(options['source']):
+            raise CommandError(f"{options['source']} does not exist")
+        try:
+            job_posting = JobPosting.objects.get(id=options['job'])
+        except JobPosting.DoesNotExist:
+            raise CommandError(f"Job posting {options['job']} does not exist")
+
+        checkpoint_path = options['checkpoint'] or default_checkpoint_path(options['source'], job_posting.id)
+        if options['restart'] and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        checkpoint = Checkpoint(checkpoint_path)
+        if checkpoint.done:
+            self.stdout.write(f"Resuming: {len(checkpoint.done)} files were ingested by an earlier run")
+
+        next_progress = [100]
+
+        def progress(report):
+            if report.seen - report.skipped >= next_progress[0]:
+                next_progress[0] += 100
+                self.stderr.write(
+                    f"{report.seen} files read, {report.created} analyses saved, "
+                    f"{report.files_per_second:.1f} files/s"
+                )
+
+        try:
+            report = ingest(
+                options['source'], job_posting, checkpoint,
+                workers=max(1, options['workers']), batch_size=max(1, options['batch_size']), progress=progress
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        except BrokenProcessPool:
+            raise CommandError("An analysis process died; run the command again to resume from the checkpoint")
+
+        processed = report.seen - report.skipped
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {processed} files in {report.elapsed:.1f}s ({report.files_per_second:.1f} files/s): "
+            f"{report.created} analyses saved, {report.completed} completed, {report.skipped} already done"
+        ))
+
+        outcomes = sorted({outcome for counts in report.formats.values() for outcome in counts})
+        if outcomes:
+            self.stdout.write(f"\n{'format':<10}" + ''.join(f"{outcome:>13}" for outcome in outcomes))
+            for file_format, counts in sorted(report.formats.items()):
+                self.stdout.write(
+                    f"{file_format:<10}" + ''.join(f"{counts.get(outcome, 0):>13}" for outcome in outcomes)
+                )
+
+        if report.stages:
+            self.stdout.write(f"\n{'stage':<20}{'calls':>8}{'total s':>10}{'mean ms':>10}")
+            for stage, (seconds, count) in sorted(report.stages.items(), key=lambda item: -item[1][0]):
+                self.stdout.write(
+                    f"{stage:<20}{count:>8}{seconds:>10.2f}{seconds / max(count, 1) * 1000:>10.1f}"
+                )
+        self.stdout.write(f"\nCheckpoint: {checkpoint_path}")
@@ -0,0 +1,158 @@
+import json
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from .run_benchmarks import summarize
+
+PROBE_PATHS = ['/api/history/?page_size=20', '/api/analyze/']
+
+
+def request(url, data=None, headers=None, timeout=300):
+    """Send one request; returns (status, elapsed_ms)"""
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data, headers or {}), timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, (time.perf_counter() - start) * 1000
+
+
+def multipart(fields, file_field, file_path):
+    """Encode form fields and one file as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; '
+        f'filename="{os.path.basename(file_path)}"\r\nContent-Type: {content_type}\r\n\r\n'.encode()
+        + content + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a running server: measure cheap endpoint latency while idle and while "
+        "analyses are in flight"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the running server")
+        parser.add_argument('--analyses', type=int, default=16, help="Analyses to submit")
+        parser.add_argument('--concurrency', type=int, default=4, help="Analyses in flight at once")
+        parser.add_argument('--probe-threads', type=int, default=2, help="Clients hitting cheap endpoints")
+        parser.add_argument('--idle-seconds', type=float, default=5.0, help="Length of the idle baseline")
+        parser.add_argument('--words', type=int, default=900, help="Length of the synthetic resumes")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        from ...utils.synthetic_corpus import generate_corpus
+
+        base_url = options['url'].rstrip('/')
+        try:
+            request(base_url + PROBE_PATHS[-1], timeout=10)
+        except OSError as e:
+            raise CommandError(f"Server at {base_url} is not reachable: {str(e)}")
+
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            corpus = generate_corpus(corpus_dir, lengths=(options['words'],), per_length=options['analyses'])
+            resumes = [resume['path'] for resume in corpus['resumes']][:options['analyses']]
+
+            self.stderr.write(f"Probing cheap endpoints for {options['idle_seconds']:.0f}s while idle...")
+            idle = self._probe_while(lambda: time.sleep(options['idle_seconds']), base_url, options['probe_threads'])
+
+            self.stderr.write(
+                f"Submitting {len(resumes)} analyses, {options['concurrency']} at a time, while probing..."
+            )
+            analyses = []
+            loaded = self._probe_while(
+                lambda: analyses.extend(self._submit(base_url, resumes, corpus['jobs'][0], options['concurrency'])),
+                base_url, options['probe_threads']
+            )
+
+        completed = [elapsed for status, elapsed in analyses if status == 200]
+        report = {
+            'url': base_url,
+            'analyses': {
+                'submitted': len(analyses),
+                'completed': len(completed),
+                'refused': sum(1 for status, _ in analyses if status == 503),
+                'latency': summarize(completed) if completed else None,
+            },
+            'probe_idle': summarize(idle) if idle else None,
+            'probe_under_load': summarize(loaded) if loaded else None,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+        self.stdout.write(output)
+
+        if idle and loaded:
+            slowdown = report['probe_under_load']['p95_ms'] / max(report['probe_idle']['p95_ms'], 0.001)
+            self.stderr.write(f"Cheap endpoint p95 under load is {slowdown:.1f}x the idle p95")
+
+    def _submit(self, base_url, resumes, job_description, concurrency):
+        """POST every resume to the analyze endpoint with a fixed number in flight"""
+        fields = {'job_title': 'Load Test', 'company_name': 'Load Test', 'job_description': job_description}
+        pending = list(resumes)
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if not pending:
+                        return
+                    path = pending.pop()
+                body, headers = multipart(fields, 'resume_file', path)
+                result = request(base_url + '/api/analyze/', body, headers)
+                with lock:
+                    results.append(result)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _probe_while(self, action, base_url, threads):
+        """Run action while probe clients loop over the cheap endpoints; returns their latencies"""
+        timings = []
+        done = threading.Event()
+
+        def probe():
+            index = 0
+            while not done.is_set():
+                _, elapsed = request(base_url + PROBE_PATHS[index % len(PROBE_PATHS)], timeout=60)
+                timings.append(elapsed)
+                index += 1
+
+        probes = [threading.Thread(target=probe) for _ in range(threads)]
+        for thread in probes:
+            thread.start()
+        try:
+            action()
+        finally:
+            done.set()
+            for thread in probes:
+                thread.join()
+        return timings
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ...keyword_index import index_analyses
+from ...models import KeywordIndexEntry, ResumeAnalysis, ResumeText
+from ...utils.content_cache import invalidate_cached_results
+
+
+class Command(BaseCommand):
+    help = "Rebuild the inverted keyword index from all completed analyses"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument(
+            '--extract-skills', action='store_true',
+            help="Run the skill matcher over the parsed text of analyses stored before skills were kept"
+        )
+
+    def handle(self, *args, **options):
+        analyses = ResumeAnalysis.objects.filter(
+            status=ResumeAnalysis.STATUS_COMPLETED
+        ).only('id', 'status', 'skills', 'matching_keywords', 'stored_text').order_by('id')
+
+        processor = None
+        if options['extract_skills']:
+            from ...utils.nlp_processor import NLPProcessor
+            processor = NLPProcessor()
+
+        with transaction.atomic():
+            KeywordIndexEntry.objects.all().delete()
+
+            indexed = entries = 0
+            last_id = 0
+            while True:
+                batch = list(analyses.filter(id__gt=last_id)[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                if processor is not None:
+                    self._extract_skills(processor, batch)
+                entries += index_analyses(batch)
+                indexed += len(batch)
+                self.stdout.write(f"Indexed {indexed} analyses...")
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} analyses under {entries} keyword postings"))
+
+    def _extract_skills(self, processor, batch):
+        missing = [analysis for analysis in batch if not analysis.skills and analysis.stored_text_id]
+        if not missing:
+            return
+        texts = ResumeText.objects.in_bulk({analysis.stored_text_id for analysis in missing})
+        for analysis in missing:
+            text = texts[analysis.stored_text_id].text
+            analysis.skills = sorted(processor.skill_matcher.match(processor.nlp.make_doc(text)))
+        ResumeAnalysis.objects.bulk_update(missing, ['skills'])
+        # bulk_update sends no post_save, and the JSON results show the skills
+        invalidate_cached_results([analysis.id for analysis in missing])
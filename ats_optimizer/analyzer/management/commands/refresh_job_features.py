@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the keywords and embeddings of open job postings whose stored features are missing "
+        "or stale, e.g. after a model or taxonomy change; reverse matching skips them until then"
+    )
+
+    def handle(self, *args, **options):
+        from ...services import create_resume_processor, refresh_job_features
+
+        analyzer = create_resume_processor()
+        refreshed = 0
+        while True:
+            batch = refresh_job_features(analyzer, limit=500)
+            if not batch:
+                break
+            refreshed += batch
+            self.stdout.write(f"Refreshed {refreshed} job postings...")
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed the features of {refreshed} job postings"))
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, Sum
+from django.db.models.functions import Length
+
+from ...models import ResumeAnalysis, ResumeText
+
+TABLES = [ResumeAnalysis._meta.db_table, ResumeText._meta.db_table]
+
+
+def format_mb(size):
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Report how much space compressed, deduplicated resume text storage saves "
+        "and optionally delete texts no analysis refers to"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prune', action='store_true', help="Delete stored texts with no analyses")
+        parser.add_argument(
+            '--max-age', type=int, default=3600,
+            help="Only prune texts older than this many seconds (default: 3600)"
+        )
+
+    def handle(self, *args, **options):
+        if options['prune']:
+            deleted = ResumeText.objects.prune(options['max_age'])
+            self.stdout.write(f"Deleted {deleted} unreferenced texts")
+
+        analyses = ResumeAnalysis.objects.filter(stored_text__isnull=False)
+        references = analyses.count()
+        # What the text would take stored inline, once per analysis
+        inline_size = analyses.aggregate(total=Sum('stored_text__size'))['total'] or 0
+        stored = ResumeText.objects.aggregate(
+            texts=Count('id'), size=Sum('size'), compressed=Sum(Length('data'))
+        )
+        compressed_size = stored['compressed'] or 0
+
+        self.stdout.write(f"Analyses with text:   {references}")
+        self.stdout.write(f"Distinct texts:       {stored['texts']}")
+        self.stdout.write(f"Inline text size:     {format_mb(inline_size)}")
+        self.stdout.write(f"Deduplicated size:    {format_mb(stored['size'] or 0)}")
+        self.stdout.write(f"Compressed size:      {format_mb(compressed_size)}")
+        if inline_size:
+            self.stdout.write(self.style.SUCCESS(
+                f"Text storage is {1 - compressed_size / inline_size:.1%} smaller than inline parsed_text"
+            ))
+
+        sizes = self._table_sizes()
+        if sizes:
+            for table, size in sizes.items():
+                self.stdout.write(f"Table {table}: {format_mb(size)}")
+        else:
+            self.stdout.write(f"Table sizes are not available on {connection.vendor}")
+
+    def _table_sizes(self):
+        """On-disk size of the analysis and text tables including indexes, where the database reports it"""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                sizes = {}
+                for table in TABLES:
+                    cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+                    sizes[table] = cursor.fetchone()[0]
+                return sizes
+            if connection.vendor == 'sqlite':
+                try:
+                    cursor.execute(
+                        "SELECT tbl_name, SUM(pgsize) FROM dbstat JOIN sqlite_master USING (name) "
+                        f"WHERE tbl_name IN ({', '.join(['%s'] * len(TABLES))}) GROUP BY tbl_name",
+                        TABLES
+                    )
+                except Exception:
+                    return {}  # SQLite built without the dbstat table
+                return dict(cursor.fetchall())
+        return {}
@@ -0,0 +1,75 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ...jobs import run_worker
+from ...metrics import start_metrics_server
+
+
+def run_worker_with_metrics(metrics_port=None, **worker_kwargs):
+    if metrics_port:
+        start_metrics_server(metrics_port)
+    return run_worker(**worker_kwargs)
+
+
+class Command(BaseCommand):
+    help = "Run the local worker pool that processes pending resume analyses"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.ANALYZER_WORKER_CONCURRENCY,
+            help="Number of worker processes (default: ANALYZER_WORKER_CONCURRENCY)"
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.ANALYZER_WORKER_POLL_INTERVAL,
+            help="Seconds to sleep when the queue is empty"
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Exit once the queue is empty instead of polling forever"
+        )
+        parser.add_argument(
+            '--metrics-port', type=int,
+            help="Serve Prometheus metrics over HTTP; worker N of a pool uses this port + N"
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        worker_kwargs = {
+            'poll_interval': options['poll_interval'],
+            'stop_when_empty': options['once'],
+        }
+        self.stdout.write(f"Starting {concurrency} analysis worker(s)")
+
+        metrics_port = options['metrics_port']
+        if concurrency == 1:
+            processed = run_worker_with_metrics(metrics_port, **worker_kwargs)
+            self.stdout.write(self.style.SUCCESS(f"Processed {processed} analyses"))
+            return
+
+        # Children must not inherit the parent's open database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        # Not daemonic: workers start their own process pools for PDF extraction
+        workers = [
+            context.Process(target=run_worker_with_metrics, kwargs={
+                **worker_kwargs, 'metrics_port': metrics_port and metrics_port + index
+            })
+            for index in range(concurrency)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def shutdown(signum, frame):
+            for worker in workers:
+                worker.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS("Analysis workers stopped"))
@@ -0,0 +1,168 @@
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+DUMMY_CACHE = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+STAGES = [
+    'extract.pdf', 'extract.docx', 'extract.txt',
+    'extract_keywords', 'extract_skill_entities', 'extract_named_entities',
+    'compute_semantic_similarity', 'analyze_resume',
+]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(timings_ms):
+    """p50/p95/mean latency and per-second throughput of one stage"""
+    mean = statistics.mean(timings_ms)
+    return {
+        'samples': len(timings_ms),
+        'p50_ms': round(percentile(timings_ms, 0.50), 3),
+        'p95_ms': round(percentile(timings_ms, 0.95), 3),
+        'mean_ms': round(mean, 3),
+        'throughput_per_s': round(1000 / mean, 2) if mean else None,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Time each analysis stage on a reproducible synthetic corpus, report p50/p95/throughput "
+        "as JSON and optionally flag regressions against a saved baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus-dir', help="Where to write the corpus (default: a temporary directory)")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--lengths', default='300,900,3000', help="Resume lengths in words")
+        parser.add_argument('--per-length', type=int, default=2, help="Resumes per length and format")
+        parser.add_argument('--runs', type=int, default=5, help="Timed repetitions per item")
+        parser.add_argument('--stages', default=','.join(STAGES), help="Comma-separated stages to run")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+        parser.add_argument('--baseline', help="Compare p50 latencies with a previous JSON report")
+        parser.add_argument('--threshold', type=float, default=0.15,
+                            help="Relative p50 slow-down that counts as a regression (default: 0.15)")
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help="Exit with an error when a regression is found")
+
+    def handle(self, *args, **options):
+        stages = [stage.strip() for stage in options['stages'].split(',') if stage.strip()]
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise CommandError(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+        # Every run must do the real work, so the content caches are disabled
+        caches = {name: DUMMY_CACHE for name in settings.CACHES}
+        with tempfile.TemporaryDirectory() as temp_dir, override_settings(CACHES=caches):
+            report = self._run(options['corpus_dir'] or temp_dir, stages, options)
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output)
+            self.stderr.write(f"Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+        if options['baseline']:
+            regressions = self._compare(report, options['baseline'], options['threshold'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f"{len(regressions)} stage(s) regressed: {', '.join(regressions)}")
+
+    def _run(self, corpus_dir, stages, options):
+        from ...utils.extract_utils import extract_document
+        from ...utils.resume_analyzer import ResumeAnalyzer
+        from ...utils.synthetic_corpus import generate_corpus
+
+        lengths = [int(value) for value in options['lengths'].split(',')]
+        corpus = generate_corpus(corpus_dir, options['seed'], lengths, options['per_length'])
+        runs = options['runs']
+
+        analyzer = ResumeAnalyzer()  # Loads the models before any timing starts
+        processor = analyzer.nlp_processor
+        txt_resumes = [resume for resume in corpus['resumes'] if resume['format'] == 'txt']
+        texts = [extract_document(resume['path']).text for resume in txt_resumes]
+        docs = [processor.nlp(text) for text in texts]
+        job = corpus['jobs'][0]
+        job_embedding = processor.encode([job])[0]
+
+        work = {
+            'extract_keywords': [lambda text=text: processor.extract_keywords(text) for text in texts],
+            'extract_skill_entities': [lambda doc=doc: processor.extract_skill_entities(doc) for doc in docs],
+            'extract_named_entities': [lambda text=text: processor.extract_named_entities(text) for text in texts],
+            'compute_semantic_similarity': [
+                lambda text=text: processor.compute_section_similarities(job_embedding, [text]) for text in texts
+            ],
+            'analyze_resume': [
+                lambda path=resume['path']: analyzer.analyze_resume(path, job) for resume in txt_resumes
+            ],
+        }
+        for file_format in ['pdf', 'docx', 'txt']:
+            work[f'extract.{file_format}'] = [
+                lambda path=resume['path']: extract_document(path)
+                for resume in corpus['resumes'] if resume['format'] == file_format
+            ]
+
+        results = {}
+        for stage in stages:
+            self.stderr.write(f"Timing {stage}...")
+            timings = []
+            for func in work[stage]:
+                func()  # Warm up
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    func()
+                    timings.append((time.perf_counter() - start) * 1000)
+            results[stage] = summarize(timings)
+
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'spacy_model': settings.ANALYZER_SPACY_MODEL,
+                'similarity_model': settings.ANALYZER_SIMILARITY_MODEL,
+                'embedding_backend': settings.ANALYZER_EMBEDDING_BACKEND,
+            },
+            'corpus': {
+                'seed': options['seed'],
+                'lengths': lengths,
+                'per_length': options['per_length'],
+                'runs': runs,
+            },
+            'stages': results,
+        }
+
+    def _compare(self, report, baseline_path, threshold):
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+
+        if baseline.get('corpus') != report['corpus']:
+            self.stderr.write(self.style.WARNING("Baseline was measured on a different corpus"))
+
+        regressions = []
+        self.stderr.write(f"{'stage':<30}{'baseline p50':>14}{'p50':>10}{'change':>9}")
+        for stage, stats in report['stages'].items():
+            before = baseline.get('stages', {}).get(stage)
+            if not before or not before['p50_ms']:
+                continue
+            change = stats['p50_ms'] / before['p50_ms'] - 1
+            line = f"{stage:<30}{before['p50_ms']:>14.2f}{stats['p50_ms']:>10.2f}{change:>+9.1%}"
+            if change > threshold:
+                regressions.append(stage)
+                self.stderr.write(self.style.ERROR(line + "  REGRESSION"))
+            elif change < -threshold:
+                self.stderr.write(self.style.SUCCESS(line + "  faster"))
+            else:
+                self.stderr.write(line)
+        return regressions
@@ -0,0 +1,55 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...metrics import start_metrics_server
+from ...utils.embedding_server import is_insecure_key, serve
+from ...utils.model_registry import WARMUP_TEXT, current_rss_mb, load_local_similarity_model
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold one copy of the similarity model and serve micro-batched encode requests "
+        "from every web and worker process on a Unix socket"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket', default=settings.ANALYZER_EMBEDDING_SERVER_SOCKET,
+            help="Unix socket path (default: ANALYZER_EMBEDDING_SERVER_SOCKET)"
+        )
+        parser.add_argument('--max-batch-size', type=int, default=settings.ANALYZER_EMBEDDING_SERVER_MAX_BATCH)
+        parser.add_argument('--max-wait-ms', type=float, default=settings.ANALYZER_EMBEDDING_SERVER_MAX_WAIT_MS)
+        parser.add_argument('--metrics-port', type=int, help="Serve Prometheus metrics over HTTP")
+
+    def handle(self, *args, **options):
+        if not options['socket']:
+            raise CommandError("Set ANALYZER_EMBEDDING_SERVER_SOCKET or pass --socket")
+        if is_insecure_key(settings.ANALYZER_EMBEDDING_SERVER_KEY):
+            raise CommandError(
+                "The embedding server unpickles what clients send; set ANALYZER_EMBEDDING_SERVER_KEY "
+                "(or SECRET_KEY) to a private value shared by the web and worker processes"
+            )
+
+        model = load_local_similarity_model()
+        model.encode([WARMUP_TEXT])
+        self.stdout.write(
+            f"Loaded {settings.ANALYZER_SIMILARITY_MODEL} (RSS {current_rss_mb():.0f} MB); "
+            f"serving on {options['socket']}"
+        )
+        if options['metrics_port']:
+            start_metrics_server(options['metrics_port'])
+
+        def shutdown(signum, frame):
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGTERM, shutdown)
+        try:
+            serve(
+                options['socket'], model,
+                max_batch_size=max(1, options['max_batch_size']),
+                max_wait=options['max_wait_ms'] / 1000
+            )
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS("Embedding server stopped"))
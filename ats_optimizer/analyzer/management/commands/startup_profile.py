@@ -0,0 +1,131 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What each kind of process imports before it can do any work
+STARTUP_PATHS = {
+    'web': ['ats_optimizer.urls'],
+    'worker': ['analyzer.jobs'],
+    'analysis': ['analyzer.services', 'analyzer.utils.resume_analyzer'],
+}
+
+# Packages that should only be imported once an analysis actually runs
+HEAVY_PACKAGES = ['torch', 'sentence_transformers', 'transformers', 'spacy', 'onnxruntime']
+
+
+def parse_importtime(output):
+    """Parse ``python -X importtime`` output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_imports(modules):
+    """Import the modules after django.setup() in a fresh interpreter and profile it"""
+    code = 'import django; django.setup(); ' + '; '.join(f'import {module}' for module in modules)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=settings.BASE_DIR, env=dict(os.environ), capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'unknown error'
+        raise CommandError(f"Importing {', '.join(modules)} failed: {error}")
+
+    rows = parse_importtime(result.stderr)
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[name.split('.')[0]] += self_us
+    return {
+        'modules': modules,
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(sum(row[2] for row in rows if row[3] == 0) / 1000, 1),
+        'rows': rows,
+        'packages': packages,
+        'heavy': [package for package in HEAVY_PACKAGES if package in packages],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the import time of each startup path per module and package, and optionally fail "
+        "when a path is over a time budget"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paths', default=','.join(STARTUP_PATHS),
+                            help=f"Comma-separated startup paths ({', '.join(STARTUP_PATHS)})")
+        parser.add_argument('--modules', help="Profile importing these comma-separated modules instead")
+        parser.add_argument('--top', type=int, default=15, help="Modules and packages to list per path")
+        parser.add_argument('--budget-ms', type=float,
+                            help="Fail when a path spends longer than this importing")
+        parser.add_argument('--output', help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if options['modules']:
+            targets = {'custom': [module.strip() for module in options['modules'].split(',') if module.strip()]}
+        else:
+            names = [name.strip() for name in options['paths'].split(',') if name.strip()]
+            unknown = set(names) - set(STARTUP_PATHS)
+            if unknown:
+                raise CommandError(f"Unknown startup paths: {', '.join(sorted(unknown))}")
+            targets = {name: STARTUP_PATHS[name] for name in names}
+
+        report = {}
+        over_budget = []
+        for name, modules in targets.items():
+            profile = profile_imports(modules)
+            self._print_profile(name, profile, options['top'])
+            report[name] = {
+                'modules': modules,
+                'wall_ms': profile['wall_ms'],
+                'import_ms': profile['import_ms'],
+                'heavy_packages': profile['heavy'],
+                'slowest_modules': [
+                    {'module': module, 'self_ms': round(self_us / 1000, 2), 'cumulative_ms': round(cumulative_us / 1000, 2)}
+                    for module, self_us, cumulative_us, _ in sorted(profile['rows'], key=lambda row: -row[1])[:options['top']]
+                ],
+            }
+            if options['budget_ms'] is not None and profile['import_ms'] > options['budget_ms']:
+                over_budget.append(f"{name} ({profile['import_ms']:.0f} ms)")
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(json.dumps(report, indent=2))
+            self.stderr.write(f"Report written to {options['output']}")
+
+        if over_budget:
+            raise CommandError(f"Over the {options['budget_ms']:.0f} ms budget: {', '.join(over_budget)}")
+
+    def _print_profile(self, name, profile, top):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{name}: {profile['import_ms']:.0f} ms importing, {profile['wall_ms']:.0f} ms to start "
+            f"({', '.join(profile['modules'])})"
+        ))
+        self.stdout.write(f"  {'package':<40}{'self ms':>10}")
+        for package, self_us in sorted(profile['packages'].items(), key=lambda item: -item[1])[:top]:
+            self.stdout.write(f"  {package:<40}{self_us / 1000:>10.1f}")
+
+        self.stdout.write(f"  {'module':<40}{'self ms':>10}{'cumulative ms':>15}")
+        for module, self_us, cumulative_us, _ in sorted(profile['rows'], key=lambda row: -row[1])[:top]:
+            self.stdout.write(f"  {module:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>15.1f}")
+
+        if profile['heavy']:
+            self.stdout.write(self.style.WARNING(
+                f"  Imports {', '.join(profile['heavy'])} at startup; these should load on first analysis"
+            ))
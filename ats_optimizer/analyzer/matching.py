@@ -0,0 +1,92 @@
+"""Reverse matching: score one resume against every open job posting.
+
+The resume is extracted, parsed and encoded once. Posting keywords and
+embeddings are precomputed, so semantic similarity for all postings is a
+single matrix product between the posting embeddings and the resume chunk
+embeddings, aggregated per section exactly like a single analysis.
+
+Postings whose features are missing or stale (after a model or taxonomy
+change) are skipped rather than computed inside the request; the analysis
+worker refreshes them while idle, as does ``manage.py refresh_job_features``.
+"""
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+
+from .models import JobPosting
+from .services import create_resume_processor
+from .utils.chunking import aggregate_score_matrix
+from .utils.embeddings import cosine_similarity_matrix, embedding_from_bytes
+from .utils.resume_analyzer import extract_resume_text
+
+logger = logging.getLogger(__name__)
+
+POSTING_FIELDS = [
+    'id', 'title', 'company', 'location', 'job_type', 'keywords', 'embedding', 'features_version'
+]
+
+
+def open_job_postings():
+    """Postings applicants can match against, without their descriptions"""
+    return JobPosting.objects.filter(is_open=True).only(*POSTING_FIELDS).order_by('id')
+
+
+def match_resume_to_postings(resume_file_path, job_postings=None, k=None, analyzer=None):
+    """Rank job postings for one resume, best fit first.
+
+    Returns ``(matches, elapsed_ms)``; each match is a dict with the
+    ``job_posting`` and its ``ats_score``, ``semantic_similarity`` and
+    keyword overlap, scored the same way as ResumeAnalyzer.analyze_resume.
+    """
+    start = time.perf_counter()
+    analyzer = analyzer or create_resume_processor()
+    nlp_processor = analyzer.nlp_processor
+    k = k or settings.ANALYZER_MATCH_TOP_K
+
+    version = nlp_processor.features_version
+    job_postings = list(open_job_postings() if job_postings is None else job_postings)
+    ready = [job_posting for job_posting in job_postings if job_posting.has_features(version)]
+    if len(ready) < len(job_postings):
+        logger.warning(f"Skipping {len(job_postings) - len(ready)} postings whose features are not computed yet")
+    job_postings = ready
+    if not job_postings:
+        return [], (time.perf_counter() - start) * 1000
+
+    # Process the resume once
+    resume_text, _ = extract_resume_text(resume_file_path)
+    if not resume_text:
+        raise ValueError("Could not extract text from resume")
+    document = nlp_processor.analyze_document(resume_text)
+    [(chunks, chunk_embeddings)] = nlp_processor.embed_documents([resume_text])
+
+    # One (postings x chunks) similarity matrix for every posting at once
+    if chunks:
+        posting_matrix = np.vstack([
+            embedding_from_bytes(job_posting.embedding) for job_posting in job_postings
+        ])
+        similarities, _, _ = aggregate_score_matrix(
+            chunks, cosine_similarity_matrix(posting_matrix, chunk_embeddings)
+        )
+    else:
+        similarities = np.zeros(len(job_postings), dtype=np.float32)
+
+    resume_keywords = document.keywords
+    matches = []
+    for job_posting, similarity in zip(job_postings, similarities):
+        similarity = float(similarity)
+        job_keywords = job_posting.keywords
+        matching_keywords, missing_keywords = analyzer.match_keywords(job_keywords, resume_keywords)
+        matches.append({
+            'job_posting': job_posting,
+            'ats_score': analyzer.calculate_ats_score(matching_keywords, job_keywords, similarity),
+            'semantic_similarity': similarity * 100,
+            'matching_keywords': matching_keywords,
+            'missing_keywords': missing_keywords,
+        })
+
+    matches.sort(key=lambda match: match['ats_score'], reverse=True)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"Matched resume against {len(job_postings)} postings in {elapsed_ms:.1f}ms")
+    return matches[:k], elapsed_ms
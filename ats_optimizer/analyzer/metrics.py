@@ -0,0 +1,301 @@
+"""In-process metrics with Prometheus text exposition.
+
+Pipeline stages are wrapped in ``timed(stage, ...)`` spans that record into
+histograms labelled by stage, file format and outcome. Recording is a lock,
+a bisect and a few additions, so the overhead is negligible whether or not
+anything scrapes. Gauges that are expensive to compute (queue depth, model
+and cache statistics) are collected only when ``/metrics`` is requested.
+
+Metrics are per process: scrape each web worker or analysis worker
+(``run_analysis_worker --metrics-port``) separately.
+"""
+import bisect
+import hmac
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {value}']
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_sample(self, key, state):
+        counts, total, count = state
+        names = self.labelnames + ('le',)
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{self.name}_bucket{_format_labels(names, key + (le,))} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {total}')
+        lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """Register a function called at scrape time that returns exposition lines"""
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {str(e)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_DURATION = REGISTRY.register(Histogram(
+    'analyzer_stage_duration_seconds',
+    'Time spent in each analysis pipeline stage.',
+    ['stage', 'format', 'outcome'],
+))
+JOBS = REGISTRY.register(Counter(
+    'analyzer_jobs_total',
+    'Analysis jobs processed by this worker, by outcome.',
+    ['outcome'],
+))
+RESULTS_NOT_MODIFIED = REGISTRY.register(Counter(
+    'analyzer_results_not_modified_total',
+    'Results requests answered with 304 Not Modified, by representation.',
+    ['kind'],
+))
+EMBEDDING_REQUESTS = REGISTRY.register(Counter(
+    'analyzer_embedding_requests_total',
+    'Encode calls made by this process, by where they ran (server or local).',
+    ['target'],
+))
+EMBEDDING_BATCH_SIZE = REGISTRY.register(Histogram(
+    'analyzer_embedding_batch_texts',
+    'Texts per micro-batch encoded by the embedding server.',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+))
+
+
+@contextmanager
+def timed(stage, file_format='', outcome=None):
+    """Record the duration of a block under ``stage``.
+
+    The outcome is "ok", or "error" if the block raises; a block may set a
+    different outcome (e.g. "cached") through the yielded dict.
+    """
+    span = {'outcome': outcome}
+    start = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span['outcome'] = 'error'
+        raise
+    finally:
+        STAGE_DURATION.observe(
+            time.perf_counter() - start,
+            stage=stage, format=file_format, outcome=span['outcome'] or 'ok'
+        )
+
+
+def stage_totals():
+    """Total seconds and span count per stage recorded in this process so far"""
+    totals = {}
+    with STAGE_DURATION._lock:
+        items = list(STAGE_DURATION._values.items())
+    for (stage, _, _), (_, seconds, count) in items:
+        total = totals.setdefault(stage, [0.0, 0])
+        total[0] += seconds
+        total[1] += count
+    return totals
+
+
+def _gauge_lines(name, documentation, samples, labelnames=(), kind='gauge'):
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} {kind}']
+    for labels, value in samples:
+        lines.append(f'{name}{_format_labels(labelnames, labels)} {value}')
+    return lines
+
+
+@REGISTRY.add_collector
+def collect_models():
+    from .utils.model_registry import current_rss_mb, model_registry
+
+    stats = dict(model_registry.stats)
+    return (
+        _gauge_lines(
+            'analyzer_model_load_seconds', 'Time taken to load each NLP model in this process.',
+            [((name,), values['load_seconds']) for name, values in sorted(stats.items()) if 'load_seconds' in values],
+            ['model']
+        )
+        + _gauge_lines(
+            'analyzer_process_resident_memory_bytes', 'Resident memory of this process.',
+            [((), int(current_rss_mb() * 1024 * 1024))]
+        )
+    )
+
+
+@REGISTRY.add_collector
+def collect_caches():
+    from .utils.content_cache import get_cache_stats
+
+    samples = []
+    for tier, counts in sorted(get_cache_stats().items()):
+        samples.append(((tier, 'hit'), counts['hits']))
+        samples.append(((tier, 'miss'), counts['misses']))
+    return _gauge_lines(
+        'analyzer_cache_requests_total', 'Content cache lookups in this process, by cache and result.',
+        samples, ['cache', 'result'], kind='counter'
+    )
+
+
+@REGISTRY.add_collector
+def collect_queue():
+    from django.db.models import Count
+
+    from .models import ResumeAnalysis
+
+    counts = dict(
+        ResumeAnalysis.objects.filter(
+            status__in=[ResumeAnalysis.STATUS_PENDING, ResumeAnalysis.STATUS_PROCESSING]
+        ).values_list('status').annotate(total=Count('id')).values_list('status', 'total')
+    )
+    return _gauge_lines(
+        'analyzer_queue_jobs', 'Analyses waiting in or being processed by the job queue.',
+        [((status,), counts.get(status, 0))
+         for status in (ResumeAnalysis.STATUS_PENDING, ResumeAnalysis.STATUS_PROCESSING)],
+        ['status']
+    )
+
+
+def render_metrics():
+    return REGISTRY.render()
+
+
+def has_metrics_token(authorization):
+    """True when no ANALYZER_METRICS_TOKEN is set or the Authorization header carries it"""
+    from django.conf import settings
+
+    token = settings.ANALYZER_METRICS_TOKEN
+    if not token:
+        return True
+    return hmac.compare_digest(authorization or '', f'Bearer {token}')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        from django.db import close_old_connections
+
+        if not has_metrics_token(self.headers.get('Authorization')):
+            body = b'Metrics token required'
+            self.send_response(401)
+            self.send_header('WWW-Authenticate', 'Bearer')
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        close_old_connections()
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port, host=None):
+    """Serve /metrics from a background thread (for processes without Django views).
+
+    Listens on ANALYZER_METRICS_HOST (loopback by default) and requires
+    ANALYZER_METRICS_TOKEN when one is set, like the /metrics view.
+    """
+    from django.conf import settings
+
+    host = host or settings.ANALYZER_METRICS_HOST
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    logger.info(f"Serving metrics on {host}:{port}")
+    return server
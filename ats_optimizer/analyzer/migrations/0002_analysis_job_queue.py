@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='resumeanalysis',
+            name='ats_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AlterField(
+            model_name='resumeanalysis',
+            name='matching_keywords',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AlterField(
+            model_name='resumeanalysis',
+            name='missing_keywords',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AlterField(
+            model_name='resumeanalysis',
+            name='semantic_similarity',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddIndex(
+            model_name='resumeanalysis',
+            index=models.Index(fields=['status', 'created_at'], name='analyzer_re_status_d1bb28_idx'),
+        ),
+    ]
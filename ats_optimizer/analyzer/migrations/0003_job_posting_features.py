@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:42
+
+import hashlib
+import re
+
+from django.db import migrations, models
+
+
+def backfill_description_hashes(apps, schema_editor):
+    JobPosting = apps.get_model('analyzer', 'JobPosting')
+    for job_posting in JobPosting.objects.only('id', 'description').iterator():
+        normalized = re.sub(r'\s+', ' ', job_posting.description or '').strip().lower()
+        JobPosting.objects.filter(id=job_posting.id).update(
+            description_hash=hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0002_analysis_job_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='description_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='features_version',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='keywords',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_description_hashes, migrations.RunPython.noop),
+    ]
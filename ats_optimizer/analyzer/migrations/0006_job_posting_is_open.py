@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0005_resume_embedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='is_open',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+    ]
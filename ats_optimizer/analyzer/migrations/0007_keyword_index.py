@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0006_job_posting_is_open'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='KeywordIndexEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=100)),
+                ('analysis', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_entries', to='analyzer.resumeanalysis')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='keywordindexentry',
+            constraint=models.UniqueConstraint(fields=('keyword', 'analysis'), name='unique_keyword_analysis'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0007_keyword_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resumeanalysis',
+            index=models.Index(fields=['-created_at', '-id'], name='analyzer_re_created_93cf06_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resumeanalysis',
+            index=models.Index(fields=['job_posting', '-created_at', '-id'], name='analyzer_re_job_pos_2fd85f_idx'),
+        ),
+    ]
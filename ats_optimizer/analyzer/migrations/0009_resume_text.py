@@ -0,0 +1,78 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:14
+
+import hashlib
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def move_parsed_text(apps, schema_editor):
+    """Store each distinct parsed_text once, compressed, and point analyses at it"""
+    ResumeAnalysis = apps.get_model('analyzer', 'ResumeAnalysis')
+    ResumeText = apps.get_model('analyzer', 'ResumeText')
+
+    last_id = 0
+    while True:
+        batch = list(
+            ResumeAnalysis.objects.filter(id__gt=last_id).exclude(parsed_text__isnull=True)
+            .exclude(parsed_text='').order_by('id').only('id', 'parsed_text')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        hashes = {
+            analysis.id: hashlib.sha256(analysis.parsed_text.encode('utf-8')).hexdigest() for analysis in batch
+        }
+        existing = set(ResumeText.objects.filter(sha256__in=set(hashes.values())).values_list('sha256', flat=True))
+        new_texts = {}
+        for analysis in batch:
+            text_hash = hashes[analysis.id]
+            if text_hash not in existing and text_hash not in new_texts:
+                data = analysis.parsed_text.encode('utf-8')
+                new_texts[text_hash] = ResumeText(sha256=text_hash, data=zlib.compress(data, 6), size=len(data))
+        ResumeText.objects.bulk_create(new_texts.values())
+
+        text_ids = dict(ResumeText.objects.filter(sha256__in=set(hashes.values())).values_list('sha256', 'id'))
+        for analysis in batch:
+            analysis.stored_text_id = text_ids[hashes[analysis.id]]
+        ResumeAnalysis.objects.bulk_update(batch, ['stored_text'])
+
+
+def restore_parsed_text(apps, schema_editor):
+    ResumeAnalysis = apps.get_model('analyzer', 'ResumeAnalysis')
+    ResumeText = apps.get_model('analyzer', 'ResumeText')
+
+    for resume_text in ResumeText.objects.iterator():
+        ResumeAnalysis.objects.filter(stored_text_id=resume_text.id).update(
+            parsed_text=zlib.decompress(resume_text.data).decode('utf-8')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0008_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('data', models.BinaryField()),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='stored_text',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='analyses', to='analyzer.resumetext'),
+        ),
+        migrations.RunPython(move_parsed_text, restore_parsed_text),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:14
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0009_resume_text'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='resumeanalysis',
+            name='parsed_text',
+        ),
+    ]
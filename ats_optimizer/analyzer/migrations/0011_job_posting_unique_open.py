@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+MATCH_FIELDS = ['description_hash', 'title', 'company', 'location', 'experience_level', 'job_type']
+
+
+def close_duplicate_postings(apps, schema_editor):
+    """Keep the oldest of each set of identical open postings open so the constraint can be added"""
+    JobPosting = apps.get_model('analyzer', 'JobPosting')
+
+    seen = set()
+    duplicate_ids = []
+    for row in JobPosting.objects.filter(is_open=True).order_by('id').values('id', *MATCH_FIELDS):
+        key = tuple(row[field] for field in MATCH_FIELDS)
+        if key in seen:
+            duplicate_ids.append(row['id'])
+        seen.add(key)
+    JobPosting.objects.filter(id__in=duplicate_ids).update(is_open=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0010_remove_resumeanalysis_parsed_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(close_duplicate_postings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobposting',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_open', True)), fields=('description_hash', 'title', 'company', 'location', 'experience_level', 'job_type'), name='unique_open_job_posting'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+MATCH_FIELDS = ['description_hash', 'title', 'company', 'location', 'experience_level', 'job_type']
+BLANK_FIELDS = ['location', 'experience_level', 'job_type']
+
+
+def blank_null_match_fields(apps, schema_editor):
+    """Store missing location/experience level/job type as '' instead of NULL
+
+    An open posting that becomes identical to an older one is closed first,
+    as in 0011, so the unique constraint still holds.
+    """
+    JobPosting = apps.get_model('analyzer', 'JobPosting')
+
+    seen = set()
+    duplicate_ids = []
+    for row in JobPosting.objects.filter(is_open=True).order_by('id').values('id', *MATCH_FIELDS):
+        key = tuple((row[field] or '') if field in BLANK_FIELDS else row[field] for field in MATCH_FIELDS)
+        if key in seen:
+            duplicate_ids.append(row['id'])
+        seen.add(key)
+    JobPosting.objects.filter(id__in=duplicate_ids).update(is_open=False)
+
+    for field in BLANK_FIELDS:
+        JobPosting.objects.filter(**{f'{field}__isnull': True}).update(**{field: ''})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analyzer', '0011_job_posting_unique_open'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_null_match_fields, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='jobposting',
+            name='location',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='jobposting',
+            name='experience_level',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='jobposting',
+            name='job_type',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+    ]
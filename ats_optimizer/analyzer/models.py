@@ -1,25 +1,209 @@
-from django.db import models
+import zlib
+from datetime import timedelta
+from functools import cached_property
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .utils.hashing import description_hash, text_sha256
+
+TEXT_COMPRESSION_LEVEL = 6
+
+
+# Besides the normalized description, title and company, a posting is only reused when these match too
+POSTING_MATCH_FIELDS = ['location', 'experience_level', 'job_type']
+
+
+class JobPostingManager(models.Manager):
+    def get_or_create_for_description(self, title, company, description, **extra_fields):
+        """Reuse an identical open posting (same fields and normalized description).
+
+        Backed by the unique_open_job_posting constraint, so concurrent uploads
+        of the same posting end up sharing one row.
+        """
+        lookup = {field: extra_fields.pop(field, None) or '' for field in POSTING_MATCH_FIELDS}
+        with transaction.atomic(using=self.db):
+            return self.get_or_create(
+                description_hash=description_hash(description),
+                title=title,
+                company=company,
+                is_open=True,
+                **lookup,
+                defaults={'description': description, **extra_fields}
+            )
+
+
 class JobPosting(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     company = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
-    location = models.CharField(max_length=100, blank=True, null=True)
-    experience_level = models.CharField(max_length=50, blank=True, null=True)
-    job_type = models.CharField(max_length=50, blank=True, null=True)
+    # Stored as '' when missing (never NULL) so unique_open_job_posting can compare them
+    location = models.CharField(max_length=100, blank=True, default='')
+    experience_level = models.CharField(max_length=50, blank=True, default='')
+    job_type = models.CharField(max_length=50, blank=True, default='')
+    # Closed postings are left out when applicants match against all jobs
+    is_open = models.BooleanField(default=True, db_index=True)
+
+    # Precomputed job-description features, reused by every analysis of this posting
+    description_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    keywords = models.JSONField(blank=True, null=True)
+    embedding = models.BinaryField(blank=True, null=True)
+    features_version = models.CharField(max_length=200, blank=True)
+
+    objects = JobPostingManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['description_hash', 'title', 'company', *POSTING_MATCH_FIELDS],
+                condition=models.Q(is_open=True),
+                name='unique_open_job_posting'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        new_hash = description_hash(self.description)
+        if new_hash != self.description_hash:
+            # The description changed, so the cached features are stale
+            self.description_hash = new_hash
+            self.clear_features()
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {
+                    'description_hash', 'keywords', 'embedding', 'features_version'
+                }
+        super().save(*args, **kwargs)
+
+    def clear_features(self):
+        self.keywords = None
+        self.embedding = None
+        self.features_version = ''
+
+    def has_features(self, version):
+        return (
+            self.features_version == version
+            and self.keywords is not None
+            and self.embedding is not None
+        )
+
+
+class ResumeTextManager(models.Manager):
+    def store(self, text):
+        """The row holding this text, compressing and inserting it if it is new"""
+        if not text:
+            return None
+        data = text.encode('utf-8')
+        resume_text, _ = self.get_or_create(
+            sha256=text_sha256(text),
+            defaults={'data': zlib.compress(data, TEXT_COMPRESSION_LEVEL), 'size': len(data)}
+        )
+        return resume_text
+
+    def store_many(self, texts):
+        """Like store for a list of texts, with one lookup and one insert; returns the rows in order"""
+        hashes = [text_sha256(text) if text else None for text in texts]
+        rows = self.in_bulk({sha256 for sha256 in hashes if sha256}, field_name='sha256')
+        new = {}
+        for text, sha256 in zip(texts, hashes):
+            if sha256 and sha256 not in rows and sha256 not in new:
+                data = text.encode('utf-8')
+                new[sha256] = self.model(
+                    sha256=sha256, data=zlib.compress(data, TEXT_COMPRESSION_LEVEL), size=len(data)
+                )
+        if new:
+            # Another writer may insert the same text meanwhile, so read the ids back
+            self.bulk_create(new.values(), ignore_conflicts=True)
+            rows.update(self.in_bulk(new, field_name='sha256'))
+        return [rows[sha256] if sha256 else None for sha256 in hashes]
+
+    def unreferenced(self, max_age=3600):
+        """Texts no analysis refers to, older than max_age seconds
+
+        Deleting an analysis leaves its text behind (the FK is SET_NULL). Newer
+        texts are skipped: store() may have just returned one to a writer that
+        has not saved its analysis yet.
+        """
+        cutoff = timezone.now() - timedelta(seconds=max_age)
+        return self.filter(analyses__isnull=True, created_at__lt=cutoff)
+
+    def prune(self, max_age=3600):
+        """Delete unreferenced texts; returns how many were deleted"""
+        deleted, _ = self.unreferenced(max_age).delete()
+        return deleted
+
+
+class ResumeText(models.Model):
+    """Parsed resume text, zlib-compressed and shared by every analysis of the same text"""
+    sha256 = models.CharField(max_length=64, unique=True)
+    data = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)  # Uncompressed bytes
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ResumeTextManager()
+
+    @cached_property
+    def text(self):
+        return zlib.decompress(self.data).decode('utf-8')
 
 
 class ResumeAnalysis(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
     job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE)
     resume_file = models.FileField(upload_to='resumes/')
-    ats_score = models.FloatField()
-    semantic_similarity = models.FloatField()
-    matching_keywords = models.JSONField()
-    missing_keywords = models.JSONField()
+    ats_score = models.FloatField(default=0.0)
+    semantic_similarity = models.FloatField(default=0.0)
+    section_scores = models.JSONField(default=dict, blank=True)
+    matching_keywords = models.JSONField(default=list)
+    missing_keywords = models.JSONField(default=list)
+    skills = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     applicant_name = models.CharField(max_length=200, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
-    parsed_text = models.TextField(blank=True, null=True)
+    # Parsed text is stored once per distinct text; read it through parsed_text
+    stored_text = models.ForeignKey(
+        ResumeText, on_delete=models.SET_NULL, blank=True, null=True, related_name='analyses'
+    )
     status = models.CharField(max_length=50, default='pending')
     feedback = models.TextField(blank=True, null=True)
+
+    # Mean chunk embedding of the resume (float16) for candidate search
+    embedding = models.BinaryField(blank=True, null=True)
+    embedding_version = models.CharField(max_length=200, blank=True, default='')
+
+    # Job queue bookkeeping
+    attempts = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(blank=True, null=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            # Keyset pagination of the history, overall and per job posting
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['job_posting', '-created_at', '-id']),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    @property
+    def parsed_text(self):
+        """The resume text, fetched and decompressed on first access"""
+        return self.stored_text.text if self.stored_text_id else None
+
+
+class KeywordIndexEntry(models.Model):
+    """One posting of the inverted keyword index (see analyzer/keyword_index.py)"""
+    keyword = models.CharField(max_length=100)
+    analysis = models.ForeignKey(ResumeAnalysis, on_delete=models.CASCADE, related_name='keyword_entries')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['keyword', 'analysis'], name='unique_keyword_analysis'),
+        ]
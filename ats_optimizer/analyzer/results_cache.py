@@ -0,0 +1,56 @@
+"""Cached, conditional responses for the results of completed analyses.
+
+A completed analysis does not change until it is re-scored, so its results
+page and JSON are rendered once and served from the results cache after
+that. Responses carry an ``ETag`` (a hash of the body) and
+``Last-Modified`` (when the analysis completed), and a client that already
+has the current version gets ``304 Not Modified``. Saving the analysis or
+its job posting drops the cached entries (see analyzer/signals.py).
+"""
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .metrics import RESULTS_NOT_MODIFIED
+from .models import ResumeAnalysis
+from .utils.content_cache import get_cached_results, set_cached_results
+
+
+def _conditional(request, kind, response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Browsers may keep the page but must check it is still current
+    patch_cache_control(response, no_cache=True)
+
+    conditional = get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+    if conditional.status_code == 304:
+        RESULTS_NOT_MODIFIED.inc(kind=kind)
+    return conditional
+
+
+def cached_results_response(request, analysis_id, kind):
+    """The cached response for an analysis (a 304 if the client's copy is current), or None"""
+    entry = get_cached_results(analysis_id, kind)
+    if entry is None:
+        return None
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    return _conditional(request, kind, response, entry['etag'], entry['last_modified'])
+
+
+def cache_results_response(request, analysis, kind, response):
+    """Cache a freshly rendered response if the analysis is completed, and make it conditional"""
+    if analysis.status != ResumeAnalysis.STATUS_COMPLETED or response.status_code != 200:
+        return response
+
+    etag = f'"{hashlib.sha256(response.content).hexdigest()[:32]}"'
+    last_modified = int(analysis.completed_at.timestamp()) if analysis.completed_at else None
+    set_cached_results(analysis.id, kind, {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': etag,
+        'last_modified': last_modified,
+    })
+    return _conditional(request, kind, response, etag, last_modified)
@@ -1,9 +1,189 @@
-from .utils.resume_analyzer import ResumeAnalyzer
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import JobPosting, ResumeAnalysis, ResumeText
+from .utils.content_cache import get_cached_analysis
+from .utils.embeddings import RESUME_EMBEDDING_DTYPE, embedding_from_bytes, embedding_to_bytes
+from .utils.hashing import file_sha256
+from .utils.nlp_processor import features_version
+from .utils.resume_analyzer import ResumeAnalyzer, analysis_version
 
 def create_resume_processor():
-    """Factory function to create analyzer"""
+    """Factory function to create analyzer (models are shared via the registry)"""
     return ResumeAnalyzer()
 
+def run_analysis(analysis, analyzer=None):
+    """Analyze the stored resume of a ResumeAnalysis and save the results on it"""
+    analyzer = analyzer or create_resume_processor()
+    result = analyzer.analyze_resume(
+        analysis.resume_file.path,
+        analysis.job_posting.description,
+        job_features=get_job_features(analysis.job_posting, analyzer)
+    )
+    apply_result(analysis, result)
+    analysis.save()
+    return analysis
+
+def complete_from_cache(analysis):
+    """Fill in a new analysis from the result cache; returns False on a miss"""
+    result = get_cached_analysis(
+        file_sha256(analysis.resume_file.path),
+        analysis.job_posting.description,
+        analysis_version()
+    )
+    if result is None:
+        return False
+
+    apply_result(analysis, result)
+    analysis.save()
+    return True
+
+def start_analyses(job_posting, resume_files):
+    """Store resumes as analyses in progress, which queue workers never pick up.
+
+    The caller runs them straight away and must pass them to fail_analyses
+    if that raises, or they stay in progress until reclaim_stuck_jobs.
+    """
+    return [
+        ResumeAnalysis.objects.create(
+            job_posting=job_posting,
+            resume_file=resume_file,
+            status=ResumeAnalysis.STATUS_PROCESSING,
+            started_at=timezone.now(),
+            attempts=1
+        )
+        for resume_file in resume_files
+    ]
+
+def fail_analyses(analyses, error):
+    """Mark analyses whose run raised as failed instead of leaving them in progress"""
+    completed_at = timezone.now()
+    for analysis in analyses:
+        analysis.status = ResumeAnalysis.STATUS_FAILED
+        analysis.feedback = f"Analysis failed: {str(error)}"
+        analysis.completed_at = completed_at
+    ResumeAnalysis.objects.bulk_update(analyses, ['status', 'feedback', 'completed_at'])
+
+def run_batch_analysis(job_posting, resume_files, analyzer=None):
+    """Store and screen many resumes against one job posting, best match first"""
+    return screen_analyses(job_posting, start_analyses(job_posting, resume_files), analyzer)
+
+def screen_analyses(job_posting, analyses, analyzer=None):
+    """Analyze stored resumes against one job posting and save them, best match first"""
+    analyzer = analyzer or create_resume_processor()
+    analyses_by_path = {analysis.resume_file.path: analysis for analysis in analyses}
+
+    try:
+        results = analyzer.analyze_batch(
+            job_posting.description,
+            list(analyses_by_path),
+            job_features=get_job_features(job_posting, analyzer)
+        )
+
+        ranked = []
+        with transaction.atomic():
+            for result in results:
+                analysis = analyses_by_path[result['file_path']]
+                apply_result(analysis, result)
+                analysis.rank = result['rank']
+                analysis.save()
+                ranked.append(analysis)
+    except Exception as e:
+        fail_analyses(analyses, e)
+        raise
+    return ranked
+
+def get_job_features(job_posting, analyzer=None):
+    """Return the posting's keywords and embedding, computing and storing them once"""
+    version = features_version()
+
+    if job_posting.has_features(version):
+        return {
+            'keywords': set(job_posting.keywords),
+            'embedding': embedding_from_bytes(job_posting.embedding)
+        }
+
+    # Only load the models when the features have to be computed
+    analyzer = analyzer or create_resume_processor()
+    features = analyzer.compute_job_features(job_posting.description)
+    job_posting.keywords = sorted(features['keywords'])
+    job_posting.embedding = embedding_to_bytes(features['embedding'])
+    job_posting.features_version = version
+    job_posting.save(update_fields=['keywords', 'embedding', 'features_version'])
+    return features
+
+def stale_job_postings(version):
+    """Open postings whose stored features are missing or from other models"""
+    return JobPosting.objects.filter(is_open=True).filter(
+        Q(keywords__isnull=True) | Q(embedding__isnull=True) | ~Q(features_version=version)
+    ).order_by('id')
+
+def refresh_job_features(analyzer=None, limit=None):
+    """Compute the features of stale open postings in batches; returns how many were refreshed"""
+    analyzer = analyzer or create_resume_processor()
+    version = analyzer.nlp_processor.features_version
+    refreshed = 0
+    while limit is None or refreshed < limit:
+        batch_size = settings.ANALYZER_BATCH_SIZE
+        if limit is not None:
+            batch_size = min(batch_size, limit - refreshed)
+        batch = list(
+            stale_job_postings(version).only('id', 'keywords', 'embedding', 'features_version')[:batch_size]
+        )
+        if not batch:
+            break
+        ensure_job_features(batch, analyzer)
+        refreshed += len(batch)
+    return refreshed
+
+def ensure_job_features(job_postings, analyzer=None):
+    """get_job_features for many postings, computing the missing ones in one batch"""
+    analyzer = analyzer or create_resume_processor()
+    version = analyzer.nlp_processor.features_version
+    missing = [job_posting for job_posting in job_postings if not job_posting.has_features(version)]
+    if not missing:
+        return
+
+    descriptions = dict(
+        JobPosting.objects.filter(id__in=[job_posting.id for job_posting in missing])
+        .values_list('id', 'description')
+    )
+    texts = [descriptions[job_posting.id] for job_posting in missing]
+    documents = analyzer.nlp_processor.analyze_documents(texts)
+    embeddings = analyzer.nlp_processor.encode(texts)
+
+    for job_posting, document, embedding in zip(missing, documents, embeddings):
+        job_posting.keywords = sorted(document.keywords)
+        job_posting.embedding = embedding_to_bytes(embedding)
+        job_posting.features_version = version
+    JobPosting.objects.bulk_update(missing, ['keywords', 'embedding', 'features_version'])
+
+def apply_result(analysis, result, store_text=True):
+    """Copy an analyzer result dict onto a ResumeAnalysis (without saving the analysis)
+
+    With store_text=False the caller stores result['resume_text'] itself,
+    e.g. for a whole batch with ResumeText.objects.store_many.
+    """
+    analysis.ats_score = result['ats_score']
+    analysis.semantic_similarity = result['semantic_similarity']
+    analysis.section_scores = result.get('section_scores', {})
+    analysis.matching_keywords = result['matching_keywords']
+    analysis.missing_keywords = result['missing_keywords']
+    analysis.skills = result.get('skills', [])
+    analysis.applicant_name = result['applicant_name']
+    analysis.email = result['email']
+    analysis.phone_number = result['phone_number']
+    if store_text:
+        analysis.stored_text = ResumeText.objects.store(result['resume_text'])
+    analysis.feedback = result['feedback']
+    if result.get('embedding') is not None:
+        analysis.embedding = embedding_to_bytes(result['embedding'], RESUME_EMBEDDING_DTYPE)
+        analysis.embedding_version = result['embedding_version']
+    analysis.status = result['status']
+    analysis.completed_at = timezone.now()
+
 # For backward compatibility
 class ResumeProcessor:
     def __init__(self):
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import JobPosting, ResumeAnalysis
+
+# Saves that only touch these fields cannot change what an analysis is indexed under
+INDEXED_FIELDS = {'status', 'skills', 'matching_keywords'}
+
+# Job posting fields that never appear on a results page
+UNRENDERED_JOB_FIELDS = {'keywords', 'embedding', 'features_version', 'is_open'}
+
+
+@receiver(post_save, sender=ResumeAnalysis)
+def update_keyword_index(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the inverted keyword index in step with saved analyses"""
+    if created and instance.status != ResumeAnalysis.STATUS_COMPLETED:
+        return
+    if update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+
+    from .keyword_index import index_analysis
+    index_analysis(instance)
+
+
+@receiver(post_save, sender=ResumeAnalysis)
+@receiver(post_delete, sender=ResumeAnalysis)
+def invalidate_analysis_results(sender, instance, created=False, **kwargs):
+    """Drop cached results when an analysis is re-scored or deleted"""
+    if created:
+        return
+
+    from .utils.content_cache import invalidate_cached_results
+    invalidate_cached_results([instance.id])
+
+
+@receiver(post_save, sender=JobPosting)
+def invalidate_job_posting_results(sender, instance, created, update_fields=None, **kwargs):
+    """Drop cached results that show a job posting when it is edited"""
+    if created or (update_fields is not None and set(update_fields) <= UNRENDERED_JOB_FIELDS):
+        return
+
+    from .utils.content_cache import invalidate_cached_results
+    invalidate_cached_results(instance.resumeanalysis_set.values_list('id', flat=True))
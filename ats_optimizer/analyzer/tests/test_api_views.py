@@ -0,0 +1,134 @@
+import os
+import tempfile
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.files.move import file_move_safe
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import analysis_pool
+from ..models import JobPosting, ResumeAnalysis
+
+
+def complete_analysis(analysis_id):
+    ResumeAnalysis.objects.filter(id=analysis_id).update(
+        status=ResumeAnalysis.STATUS_COMPLETED, ats_score=75.0, semantic_similarity=60.0,
+        matching_keywords=['python'], missing_keywords=['kubernetes'], completed_at=timezone.now()
+    )
+    return ResumeAnalysis.STATUS_COMPLETED
+
+
+# Stands in for the pool process, which analyzes and saves the row
+complete_in_pool = sync_to_async(complete_analysis)
+
+
+class AnalysisAPIViewTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        upload_settings = override_settings(MEDIA_ROOT=temp_dir.name, FILE_UPLOAD_TEMP_DIR=temp_dir.name)
+        upload_settings.enable()
+        self.addCleanup(upload_settings.disable)
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        self.url = reverse('analyzer:api_analyze')
+
+    def post(self, query=''):
+        resume = SimpleUploadedFile('resume.txt', b'Python developer with Django experience')
+        return self.client.post(self.url + query, {'resume_file': resume, 'job_posting_id': self.job_posting.id})
+
+    def test_sync_request_returns_the_analysis(self):
+        with mock.patch.object(analysis_pool, 'analyze_in_pool', side_effect=complete_in_pool) as analyze:
+            response = self.post()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        analyze.assert_called_once_with(data['id'])
+        self.assertEqual((data['status'], data['ats_score']), ('completed', 75.0))
+        self.assertEqual(data['job_posting']['id'], self.job_posting.id)
+
+    def test_sync_pool_error_fails_the_analysis(self):
+        with mock.patch.object(analysis_pool, 'analyze_in_pool', side_effect=RuntimeError("pool died")):
+            response = self.post()
+
+        self.assertEqual(response.status_code, 500)
+        analysis = ResumeAnalysis.objects.get()
+        self.assertEqual(analysis.status, ResumeAnalysis.STATUS_FAILED)
+
+    @override_settings(ANALYZER_ASYNC_JOBS=True)
+    def test_async_request_is_queued(self):
+        with mock.patch.object(analysis_pool, 'analyze_in_pool') as analyze:
+            response = self.post('?async=1')
+
+        self.assertEqual(response.status_code, 202)
+        data = response.json()['data']
+        self.assertEqual(data['status'], ResumeAnalysis.STATUS_PENDING)
+        self.assertEqual(data['status_url'], reverse('analyzer:api_analysis_status', args=[data['id']]))
+        analyze.assert_not_called()
+
+    @override_settings(ANALYZER_ASYNC_JOBS=False)
+    def test_async_request_runs_inline_without_workers(self):
+        with mock.patch.object(analysis_pool, 'analyze_in_pool', side_effect=complete_in_pool) as analyze:
+            response = self.post('?async=1')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        analyze.assert_called_once_with(data['id'])
+        self.assertEqual(data['status'], ResumeAnalysis.STATUS_COMPLETED)
+        status = self.client.get(data['status_url']).json()['data']
+        self.assertTrue(status['finished'])
+
+    def test_invalid_form(self):
+        with mock.patch.object(analysis_pool, 'analyze_in_pool') as analyze:
+            response = self.client.post(self.url, {'job_posting_id': self.job_posting.id})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('resume_file', response.json()['errors'])
+        analyze.assert_not_called()
+        self.assertFalse(ResumeAnalysis.objects.exists())
+
+    def test_missing_job_fields(self):
+        resume = SimpleUploadedFile('resume.txt', b'Python developer')
+
+        response = self.client.post(self.url, {'resume_file': resume})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('job_description', response.json()['errors'])
+
+
+@override_settings(ANALYZER_ASYNC_JOBS=True)
+class UploadStorageTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.upload_dir = os.path.join(temp_dir.name, 'tmp_uploads')
+        os.makedirs(self.upload_dir)
+        upload_settings = override_settings(MEDIA_ROOT=temp_dir.name, FILE_UPLOAD_TEMP_DIR=self.upload_dir)
+        upload_settings.enable()
+        self.addCleanup(upload_settings.disable)
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+
+    def test_upload_is_moved_into_storage_without_being_read(self):
+        content = b'Python developer with Django experience\n' * 1000
+        reads = []
+        original_read = TemporaryUploadedFile.read
+
+        def read(upload, *args):
+            reads.append(args)
+            return original_read(upload, *args)
+
+        with mock.patch.object(TemporaryUploadedFile, 'read', read, create=True), \
+                mock.patch('django.core.files.storage.filesystem.file_move_safe', wraps=file_move_safe) as move:
+            response = self.client.post(reverse('analyzer:api_analyze') + '?async=1', {
+                'resume_file': SimpleUploadedFile('resume.txt', content), 'job_posting_id': self.job_posting.id
+            })
+
+        self.assertEqual(response.status_code, 202)
+        # Copying into storage would have read the file in chunks
+        self.assertEqual(reads, [])
+        move.assert_called_once()
+        self.assertEqual(os.listdir(self.upload_dir), [])
+        with ResumeAnalysis.objects.get().resume_file.open('rb') as f:
+            self.assertEqual(f.read(), content)
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .. import candidates
+from ..models import JobPosting, ResumeAnalysis
+from ..utils.embeddings import RESUME_EMBEDDING_DTYPE, embedding_to_bytes
+from ..utils.nlp_processor import embedding_model_version, features_version
+from ..utils.vector_index import ExactIndex
+
+
+class ExactIndexRemoveTests(SimpleTestCase):
+    def test_removed_ids_are_not_returned(self):
+        index = ExactIndex(2)
+        index.add([1, 2, 3], [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+
+        index.remove([1, 99])
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual([item_id for item_id, _ in index.search([1.0, 0.0], 3)], [2, 3])
+
+    def test_removed_id_can_be_added_again(self):
+        index = ExactIndex(2)
+        index.add([1, 2], [[1.0, 0.0], [0.0, 1.0]])
+        index.remove([1])
+
+        index.add([1], [[0.0, 1.0]])
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual({item_id for item_id, _ in index.search([0.0, 1.0], 2)}, {1, 2})
+
+
+class FindCandidatesTests(TestCase):
+    def setUp(self):
+        job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        JobPosting.objects.filter(id=job_posting.id).update(
+            keywords=['python'], embedding=embedding_to_bytes([1.0, 0.0]), features_version=features_version()
+        )
+        self.job_posting = JobPosting.objects.get(id=job_posting.id)
+        self.analyses = [
+            ResumeAnalysis.objects.create(
+                job_posting=self.job_posting, resume_file=f'resumes/{index}.txt',
+                status=ResumeAnalysis.STATUS_COMPLETED, completed_at=timezone.now(),
+                embedding=embedding_to_bytes(vector, RESUME_EMBEDDING_DTYPE), embedding_version=embedding_model_version()
+            )
+            for index, vector in enumerate([[1.0, 0.0], [0.9, 0.2], [0.7, 0.7], [0.0, 1.0]])
+        ]
+        index_patch = mock.patch.object(candidates, 'candidate_index', candidates.CandidateIndex())
+        self.index = index_patch.start()
+        self.addCleanup(index_patch.stop)
+
+    def candidate_ids(self, k):
+        # The posting's features are stored, so no model is loaded
+        analyzer = SimpleNamespace(nlp_processor=SimpleNamespace(features_version=features_version()))
+        results, _ = candidates.find_candidates(self.job_posting, k=k, analyzer=analyzer)
+        return [analysis.id for analysis, _ in results]
+
+    def test_best_matches_first(self):
+        self.assertEqual(self.candidate_ids(2), [self.analyses[0].id, self.analyses[1].id])
+
+    def test_requeued_and_deleted_analyses_are_dropped(self):
+        self.candidate_ids(2)
+        ResumeAnalysis.objects.filter(id=self.analyses[0].id).update(status=ResumeAnalysis.STATUS_PENDING)
+        self.analyses[1].delete()
+
+        self.assertEqual(self.candidate_ids(2), [self.analyses[2].id, self.analyses[3].id])
+        self.assertEqual(len(self.index), 2)
+
+    def test_shortfall_after_dropping_is_refilled(self):
+        self.candidate_ids(1)
+        with mock.patch.object(candidates, 'SEARCH_OVERFETCH', 0):
+            ResumeAnalysis.objects.filter(
+                id__in=[self.analyses[0].id, self.analyses[1].id]
+            ).update(status=ResumeAnalysis.STATUS_FAILED)
+
+            self.assertEqual(self.candidate_ids(1), [self.analyses[2].id])
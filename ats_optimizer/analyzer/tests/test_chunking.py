@@ -0,0 +1,102 @@
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from ..utils.chunking import (
+    SECTION_WEIGHTS, Chunk, aggregate_score_matrix, aggregate_scores, chunk_resume, split_sections, window_words
+)
+
+
+class SplitSectionsTests(SimpleTestCase):
+    def test_inline_headings(self):
+        text = "Jane Doe SUMMARY Backend developer Work Experience: Acme 2019-2024 Skills Python, Django"
+
+        self.assertEqual(split_sections(text), [
+            ('other', 'Jane Doe'),
+            ('summary', 'Backend developer'),
+            ('experience', 'Acme 2019-2024'),
+            ('skills', 'Python, Django'),
+        ])
+
+    def test_lowercase_words_are_not_headings(self):
+        text = "5 years of experience with education software"
+
+        self.assertEqual(split_sections(text), [('other', text)])
+
+    def test_empty_sections_are_dropped(self):
+        self.assertEqual(split_sections("Skills Education MIT"), [('education', 'MIT')])
+
+
+class WindowWordsTests(SimpleTestCase):
+    def test_short_text_is_one_window(self):
+        self.assertEqual(window_words("one two three", max_words=5, overlap=2), ["one two three"])
+
+    def test_windows_overlap(self):
+        words = ' '.join(str(number) for number in range(10))
+
+        self.assertEqual(window_words(words, max_words=4, overlap=1), ['0 1 2 3', '3 4 5 6', '6 7 8 9'])
+
+    def test_last_window_reaches_the_end(self):
+        words = ' '.join(str(number) for number in range(7))
+
+        windows = window_words(words, max_words=4, overlap=2)
+
+        self.assertEqual(windows, ['0 1 2 3', '2 3 4 5', '4 5 6'])
+
+    def test_overlap_larger_than_window_still_advances(self):
+        self.assertEqual(window_words("a b c", max_words=2, overlap=5), ['a b', 'b c'])
+
+    def test_empty_text(self):
+        self.assertEqual(window_words("   ", max_words=4, overlap=1), [])
+
+
+class ChunkResumeTests(SimpleTestCase):
+    def test_chunks_are_tagged_with_their_section(self):
+        chunks = chunk_resume("Skills a b c d e Education f", max_words=3, overlap=1)
+
+        self.assertEqual(chunks, [
+            Chunk('skills', 'a b c'), Chunk('skills', 'c d e'), Chunk('education', 'f')
+        ])
+
+    def test_identical_text_has_the_same_hash(self):
+        self.assertEqual(Chunk('skills', 'python').hash, Chunk('experience', 'python').hash)
+        self.assertNotEqual(Chunk('skills', 'python').hash, Chunk('skills', 'java').hash)
+
+
+class AggregateTests(SimpleTestCase):
+    chunks = [Chunk('experience', 'a'), Chunk('experience', 'b'), Chunk('education', 'c')]
+
+    def test_sections_score_as_their_best_chunk(self):
+        _, section_scores = aggregate_scores(self.chunks, [0.2, 0.6, 0.4], method='max')
+
+        self.assertAlmostEqual(section_scores['experience'], 0.6)
+        self.assertAlmostEqual(section_scores['education'], 0.4)
+
+    def test_methods(self):
+        scores = [0.2, 0.6, 0.4]
+        weights = SECTION_WEIGHTS['experience'], SECTION_WEIGHTS['education']
+
+        self.assertAlmostEqual(aggregate_scores(self.chunks, scores, method='max')[0], 0.6)
+        self.assertAlmostEqual(aggregate_scores(self.chunks, scores, method='mean')[0], 0.4)
+        self.assertAlmostEqual(
+            aggregate_scores(self.chunks, scores, method='weighted')[0],
+            (0.6 * weights[0] + 0.4 * weights[1]) / sum(weights), places=6
+        )
+
+    @override_settings(ANALYZER_SIMILARITY_AGGREGATION='median')
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            aggregate_scores(self.chunks, [0.1, 0.2, 0.3])
+
+    def test_no_chunks(self):
+        self.assertEqual(aggregate_scores([], []), (0.0, {}))
+
+    def test_matrix_matches_one_query_at_a_time(self):
+        rows = np.array([[0.2, 0.6, 0.4], [0.9, 0.1, 0.3]])
+
+        overall, sections, section_scores = aggregate_score_matrix(self.chunks, rows, method='weighted')
+
+        self.assertEqual(sections, ['experience', 'education'])
+        for row, row_overall, row_sections in zip(rows, overall, section_scores):
+            similarity, by_section = aggregate_scores(self.chunks, row, method='weighted')
+            self.assertAlmostEqual(float(row_overall), similarity, places=6)
+            self.assertEqual(list(by_section.values()), [float(score) for score in row_sections])
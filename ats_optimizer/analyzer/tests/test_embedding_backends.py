@@ -0,0 +1,41 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from ..utils.embedding_backends import load_embedding_model, pool_embeddings
+
+
+class PoolEmbeddingsTests(SimpleTestCase):
+    # Two sequences of three tokens; the second has one padding token
+    token_embeddings = np.array([
+        [[1.0, 0.0], [3.0, 0.0], [2.0, 3.0]],
+        [[0.0, 2.0], [0.0, 4.0], [100.0, 100.0]],
+    ], dtype=np.float32)
+    attention_mask = np.array([[1, 1, 1], [1, 1, 0]], dtype=np.int64)
+
+    def test_mean_pooling_skips_padding(self):
+        pooled = pool_embeddings(self.token_embeddings, self.attention_mask, normalize=False)
+
+        np.testing.assert_allclose(pooled, [[2.0, 1.0], [0.0, 3.0]])
+        self.assertEqual(pooled.dtype, np.float32)
+
+    def test_cls_pooling_takes_the_first_token(self):
+        pooled = pool_embeddings(self.token_embeddings, self.attention_mask, pooling='cls', normalize=False)
+
+        np.testing.assert_allclose(pooled, [[1.0, 0.0], [0.0, 2.0]])
+
+    def test_normalized_to_unit_length(self):
+        pooled = pool_embeddings(self.token_embeddings, self.attention_mask)
+
+        np.testing.assert_allclose(pooled, [[2.0, 1.0] / np.sqrt(5.0), [0.0, 1.0]], rtol=1e-6)
+        np.testing.assert_allclose(np.linalg.norm(pooled, axis=1), [1.0, 1.0], rtol=1e-6)
+
+    def test_empty_and_zero_rows_do_not_divide_by_zero(self):
+        token_embeddings = np.zeros((1, 2, 2), dtype=np.float32)
+
+        pooled = pool_embeddings(token_embeddings, np.zeros((1, 2), dtype=np.int64))
+
+        np.testing.assert_array_equal(pooled, [[0.0, 0.0]])
+
+    def test_unknown_backend(self):
+        with self.assertRaisesMessage(ValueError, 'Unknown embedding backend: tensorflow'):
+            load_embedding_model('tensorflow', 'all-MiniLM-L6-v2')
@@ -0,0 +1,122 @@
+import threading
+from unittest import mock
+
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from ..utils.embedding_server import EmbeddingClient, EmbeddingServerError, MicroBatcher, is_insecure_key
+
+
+class FakeModel:
+    """Encodes like OnnxEmbeddingModel: needs an integer batch size"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.batch_sizes.append(batch_size)
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        return np.array([[float(len(text)), 1.0] for batch in batches for text in batch], dtype=np.float32)
+
+
+@override_settings(ANALYZER_BATCH_SIZE=8)
+class EmbeddingClientFallbackTests(SimpleTestCase):
+    def setUp(self):
+        self.model = FakeModel()
+        self.client = EmbeddingClient(
+            '/tmp/ats-test-no-such-embedding-server.sock', fallback=lambda: self.model, retry_interval=60
+        )
+
+    def test_encodes_locally_when_server_is_down(self):
+        embeddings = self.client.encode(['a', 'abc'])
+
+        np.testing.assert_array_equal(embeddings, [[1.0, 1.0], [3.0, 1.0]])
+        self.assertEqual(self.model.batch_sizes, [8])
+
+    def test_single_text_without_batch_size(self):
+        embedding = self.client.encode('abcd')
+
+        np.testing.assert_array_equal(embedding, [4.0, 1.0])
+        self.assertEqual(self.model.batch_sizes, [8])
+
+    def test_explicit_batch_size_is_kept(self):
+        self.client.encode(['a', 'b', 'c'], batch_size=2)
+
+        self.assertEqual(self.model.batch_sizes, [2])
+
+    def test_server_is_not_retried_until_the_interval_passes(self):
+        self.client.encode(['a'])
+        self.client._request = lambda command, payload: self.fail("server retried too early")
+
+        self.client.encode(['b'])
+        self.assertEqual(len(self.model.batch_sizes), 2)
+
+    def test_server_error_reply_falls_back(self):
+        client = EmbeddingClient('/tmp/ats-test-embeddings.sock', fallback=lambda: self.model, retry_interval=60)
+
+        with mock.patch.object(client, '_request', side_effect=EmbeddingServerError("model failed")) as request:
+            embeddings = client.encode(['abc'])
+            client.encode(['d'])
+
+        np.testing.assert_array_equal(embeddings, [[3.0, 1.0]])
+        self.assertEqual(len(self.model.batch_sizes), 2)
+        request.assert_called_once()
+
+    def test_server_error_without_fallback_is_raised(self):
+        client = EmbeddingClient('/tmp/ats-test-embeddings.sock')
+
+        with mock.patch.object(client, '_request', side_effect=EmbeddingServerError("model failed")):
+            with self.assertRaisesMessage(EmbeddingServerError, 'model failed'):
+                client.encode(['a'])
+
+    def test_without_fallback_the_error_is_raised(self):
+        client = EmbeddingClient('/tmp/ats-test-no-such-embedding-server.sock')
+
+        with self.assertRaises(OSError):
+            client.encode(['a'])
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def test_concurrent_requests_are_counted(self):
+        batcher = MicroBatcher(FakeModel(), max_batch_size=16, max_wait=0.01)
+        results = {}
+
+        def encode(index):
+            results[index] = batcher.encode(['x' * index])
+
+        threads = [threading.Thread(target=encode, args=(index,)) for index in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for index, embeddings in results.items():
+            np.testing.assert_array_equal(embeddings, [[float(index), 1.0]])
+        stats = batcher.stats
+        self.assertEqual((stats['requests'], stats['texts']), (8, 8))
+        self.assertLessEqual(stats['batches'], 8)
+
+    def test_model_errors_reach_every_waiting_request(self):
+        model = mock.Mock(**{'encode.side_effect': ValueError("out of memory")})
+        batcher = MicroBatcher(model, max_wait=0.01)
+
+        with self.assertRaisesMessage(RuntimeError, 'out of memory'):
+            batcher.encode(['a'])
+        self.assertEqual(batcher.stats['requests'], 0)
+
+
+class ServerKeyTests(SimpleTestCase):
+    def test_development_keys_are_insecure(self):
+        self.assertTrue(is_insecure_key(''))
+        self.assertTrue(is_insecure_key('django-insecure-abc'))
+        self.assertFalse(is_insecure_key('a-private-deployment-key'))
+
+    @override_settings(
+        ANALYZER_EMBEDDING_SERVER_SOCKET='/tmp/ats-test-embeddings.sock',
+        ANALYZER_EMBEDDING_SERVER_KEY='django-insecure-abc'
+    )
+    def test_server_refuses_the_development_key(self):
+        with self.assertRaisesMessage(CommandError, 'ANALYZER_EMBEDDING_SERVER_KEY'):
+            call_command('run_embedding_server', socket='/tmp/ats-test-embeddings.sock')
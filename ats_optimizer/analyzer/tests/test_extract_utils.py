@@ -0,0 +1,106 @@
+import os
+import tempfile
+import time
+from concurrent.futures import Future
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from ..utils import extract_utils
+from ..utils.extract_utils import _collect_pages, _extract_pdf_parallel, extract_document, read_text_txt
+
+
+@override_settings(ANALYZER_MAX_TEXT_CHARS=100)
+class TxtExtractionTests(SimpleTestCase):
+    def extract(self, content):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+            f.write(content)
+        self.addCleanup(os.remove, f.name)
+        return extract_document(f.name)
+
+    def test_short_file_is_not_truncated(self):
+        result = self.extract("Python   developer\n\nDjango")
+
+        self.assertEqual(result.text, "Python developer Django")
+        self.assertFalse(result.truncated)
+
+    def test_long_file_is_cut_at_the_budget(self):
+        result = self.extract("x" * 150)
+
+        self.assertEqual(result.text, "x" * 100)
+        self.assertTrue(result.truncated)
+
+    def test_truncation_is_reported_when_whitespace_collapses_under_the_budget(self):
+        result = self.extract('word' + ' ' * 200 + 'MIDDLE and the rest of the resume')
+
+        self.assertEqual(result.text, 'word')
+        self.assertTrue(result.truncated)
+
+    def test_explicit_zero_budget(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+            f.write("Python developer")
+        self.addCleanup(os.remove, f.name)
+
+        self.assertEqual(read_text_txt(f.name, max_chars=0), ('', True))
+
+
+def slow_pages(delays):
+    for index, delay in enumerate(delays):
+        time.sleep(delay)
+        yield f"page {index}"
+
+
+class CollectPagesTests(SimpleTestCase):
+    def test_all_pages_within_budget(self):
+        self.assertEqual(_collect_pages(slow_pages([0, 0]), 100, time.time() + 5), (['page 0', 'page 1'], False))
+
+    def test_slow_page_does_not_overrun_the_deadline(self):
+        start = time.monotonic()
+
+        pages, truncated = _collect_pages(slow_pages([0, 2.0, 0]), 100, time.time() + 0.2)
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(pages, ['page 0'])
+        self.assertTrue(truncated)
+
+    def test_character_budget(self):
+        self.assertEqual(_collect_pages(slow_pages([0, 0, 0]), 8, time.time() + 5), (['page 0', 'page 1'], True))
+
+    def test_read_errors_are_raised(self):
+        def broken_pages():
+            yield "page 0"
+            raise ValueError("bad page")
+
+        with self.assertRaisesMessage(ValueError, 'bad page'):
+            _collect_pages(broken_pages(), 100, time.time() + 5)
+
+
+@override_settings(ANALYZER_PDF_PAGES_PER_TASK=2)
+class ParallelPdfTests(SimpleTestCase):
+    def extract(self, outcomes):
+        """Run _extract_pdf_parallel with one range result per task; None leaves the task running"""
+        futures = []
+        for outcome in outcomes:
+            future = Future()
+            if outcome is not None:
+                future.set_result(outcome)
+            futures.append(future)
+        pool = mock.Mock(**{'submit.side_effect': futures})
+
+        with mock.patch.object(extract_utils, '_get_pdf_pool', return_value=pool):
+            return _extract_pdf_parallel('resume.pdf', 2 * len(outcomes), time.time() + 0.05)
+
+    def test_all_ranges(self):
+        result = self.extract([(['p0', 'p1'], False), (['p2', 'p3'], False)])
+
+        self.assertEqual(result, (['p0', 'p1', 'p2', 'p3'], False))
+
+    def test_cut_at_the_first_unfinished_range(self):
+        result = self.extract([(['p0', 'p1'], False), None, (['p4', 'p5'], False)])
+
+        self.assertEqual(result, (['p0', 'p1'], True))
+
+    def test_cut_after_a_range_truncated_by_the_deadline(self):
+        result = self.extract([(['p0'], True), (['p2', 'p3'], False)])
+
+        self.assertEqual(result, (['p0'], True))
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..history import CursorError, decode_cursor, encode_cursor, history_page
+from ..models import JobPosting, ResumeAnalysis
+
+
+class HistoryPageTests(TestCase):
+    def setUp(self):
+        job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        start = timezone.now()
+        # Groups of analyses share a created_at, so pages break inside a tie
+        minutes = [0, 0, 0, 1, 1, 2, 3, 3, 3, 3]
+        for minute in minutes:
+            analysis = ResumeAnalysis.objects.create(job_posting=job_posting, resume_file='resumes/r.txt')
+            ResumeAnalysis.objects.filter(id=analysis.id).update(created_at=start + timedelta(minutes=minute))
+        self.newest_first = list(
+            ResumeAnalysis.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+
+    def ids(self, page):
+        return [analysis.id for analysis in page.items]
+
+    def walk_forward(self, page_size):
+        pages = [history_page(page_size=page_size)]
+        while pages[-1].next_cursor:
+            pages.append(history_page(after=pages[-1].next_cursor, page_size=page_size))
+        return pages
+
+    def test_first_page(self):
+        page = history_page(page_size=3)
+
+        self.assertEqual(self.ids(page), self.newest_first[:3])
+        self.assertIsNotNone(page.next_cursor)
+        self.assertIsNone(page.previous_cursor)
+
+    def test_next_pages_cover_every_analysis_once(self):
+        for page_size in (1, 2, 3, 4, 10, 11):
+            with self.subTest(page_size=page_size):
+                pages = self.walk_forward(page_size)
+
+                self.assertEqual([analysis_id for page in pages for analysis_id in self.ids(page)], self.newest_first)
+                self.assertIsNone(pages[-1].next_cursor)
+                self.assertTrue(all(page.previous_cursor for page in pages[1:]))
+
+    def test_previous_pages_lead_back_to_the_first_page(self):
+        for page_size in (1, 2, 3, 4):
+            with self.subTest(page_size=page_size):
+                forward = self.walk_forward(page_size)
+
+                page = forward[-1]
+                backward = [page]
+                while page.previous_cursor:
+                    page = history_page(before=page.previous_cursor, page_size=page_size)
+                    backward.append(page)
+
+                self.assertEqual([self.ids(page) for page in backward[::-1]], [self.ids(page) for page in forward])
+                self.assertIsNone(backward[-1].previous_cursor)
+
+    def test_before_the_second_newest_returns_a_full_first_page(self):
+        second = ResumeAnalysis.objects.get(id=self.newest_first[1])
+
+        page = history_page(before=encode_cursor(second), page_size=3)
+
+        self.assertEqual(self.ids(page), self.newest_first[:3])
+        self.assertIsNone(page.previous_cursor)
+
+    def test_cursor_round_trip(self):
+        analysis = ResumeAnalysis.objects.get(id=self.newest_first[4])
+
+        self.assertEqual(decode_cursor(encode_cursor(analysis)), (analysis.created_at, analysis.id))
+
+    def test_invalid_cursors(self):
+        for cursor in ['not-a-cursor', 'MjAyNg', '////']:
+            with self.subTest(cursor=cursor), self.assertRaises(CursorError):
+                history_page(after=cursor)
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+
+from .. import ingest
+from ..ingest import Checkpoint, iter_source
+from ..models import JobPosting, ResumeAnalysis, ResumeText
+
+
+class InlineExecutor(ThreadPoolExecutor):
+    """Stands in for the process pool; the analysis itself is mocked"""
+
+    def __init__(self, max_workers, mp_context, initializer, initargs):
+        super().__init__(max_workers)
+
+
+def fake_analyze_file(storage_name):
+    with open(default_storage.path(storage_name)) as f:
+        text = f.read()
+    return {
+        'ats_score': 50.0, 'semantic_similarity': 0.5, 'matching_keywords': ['python'], 'missing_keywords': [],
+        'applicant_name': None, 'email': None, 'phone_number': None, 'resume_text': text,
+        'feedback': '', 'status': ResumeAnalysis.STATUS_COMPLETED,
+    }, {}
+
+
+class IterSourceTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_zip_is_closed_when_the_generator_is_abandoned(self):
+        path = os.path.join(self.temp_dir, 'resumes.zip')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('b.txt', 'Go developer')
+            archive.writestr('a.txt', 'Python developer')
+            archive.writestr('__MACOSX/a.txt', 'metadata')
+
+        source_files = iter_source(path)
+        first = next(source_files)
+        self.assertEqual((first.name, first.read()), ('a.txt', b'Python developer'))
+
+        source_files.close()
+
+        with self.assertRaises(ValueError):
+            first.read()
+
+
+class IngestTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.source = os.path.join(self.media_root, 'source')
+        os.makedirs(self.source)
+        for name, text in [('a.txt', 'Python developer'), ('b.txt', 'Go developer'), ('c.txt', 'Python developer '),
+                           ('d.txt', ''), ('e.txt', 'Python developer')]:
+            with open(os.path.join(self.source, name), 'w') as f:
+                f.write(text)
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+
+    def run_ingest(self, **kwargs):
+        checkpoint = Checkpoint(os.path.join(self.media_root, 'checkpoint.json'))
+        with mock.patch.object(ingest, 'ProcessPoolExecutor', InlineExecutor), \
+                mock.patch.object(ingest, '_analyze_file', fake_analyze_file), \
+                mock.patch.object(ResumeText.objects, 'store', side_effect=AssertionError('stored one by one')):
+            return ingest.ingest(self.source, self.job_posting, checkpoint, workers=1, **kwargs)
+
+    def test_texts_are_stored_per_batch(self):
+        ResumeText.objects.store('Go developer')
+
+        report = self.run_ingest(batch_size=2)
+
+        self.assertEqual(report.created, 5)
+        self.assertEqual(ResumeText.objects.count(), 3)
+        for analysis in ResumeAnalysis.objects.select_related('stored_text'):
+            with open(analysis.resume_file.path) as f:
+                text = f.read()
+            if text:
+                self.assertEqual(analysis.stored_text.text, text)
+            else:
+                self.assertIsNone(analysis.stored_text)
+
+
+class StoreManyTests(TestCase):
+    def test_rows_come_back_in_order_and_are_shared(self):
+        existing = ResumeText.objects.store('Go developer')
+
+        rows = ResumeText.objects.store_many(['Python developer', '', 'Go developer', 'Python developer', None])
+
+        self.assertEqual(rows[0].text, 'Python developer')
+        self.assertIsNone(rows[1])
+        self.assertEqual(rows[2].id, existing.id)
+        self.assertEqual(rows[3].id, rows[0].id)
+        self.assertIsNone(rows[4])
+        self.assertEqual(ResumeText.objects.count(), 2)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .. import jobs
+from ..models import JobPosting, ResumeAnalysis
+
+
+@override_settings(ANALYZER_JOB_MAX_RETRIES=2, ANALYZER_JOB_STUCK_TIMEOUT=600)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+
+    def create_analysis(self, **fields):
+        fields.setdefault('status', ResumeAnalysis.STATUS_PENDING)
+        return ResumeAnalysis.objects.create(job_posting=self.job_posting, resume_file='resumes/r.txt', **fields)
+
+    def test_claims_the_oldest_pending_analysis_once(self):
+        first = self.create_analysis()
+        second = self.create_analysis()
+        self.create_analysis(status=ResumeAnalysis.STATUS_COMPLETED)
+
+        claimed = jobs.claim_next_job()
+        self.assertEqual(claimed.id, first.id)
+        self.assertEqual(claimed.status, ResumeAnalysis.STATUS_PROCESSING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNotNone(claimed.started_at)
+
+        self.assertEqual(jobs.claim_next_job().id, second.id)
+        self.assertIsNone(jobs.claim_next_job())
+
+    def test_claim_skips_a_row_taken_by_another_worker(self):
+        analysis = self.create_analysis()
+        original_filter = ResumeAnalysis.objects.filter
+
+        def filter_after_race(*args, **kwargs):
+            # Another worker claims the row between the candidate query and the UPDATE
+            if kwargs.get('id') == analysis.id:
+                ResumeAnalysis.objects.all().update(status=ResumeAnalysis.STATUS_PROCESSING)
+            return original_filter(*args, **kwargs)
+
+        with mock.patch.object(ResumeAnalysis.objects, 'filter', side_effect=filter_after_race):
+            self.assertIsNone(jobs.claim_next_job())
+
+    def test_crashed_job_is_retried_then_failed(self):
+        self.create_analysis()
+
+        with mock.patch.object(jobs, 'run_analysis', side_effect=RuntimeError("boom")):
+            for attempt in (1, 2):
+                analysis = jobs.process_job(jobs.claim_next_job())
+                self.assertEqual(analysis.attempts, attempt)
+                self.assertEqual(analysis.status, ResumeAnalysis.STATUS_PENDING)
+                self.assertIsNone(analysis.completed_at)
+
+            analysis = jobs.process_job(jobs.claim_next_job())
+
+        analysis.refresh_from_db()
+        self.assertEqual(analysis.attempts, 3)
+        self.assertEqual(analysis.status, ResumeAnalysis.STATUS_FAILED)
+        self.assertEqual(analysis.feedback, 'Analysis failed: boom')
+        self.assertIsNotNone(analysis.completed_at)
+        self.assertIsNone(jobs.claim_next_job())
+
+    def test_crash_after_the_result_was_applied_is_requeued_without_completed_at(self):
+        self.create_analysis()
+
+        def apply_then_crash(analysis, analyzer=None):
+            analysis.status = ResumeAnalysis.STATUS_COMPLETED
+            analysis.completed_at = timezone.now()
+            raise RuntimeError("database went away")
+
+        with mock.patch.object(jobs, 'run_analysis', side_effect=apply_then_crash):
+            analysis = jobs.process_job(jobs.claim_next_job())
+
+        analysis.refresh_from_db()
+        self.assertEqual(analysis.status, ResumeAnalysis.STATUS_PENDING)
+        self.assertIsNone(analysis.completed_at)
+
+    def test_failed_result_is_not_retried(self):
+        self.create_analysis()
+
+        def unreadable_file(analysis, analyzer=None):
+            analysis.status = ResumeAnalysis.STATUS_FAILED
+            analysis.feedback = 'Analysis failed: Could not extract text from resume'
+            analysis.completed_at = timezone.now()
+            analysis.save()
+
+        with mock.patch.object(jobs, 'run_analysis', side_effect=unreadable_file) as run_analysis:
+            analysis = jobs.process_job(jobs.claim_next_job())
+
+        analysis.refresh_from_db()
+        self.assertEqual(analysis.status, ResumeAnalysis.STATUS_FAILED)
+        self.assertEqual(analysis.attempts, 1)
+        self.assertIsNotNone(analysis.completed_at)
+        self.assertIsNone(jobs.claim_next_job())
+        run_analysis.assert_called_once()
+
+    def test_stuck_jobs_are_requeued_or_failed(self):
+        long_ago = timezone.now() - timedelta(seconds=601)
+        stuck = self.create_analysis(status=ResumeAnalysis.STATUS_PROCESSING, started_at=long_ago, attempts=1)
+        exhausted = self.create_analysis(status=ResumeAnalysis.STATUS_PROCESSING, started_at=long_ago, attempts=3)
+        running = self.create_analysis(status=ResumeAnalysis.STATUS_PROCESSING, started_at=timezone.now(), attempts=1)
+
+        self.assertEqual(jobs.reclaim_stuck_jobs(), (1, 1))
+
+        statuses = dict(ResumeAnalysis.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[stuck.id], ResumeAnalysis.STATUS_PENDING)
+        self.assertEqual(statuses[exhausted.id], ResumeAnalysis.STATUS_FAILED)
+        self.assertEqual(statuses[running.id], ResumeAnalysis.STATUS_PROCESSING)
+
+    @override_settings(ANALYZER_JOB_RECLAIM_INTERVAL=0)
+    def test_worker_reclaims_while_the_queue_is_busy(self):
+        for _ in range(3):
+            self.create_analysis()
+        iterations = iter(range(3))
+
+        with mock.patch.object(jobs, 'create_resume_processor'), \
+                mock.patch.object(jobs, 'process_job'), \
+                mock.patch.object(jobs, 'reclaim_stuck_jobs') as reclaim:
+            processed = jobs.run_worker(should_stop=lambda: next(iterations, None) is None)
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(reclaim.call_count, 3)
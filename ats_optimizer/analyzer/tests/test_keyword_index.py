@@ -0,0 +1,139 @@
+import random
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from ..keyword_index import QueryError, evaluate, parse_query, search
+from ..models import JobPosting, ResumeAnalysis
+
+TERMS = ['alpha', 'beta', 'gamma', 'delta', 'epsilon']
+
+
+def term(name):
+    return ('TERM', name)
+
+
+def brute_force(tree, postings, universe):
+    """Reference evaluation with Python sets"""
+    if tree[0] == 'TERM':
+        return set(postings[tree[1]])
+    if tree[0] == 'NOT':
+        return universe - brute_force(tree[1], postings, universe)
+    left, right = brute_force(tree[1], postings, universe), brute_force(tree[2], postings, universe)
+    return left & right if tree[0] == 'AND' else left | right
+
+
+def random_query(rng, depth):
+    if depth == 0 or rng.random() < 0.25:
+        query = rng.choice(TERMS)
+    else:
+        operator = rng.choice([' AND ', ' OR ', ' '])
+        query = f"({random_query(rng, depth - 1)}{operator}{random_query(rng, depth - 1)})"
+    return f"NOT {query}" if rng.random() < 0.3 else query
+
+
+class ParseQueryTests(SimpleTestCase):
+    def test_and_binds_tighter_than_or(self):
+        self.assertEqual(
+            parse_query('alpha OR beta AND gamma'),
+            ('OR', term('alpha'), ('AND', term('beta'), term('gamma')))
+        )
+
+    def test_adjacent_terms_are_anded(self):
+        self.assertEqual(parse_query('alpha beta'), ('AND', term('alpha'), term('beta')))
+
+    def test_not_applies_to_the_next_term_or_group(self):
+        self.assertEqual(
+            parse_query('alpha NOT beta gamma'),
+            ('AND', ('AND', term('alpha'), ('NOT', term('beta'))), term('gamma'))
+        )
+        self.assertEqual(
+            parse_query('alpha NOT (beta OR NOT gamma)'),
+            ('AND', term('alpha'), ('NOT', ('OR', term('beta'), ('NOT', term('gamma')))))
+        )
+        self.assertEqual(parse_query('NOT NOT alpha'), ('NOT', ('NOT', term('alpha'))))
+
+    def test_operators_are_case_insensitive_and_phrases_are_kept(self):
+        self.assertEqual(
+            parse_query('"Alpha Beta" or gamma'),
+            ('OR', term('alpha beta'), term('gamma'))
+        )
+
+    def test_malformed_queries(self):
+        for query in ['', '   ', 'alpha AND', '(alpha OR beta', 'alpha)', 'NOT', 'alpha OR OR beta', '()']:
+            with self.subTest(query=query), self.assertRaises(QueryError):
+                parse_query(query)
+
+
+class EvaluateTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.universe = set(range(1, 61))
+        self.postings = {
+            name: np.array(sorted(rng.choice(60, size=rng.integers(0, 30), replace=False) + 1), dtype=np.int64)
+            for name in TERMS
+        }
+
+    def evaluate(self, query):
+        universe_calls = []
+
+        def universe():
+            universe_calls.append(True)
+            return np.array(sorted(self.universe), dtype=np.int64)
+
+        ids = evaluate(parse_query(query), self.postings.__getitem__, universe)
+        return ids, bool(universe_calls)
+
+    def test_matches_set_logic(self):
+        queries = [
+            'alpha AND beta', 'alpha OR beta', 'alpha NOT beta', 'NOT alpha', 'NOT alpha NOT beta',
+            'NOT alpha OR beta', 'NOT (alpha OR beta)', 'NOT (NOT alpha AND NOT beta)',
+            'alpha AND NOT (beta OR NOT gamma)', '(alpha OR NOT beta) AND (gamma OR NOT delta)',
+            'NOT NOT alpha', 'NOT (alpha NOT (beta NOT gamma))',
+        ]
+        rng = random.Random(11)
+        queries += [random_query(rng, 4) for _ in range(200)]
+
+        for query in queries:
+            with self.subTest(query=query):
+                ids, _ = self.evaluate(query)
+                expected = brute_force(parse_query(query), self.postings, self.universe)
+                self.assertEqual(ids.tolist(), sorted(expected))
+
+    def test_universe_only_loaded_for_negative_queries(self):
+        self.assertFalse(self.evaluate('alpha NOT beta')[1])
+        self.assertFalse(self.evaluate('alpha AND NOT (beta OR gamma)')[1])
+        self.assertTrue(self.evaluate('NOT alpha')[1])
+        self.assertTrue(self.evaluate('alpha OR NOT beta')[1])
+
+    def test_empty_postings(self):
+        self.postings['alpha'] = np.array([], dtype=np.int64)
+
+        self.assertEqual(self.evaluate('alpha AND beta')[0].tolist(), [])
+        self.assertEqual(self.evaluate('alpha OR beta')[0].tolist(), self.postings['beta'].tolist())
+        self.assertEqual(self.evaluate('NOT alpha')[0].tolist(), sorted(self.universe))
+
+
+class SearchTests(TestCase):
+    def test_search_uses_the_index_kept_by_signals(self):
+        job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+
+        def create(skills, status=ResumeAnalysis.STATUS_COMPLETED):
+            return ResumeAnalysis.objects.create(
+                job_posting=job_posting, resume_file='resumes/r.txt', status=status,
+                skills=skills, matching_keywords=[], completed_at=timezone.now()
+            )
+
+        python_only = create(['python'])
+        python_java = create(['python', 'java'])
+        java_only = create(['java'])
+        create(['python'], status=ResumeAnalysis.STATUS_PENDING)
+
+        self.assertEqual(search('python').tolist(), [python_java.id, python_only.id])
+        self.assertEqual(search('python NOT java').tolist(), [python_only.id])
+        self.assertEqual(search('NOT python').tolist(), [java_only.id])
+
+        python_only.status = ResumeAnalysis.STATUS_PENDING
+        python_only.save()
+        self.assertEqual(search('python').tolist(), [python_java.id])
@@ -0,0 +1,59 @@
+import urllib.error
+import urllib.request
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..metrics import start_metrics_server
+
+
+class MetricsViewTests(TestCase):
+    @override_settings(ANALYZER_METRICS_ENABLED=False)
+    def test_disabled(self):
+        self.assertEqual(self.client.get(reverse('analyzer:metrics')).status_code, 404)
+
+    @override_settings(ANALYZER_METRICS_ENABLED=True, ANALYZER_METRICS_TOKEN='')
+    def test_enabled_without_token(self):
+        self.assertEqual(self.client.get(reverse('analyzer:metrics')).status_code, 200)
+
+    @override_settings(ANALYZER_METRICS_ENABLED=True, ANALYZER_METRICS_TOKEN='scrape-secret')
+    def test_token_is_required_when_set(self):
+        url = reverse('analyzer:metrics')
+
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
+
+
+class MetricsServerTests(TestCase):
+    def start_server(self):
+        server = start_metrics_server(0)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def get(self, server, token=None):
+        host, port = server.server_address
+        request = urllib.request.Request(f'http://{host}:{port}/metrics')
+        if token:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    @override_settings(ANALYZER_METRICS_TOKEN='')
+    def test_listens_on_loopback_by_default(self):
+        server = self.start_server()
+
+        self.assertEqual(server.server_address[0], '127.0.0.1')
+        self.assertEqual(self.get(server), 200)
+
+    @override_settings(ANALYZER_METRICS_TOKEN='scrape-secret')
+    def test_token_is_required_when_set(self):
+        server = self.start_server()
+
+        self.assertEqual(self.get(server), 401)
+        self.assertEqual(self.get(server, 'wrong'), 401)
+        self.assertEqual(self.get(server, 'scrape-secret'), 200)
@@ -0,0 +1,101 @@
+import hashlib
+import importlib
+import zlib
+from unittest import mock
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from ..models import POSTING_MATCH_FIELDS
+
+resume_text_migration = importlib.import_module('analyzer.migrations.0009_resume_text')
+
+
+class ResumeTextMigrationTests(TransactionTestCase):
+    before = [('analyzer', '0008_history_indexes')]
+    after = [('analyzer', '0009_resume_text')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def setUp(self):
+        apps = self.migrate(self.before)
+        JobPosting = apps.get_model('analyzer', 'JobPosting')
+        ResumeAnalysis = apps.get_model('analyzer', 'ResumeAnalysis')
+
+        job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        self.texts = ['Python developer', 'Go developer', 'Python developer', '', None, 'Python developer', 'Café résumé']
+        self.analysis_ids = [
+            ResumeAnalysis.objects.create(
+                job_posting=job_posting, resume_file='resumes/r.txt', parsed_text=text
+            ).id
+            for text in self.texts
+        ]
+
+    def test_forwards_stores_each_text_once(self):
+        # A small batch size makes duplicates span batches
+        with mock.patch.object(resume_text_migration, 'BATCH_SIZE', 2):
+            apps = self.migrate(self.after)
+        ResumeAnalysis = apps.get_model('analyzer', 'ResumeAnalysis')
+        ResumeText = apps.get_model('analyzer', 'ResumeText')
+
+        stored = {
+            resume_text.id: zlib.decompress(resume_text.data).decode('utf-8')
+            for resume_text in ResumeText.objects.all()
+        }
+        self.assertEqual(sorted(stored.values()), sorted({'Python developer', 'Go developer', 'Café résumé'}))
+        self.assertEqual(
+            ResumeText.objects.get(sha256=hashlib.sha256('Café résumé'.encode('utf-8')).hexdigest()).size,
+            len('Café résumé'.encode('utf-8'))
+        )
+
+        for analysis_id, text in zip(self.analysis_ids, self.texts):
+            analysis = ResumeAnalysis.objects.get(id=analysis_id)
+            if text:
+                self.assertEqual(stored[analysis.stored_text_id], text)
+            else:
+                self.assertIsNone(analysis.stored_text_id)
+
+    def test_backwards_restores_parsed_text(self):
+        # Empty texts had nothing to store and come back as NULL
+        apps = self.migrate(self.after)
+        apps.get_model('analyzer', 'ResumeAnalysis').objects.update(parsed_text=None)
+
+        apps = self.migrate(self.before)
+        ResumeAnalysis = apps.get_model('analyzer', 'ResumeAnalysis')
+
+        for analysis_id, text in zip(self.analysis_ids, self.texts):
+            self.assertEqual(ResumeAnalysis.objects.get(id=analysis_id).parsed_text, text or None)
+
+
+class BlankMatchFieldsMigrationTests(TransactionTestCase):
+    before = [('analyzer', '0011_job_posting_unique_open')]
+    after = [('analyzer', '0012_job_posting_blank_match_fields')]
+
+    migrate = ResumeTextMigrationTests.migrate
+    tearDown = ResumeTextMigrationTests.tearDown
+
+    def test_null_fields_become_blank_and_duplicates_are_closed(self):
+        apps = self.migrate(self.before)
+        JobPosting = apps.get_model('analyzer', 'JobPosting')
+        posting = {'title': 'Engineer', 'company': 'Acme', 'description': 'Python', 'description_hash': 'abc'}
+        null_id = JobPosting.objects.create(**posting, location=None, job_type='Contract').id
+        blank_id = JobPosting.objects.create(**posting, location='', job_type='Contract').id
+        other_id = JobPosting.objects.create(**posting, location='Berlin', experience_level=None).id
+
+        apps = self.migrate(self.after)
+        JobPosting = apps.get_model('analyzer', 'JobPosting')
+
+        rows = {row['id']: row for row in JobPosting.objects.values('id', 'is_open', *POSTING_MATCH_FIELDS)}
+        self.assertEqual(rows[null_id], {'id': null_id, 'is_open': True, 'location': '', 'experience_level': '', 'job_type': 'Contract'})
+        self.assertFalse(rows[blank_id]['is_open'])
+        self.assertEqual(rows[other_id]['experience_level'], '')
+        self.assertTrue(rows[other_id]['is_open'])
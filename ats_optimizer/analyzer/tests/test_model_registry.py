@@ -0,0 +1,85 @@
+import threading
+import time
+from unittest import mock
+
+from django.apps import apps
+from django.test import SimpleTestCase, override_settings
+
+from ..utils import model_registry as registry_module
+from ..utils.model_registry import ModelRegistry
+
+
+class FakeSimilarityModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.append(texts)
+
+
+class FakeSkillMatcher:
+    def match(self, doc):
+        return []
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.loads = []
+
+        def load_spacy():
+            self.loads.append('spacy')
+            time.sleep(0.01)  # Let the other threads pile up behind the lock
+            return lambda text: text
+
+        self.registry._load_spacy = load_spacy
+        self.registry._load_similarity_model = FakeSimilarityModel
+        self.registry._load_skill_matcher = FakeSkillMatcher
+
+    def test_model_loads_once_across_threads(self):
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(self.registry.get_nlp())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loads, ['spacy'])
+        self.assertEqual(len({id(model) for model in models}), 1)
+        self.assertIn('load_seconds', self.registry.stats['spacy'])
+
+    def test_warm_up_runs_once(self):
+        self.registry.warm_up()
+        self.registry.warm_up()
+
+        self.assertTrue(self.registry.warmed_up)
+        self.assertEqual(self.loads, ['spacy'])
+        self.assertEqual(self.registry.get_similarity_model().encoded, [[registry_module.WARMUP_TEXT]])
+        self.assertIn('warmup', self.registry.stats)
+
+
+class PreloadTests(SimpleTestCase):
+    def ready(self):
+        apps.get_app_config('analyzer').ready()
+
+    @override_settings(ANALYZER_PRELOAD_MODELS=False)
+    def test_warm_up_is_skipped_when_disabled(self):
+        with mock.patch.object(registry_module.model_registry, 'warm_up') as warm_up:
+            self.ready()
+
+        warm_up.assert_not_called()
+
+    @override_settings(ANALYZER_PRELOAD_MODELS=True)
+    def test_warm_up_runs_when_enabled(self):
+        with mock.patch.object(registry_module.model_registry, 'warm_up') as warm_up:
+            self.ready()
+
+        warm_up.assert_called_once_with()
+
+    @override_settings(ANALYZER_PRELOAD_MODELS=True)
+    def test_failed_warm_up_does_not_stop_startup(self):
+        with mock.patch.object(registry_module.model_registry, 'warm_up', side_effect=OSError('no model')), \
+                self.assertLogs('analyzer.apps', 'ERROR') as logs:
+            self.ready()
+
+        self.assertIn('no model', logs.output[0])
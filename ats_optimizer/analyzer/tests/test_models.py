@@ -0,0 +1,91 @@
+import io
+import tempfile
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..forms.validation_forms import JobPostingForm
+from ..models import JobPosting, ResumeAnalysis, ResumeText
+
+
+class JobPostingDedupeTests(TestCase):
+    def get_or_create(self, description='Python developer', **fields):
+        return JobPosting.objects.get_or_create_for_description(
+            title='Engineer', company='Acme', description=description, **fields
+        )
+
+    def test_identical_posting_is_reused(self):
+        job_posting, created = self.get_or_create(location='Berlin')
+        again, created_again = self.get_or_create('  Python   developer ', location='Berlin', experience_level=None)
+
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(again.id, job_posting.id)
+
+    def test_other_location_level_or_type_is_a_new_posting(self):
+        job_posting, _ = self.get_or_create(location='Berlin', experience_level='Senior', job_type='Full-time')
+
+        for fields in (
+            {'location': 'Remote', 'experience_level': 'Senior', 'job_type': 'Full-time'},
+            {'location': 'Berlin', 'experience_level': 'Junior', 'job_type': 'Full-time'},
+            {'location': 'Berlin', 'experience_level': 'Senior', 'job_type': 'Contract'},
+        ):
+            other, created = self.get_or_create(**fields)
+            self.assertTrue(created)
+            self.assertNotEqual(other.id, job_posting.id)
+
+    def test_posting_saved_from_the_form_is_reused(self):
+        form = JobPostingForm({'title': 'Engineer', 'company': 'Acme', 'description': 'Python developer'})
+        self.assertTrue(form.is_valid(), form.errors)
+        job_posting = form.save()
+
+        again, created = self.get_or_create(location=None, experience_level='', job_type=None)
+
+        self.assertEqual((job_posting.location, job_posting.experience_level, job_posting.job_type), ('', '', ''))
+        self.assertFalse(created)
+        self.assertEqual(again.id, job_posting.id)
+
+    def test_closed_posting_is_not_reused(self):
+        job_posting, _ = self.get_or_create()
+        JobPosting.objects.filter(id=job_posting.id).update(is_open=False)
+
+        reopened, created = self.get_or_create()
+
+        self.assertTrue(created)
+        self.assertNotEqual(reopened.id, job_posting.id)
+
+
+class ResumeTextPruneTests(TestCase):
+    def setUp(self):
+        job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        self.kept = ResumeText.objects.store('Python developer')
+        ResumeAnalysis.objects.create(job_posting=job_posting, resume_file='resumes/a.txt', stored_text=self.kept)
+        deleted = ResumeAnalysis.objects.create(
+            job_posting=job_posting, resume_file='resumes/b.txt', stored_text=ResumeText.objects.store('Go developer')
+        )
+        deleted.delete()
+        self.recent = ResumeText.objects.store('Rust developer')
+        ResumeText.objects.exclude(id=self.recent.id).update(created_at=timezone.now() - timedelta(hours=2))
+
+    def test_prune_deletes_old_unreferenced_texts(self):
+        self.assertEqual(ResumeText.objects.prune(), 1)
+
+        self.assertEqual(
+            set(ResumeText.objects.values_list('id', flat=True)), {self.kept.id, self.recent.id}
+        )
+        self.assertEqual(ResumeText.objects.prune(max_age=0), 1)
+        self.assertEqual(list(ResumeText.objects.values_list('id', flat=True)), [self.kept.id])
+
+    def test_cleanup_uploads_prunes_texts(self):
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, FILE_UPLOAD_TEMP_DIR=media_root):
+            out = io.StringIO()
+            call_command('cleanup_uploads', '--dry-run', stdout=out)
+            self.assertIn('1 orphaned resume texts (dry run)', out.getvalue())
+            self.assertEqual(ResumeText.objects.count(), 3)
+
+            call_command('cleanup_uploads', stdout=io.StringIO())
+
+        self.assertEqual(ResumeText.objects.count(), 2)
@@ -0,0 +1,147 @@
+import os
+import tempfile
+from unittest import mock
+
+import numpy as np
+import spacy
+from django.test import SimpleTestCase, override_settings
+
+from ..utils import resume_analyzer
+from ..utils.chunking import Chunk
+from ..utils.nlp_processor import NLPProcessor
+from ..utils.resume_analyzer import ResumeAnalyzer
+from ..utils.skill_matcher import SkillMatcher
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'embeddings': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-embeddings'},
+}
+
+
+class FakeEncoder:
+    """Embeds a text as [mentions python, mentions django, 1], counting encoded texts"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True):
+        self.encoded.extend(texts)
+        return np.array([
+            ['python' in text.lower(), 'django' in text.lower(), 1.0] for text in texts
+        ], dtype=np.float32)
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES, ANALYZER_CHUNK_MAX_WORDS=4, ANALYZER_CHUNK_OVERLAP_WORDS=1,
+    ANALYZER_SIMILARITY_AGGREGATION='max'
+)
+class SectionSimilarityTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import caches
+
+        caches['embeddings'].clear()
+        self.encoder = FakeEncoder()
+        self.processor = NLPProcessor.__new__(NLPProcessor)
+        self.processor.similarity_model = self.encoder
+
+    def test_chunks_of_all_texts_are_encoded_together(self):
+        documents = self.processor.embed_documents(["Skills Python Django", "Education MIT", ""])
+
+        self.assertEqual([chunks for chunks, _ in documents], [
+            [Chunk('skills', 'Python Django')], [Chunk('education', 'MIT')], []
+        ])
+        self.assertEqual(self.encoder.encoded, ['Python Django', 'MIT'])
+        np.testing.assert_array_equal(documents[0][1], [[1.0, 1.0, 1.0]])
+        self.assertIsNone(documents[2][1])
+
+    def test_cached_chunks_are_not_encoded_again(self):
+        self.processor.embed_documents(["Skills Python Django"])
+        self.encoder.encoded.clear()
+
+        [(_, embeddings)] = self.processor.embed_documents(["Skills Python Django Experience Acme"])
+
+        self.assertEqual(self.encoder.encoded, ['Acme'])
+        np.testing.assert_array_equal(embeddings, [[1.0, 1.0, 1.0], [0.0, 0.0, 1.0]])
+
+    def test_repeated_chunks_are_encoded_once(self):
+        self.processor.embed_documents(["Skills Python", "Projects Python"])
+
+        self.assertEqual(self.encoder.encoded, ['Python'])
+
+    def test_section_similarities(self):
+        job_embedding = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+
+        [(similarity, section_scores, embedding), empty] = self.processor.compute_section_similarities(
+            job_embedding, ["Skills Python Education MIT", ""]
+        )
+
+        self.assertAlmostEqual(similarity, 1 / np.sqrt(2), places=5)
+        self.assertAlmostEqual(section_scores['skills'], 1 / np.sqrt(2), places=5)
+        self.assertAlmostEqual(section_scores['education'], 0.0, places=5)
+        # The document embedding is the normalized mean of its chunks
+        np.testing.assert_allclose(embedding, np.array([0.5, 0.0, 1.0]) / np.sqrt(1.25), rtol=1e-6)
+        self.assertEqual(empty, (0.0, {}, None))
+
+
+class CountingNLP:
+    """A blank spaCy pipeline that counts how often texts are parsed"""
+
+    def __init__(self):
+        self.pipeline = spacy.blank('en')
+        self.vocab = self.pipeline.vocab
+        self.tokenizer = self.pipeline.tokenizer
+        self.parsed = []
+
+    def __call__(self, text):
+        self.parsed.append(text)
+        return self.pipeline(text)
+
+    def pipe(self, texts, batch_size=None):
+        texts = list(texts)
+        self.parsed.extend(texts)
+        return self.pipeline.pipe(texts, batch_size=batch_size)
+
+
+class SingleParseTests(SimpleTestCase):
+    resume = "Jane Doe jane@example.com 555-123-4567 Built Django apps in Python and K8s"
+
+    def setUp(self):
+        self.nlp = CountingNLP()
+        self.processor = NLPProcessor.__new__(NLPProcessor)
+        self.processor.nlp = self.nlp
+        self.processor.skill_matcher = SkillMatcher(self.nlp, {'python': [], 'django': [], 'kubernetes': ['k8s']})
+        self.processor.similarity_model = FakeEncoder()
+
+    def test_one_parse_gives_every_feature(self):
+        document = self.processor.analyze_document(self.resume)
+
+        self.assertEqual(self.nlp.parsed, [self.resume])
+        self.assertEqual(document.skills, {'python', 'django', 'kubernetes'})
+        self.assertTrue(document.skills <= document.keywords)
+        self.assertEqual(document.emails, ['jane@example.com'])
+        self.assertEqual(document.phones, ['555-123-4567'])
+
+    def test_batch_parses_each_text_once(self):
+        documents = self.processor.analyze_documents([self.resume, "Go developer", ""])
+
+        self.assertEqual(self.nlp.parsed, [self.resume, "Go developer", ""])
+        self.assertEqual([document.skills for document in documents], [{'python', 'django', 'kubernetes'}, set(), set()])
+
+    def test_analyze_resume_parses_job_and_resume_once_each(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(self.resume)
+        self.addCleanup(os.unlink, f.name)
+        analyzer = ResumeAnalyzer.__new__(ResumeAnalyzer)
+        analyzer.nlp_processor = self.processor
+
+        with mock.patch.object(resume_analyzer, 'get_cached_analysis', return_value=None), \
+                mock.patch.object(resume_analyzer, 'set_cached_analysis'), \
+                mock.patch.object(resume_analyzer, 'get_extracted_text', return_value=None), \
+                mock.patch.object(resume_analyzer, 'set_extracted_text'), \
+                mock.patch.object(self.processor, 'encode_chunks', return_value=np.ones((1, 3), dtype=np.float32)):
+            result = analyzer.analyze_resume(f.name, "Python and Django developer")
+
+        self.assertEqual(result['status'], 'completed')
+        self.assertEqual(self.nlp.parsed, ["Python and Django developer", self.resume])
+        self.assertEqual(result['email'], 'jane@example.com')
+        self.assertCountEqual(result['matching_keywords'], ['django', 'python'])
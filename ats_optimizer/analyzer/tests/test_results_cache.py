@@ -0,0 +1,100 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from ..models import JobPosting, ResumeAnalysis
+
+LOCMEM_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'results': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'test-results'},
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    # The manifest storage needs collectstatic, which tests do not run
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'
+)
+class ResultsCacheTests(TestCase):
+    def setUp(self):
+        caches['results'].clear()
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        self.analysis = ResumeAnalysis.objects.create(
+            job_posting=self.job_posting, resume_file='resumes/r.txt',
+            status=ResumeAnalysis.STATUS_COMPLETED, completed_at=timezone.now(),
+            ats_score=70.0, semantic_similarity=50.0, matching_keywords=['python'], missing_keywords=[]
+        )
+        self.api_url = reverse('analyzer:api_analysis_detail', args=[self.analysis.id])
+        self.page_url = reverse('analyzer:results_detail', args=[self.analysis.id])
+
+    def test_completed_results_are_conditional(self):
+        for url in (self.api_url, self.page_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Last-Modified'], http_date(int(self.analysis.completed_at.timestamp())))
+                self.assertIn('no-cache', response['Cache-Control'])
+
+                not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified['ETag'], response['ETag'])
+
+                since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+                self.assertEqual(since.status_code, 304)
+
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_cached_response_is_served_without_queries(self):
+        first = self.client.get(self.api_url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.api_url)
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_rescoring_changes_the_etag(self):
+        first = self.client.get(self.api_url)
+
+        self.analysis.ats_score = 90.0
+        self.analysis.save()
+
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(response.json()['data']['ats_score'], 90.0)
+
+    def test_editing_the_job_posting_drops_the_cached_page(self):
+        first = self.client.get(self.api_url)
+
+        self.job_posting.title = 'Senior Engineer'
+        self.job_posting.save()
+
+        response = self.client.get(self.api_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['job_posting']['title'], 'Senior Engineer')
+
+    def test_unfinished_analysis_is_not_cached_until_the_job_finishes(self):
+        analysis = ResumeAnalysis.objects.create(
+            job_posting=self.job_posting, resume_file='resumes/p.txt', status=ResumeAnalysis.STATUS_PENDING
+        )
+        api_url = reverse('analyzer:api_analysis_detail', args=[analysis.id])
+        page_url = reverse('analyzer:results_detail', args=[analysis.id])
+
+        pending = self.client.get(api_url)
+        self.assertNotIn('ETag', pending)
+        self.assertEqual(pending.json()['data']['status'], ResumeAnalysis.STATUS_PENDING)
+        self.assertTemplateUsed(self.client.get(page_url), 'analyzer/processing.html')
+
+        # What a worker does when the job finishes
+        analysis.status = ResumeAnalysis.STATUS_COMPLETED
+        analysis.ats_score = 80.0
+        analysis.completed_at = timezone.now()
+        analysis.save()
+
+        completed = self.client.get(api_url)
+        self.assertIn('ETag', completed)
+        self.assertEqual(completed.json()['data']['status'], ResumeAnalysis.STATUS_COMPLETED)
+        self.assertTemplateUsed(self.client.get(page_url), 'analyzer/results.html')
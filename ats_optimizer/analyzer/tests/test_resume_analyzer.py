@@ -0,0 +1,91 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..utils import resume_analyzer
+from ..utils.nlp_processor import DocumentFeatures, NLPProcessor
+from ..utils.resume_analyzer import ResumeAnalyzer
+
+
+class FakeNLPProcessor:
+    def __init__(self, error=None):
+        self.error = error
+
+    def analyze_document(self, text):
+        return DocumentFeatures(keywords={'python', 'django'})
+
+    def compute_section_similarities(self, embedding, texts, batch_size=None):
+        if self.error:
+            raise self.error
+        return [(0.8, {'experience': 0.8}, [1.0, 0.0]) for _ in texts]
+
+
+class AnalyzeResumeTests(SimpleTestCase):
+    job_features = {'keywords': {'python', 'kubernetes'}, 'embedding': [1.0, 0.0]}
+
+    def setUp(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+            f.write('Python developer with Django experience')
+        self.path = f.name
+        self.addCleanup(os.unlink, self.path)
+        for name, value in [('get_cached_analysis', None), ('get_extracted_text', None), ('set_extracted_text', None)]:
+            patcher = mock.patch.object(resume_analyzer, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(resume_analyzer, 'set_cached_analysis')
+        self.set_cached_analysis = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def analyzer(self, error=None):
+        analyzer = ResumeAnalyzer.__new__(ResumeAnalyzer)
+        analyzer.nlp_processor = FakeNLPProcessor(error)
+        return analyzer
+
+    def test_completed_result_is_cached(self):
+        result = self.analyzer().analyze_resume(self.path, 'Python developer', job_features=self.job_features)
+
+        self.assertEqual(result['status'], 'completed')
+        self.assertAlmostEqual(result['semantic_similarity'], 80.0)
+        self.set_cached_analysis.assert_called_once()
+
+    def test_model_error_is_raised_and_not_cached(self):
+        analyzer = self.analyzer(RuntimeError("embedding server error"))
+
+        with self.assertRaisesMessage(RuntimeError, 'embedding server error'):
+            analyzer.analyze_resume(self.path, 'Python developer', job_features=self.job_features)
+        self.set_cached_analysis.assert_not_called()
+
+    def test_unreadable_file_fails_without_caching(self):
+        result = self.analyzer().analyze_resume(
+            self.path + '.missing', 'Python developer', job_features=self.job_features
+        )
+
+        self.assertEqual(result['status'], 'failed')
+        self.set_cached_analysis.assert_not_called()
+
+    def test_batch_model_error_is_raised_and_not_cached(self):
+        analyzer = self.analyzer(RuntimeError("embedding server error"))
+        analyzer.nlp_processor.analyze_documents = lambda texts, batch_size=None: [DocumentFeatures() for _ in texts]
+
+        with self.assertRaises(RuntimeError):
+            analyzer.analyze_batch('Python developer', [self.path], job_features=self.job_features)
+        self.set_cached_analysis.assert_not_called()
+
+
+class NLPProcessorErrorTests(SimpleTestCase):
+    def processor(self):
+        processor = NLPProcessor.__new__(NLPProcessor)
+        processor.nlp = mock.Mock(side_effect=RuntimeError("spaCy failed"))
+        processor.similarity_model = mock.Mock(**{'encode.side_effect': RuntimeError("model failed")})
+        return processor
+
+    def test_parse_errors_are_raised(self):
+        with self.assertRaisesMessage(RuntimeError, 'spaCy failed'):
+            self.processor().analyze_document('Python developer')
+
+    def test_similarity_errors_are_raised(self):
+        with mock.patch('analyzer.utils.nlp_processor.get_chunk_embeddings', return_value={}):
+            with self.assertRaisesMessage(RuntimeError, 'model failed'):
+                self.processor().compute_section_similarities([1.0, 0.0], ['Python developer'])
@@ -0,0 +1,109 @@
+import tempfile
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import analysis_pool, candidates
+from ..models import JobPosting
+from ..utils.embeddings import embedding_to_bytes
+from ..utils.nlp_processor import features_version
+
+
+def resume_upload():
+    return SimpleUploadedFile('resume.txt', b'Python developer with Django experience', content_type='text/plain')
+
+
+# The manifest storage needs collectstatic, which tests do not run
+plain_static_files = override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+
+
+@plain_static_files
+class JobMatchViewTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        upload_settings = override_settings(FILE_UPLOAD_TEMP_DIR=temp_dir.name)
+        upload_settings.enable()
+        self.addCleanup(upload_settings.disable)
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+
+    def test_api_matches_in_the_pool(self):
+        match = {
+            'job_posting': self.job_posting, 'ats_score': 80.0, 'semantic_similarity': 70.0,
+            'matching_keywords': ['python'], 'missing_keywords': ['django']
+        }
+        with mock.patch.object(analysis_pool, 'match_in_pool', return_value=([match], 5.0)) as match_in_pool:
+            response = self.client.post(reverse('analyzer:api_job_match') + '?k=3', {'resume_file': resume_upload()})
+
+        self.assertEqual(response.status_code, 200)
+        [path], kwargs = match_in_pool.call_args
+        self.assertTrue(path.endswith('.upload.txt'))
+        self.assertEqual(kwargs, {'k': 3})
+        [result] = response.json()['data']['matches']
+        self.assertEqual((result['job_posting_id'], result['ats_score']), (self.job_posting.id, 80.0))
+
+    def test_api_busy_pool(self):
+        with mock.patch.object(analysis_pool, 'match_in_pool', side_effect=analysis_pool.PoolBusy('busy')):
+            response = self.client.post(reverse('analyzer:api_job_match'), {'resume_file': resume_upload()})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+    def test_api_invalid_form(self):
+        with mock.patch.object(analysis_pool, 'match_in_pool') as match_in_pool:
+            response = self.client.post(reverse('analyzer:api_job_match'), {})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('resume_file', response.json()['errors'])
+        match_in_pool.assert_not_called()
+
+    def test_form_renders_matches(self):
+        match = {
+            'job_posting': self.job_posting, 'ats_score': 80.0, 'semantic_similarity': 70.0,
+            'matching_keywords': ['python'], 'missing_keywords': []
+        }
+        with mock.patch.object(analysis_pool, 'match_in_pool', return_value=([match], 5.0)):
+            response = self.client.post(reverse('analyzer:job_match'), {'resume_file': resume_upload()})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Acme')
+
+
+@plain_static_files
+class CandidateSearchViewTests(TestCase):
+    def setUp(self):
+        self.job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        index_patch = mock.patch.object(candidates, 'candidate_index', candidates.CandidateIndex())
+        index_patch.start()
+        self.addCleanup(index_patch.stop)
+
+    def store_features(self, job_posting_id=None):
+        JobPosting.objects.filter(id=job_posting_id or self.job_posting.id).update(
+            keywords=['python'], embedding=embedding_to_bytes([1.0, 0.0]), features_version=features_version()
+        )
+
+    def test_missing_features_are_computed_in_the_pool(self):
+        # Stands in for the pool process, which computes and saves the features
+        compute_in_pool = sync_to_async(self.store_features)
+
+        with mock.patch.object(analysis_pool, 'job_features_in_pool', side_effect=compute_in_pool) as compute:
+            response = self.client.get(reverse('analyzer:api_candidates', args=[self.job_posting.id]))
+
+        self.assertEqual(response.status_code, 200)
+        compute.assert_called_once_with(self.job_posting.id)
+        self.assertEqual(response.json()['data']['candidates'], [])
+
+    def test_stored_features_skip_the_pool(self):
+        self.store_features()
+
+        with mock.patch.object(analysis_pool, 'job_features_in_pool') as compute:
+            response = self.client.get(reverse('analyzer:candidates', args=[self.job_posting.id]))
+
+        self.assertEqual(response.status_code, 200)
+        compute.assert_not_called()
+
+    def test_unknown_posting(self):
+        self.assertEqual(self.client.get(reverse('analyzer:api_candidates', args=[0])).status_code, 404)
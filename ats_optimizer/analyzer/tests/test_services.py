@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+from django.test import TestCase
+
+from ..models import JobPosting, ResumeAnalysis
+from ..services import screen_analyses
+
+
+class BrokenAnalyzer:
+    nlp_processor = SimpleNamespace(features_version='test')
+
+    def compute_job_features(self, description):
+        return {'keywords': {'python'}, 'embedding': [0.0, 1.0]}
+
+    def analyze_batch(self, job_description, file_paths, job_features=None):
+        raise RuntimeError("model crashed")
+
+
+class ScreenAnalysesTests(TestCase):
+    def test_failed_batch_marks_every_analysis_failed(self):
+        job_posting = JobPosting.objects.create(title='Engineer', company='Acme', description='Python')
+        analyses = [
+            ResumeAnalysis.objects.create(
+                job_posting=job_posting, resume_file=f'resumes/{index}.txt', status=ResumeAnalysis.STATUS_PROCESSING
+            )
+            for index in range(3)
+        ]
+
+        with self.assertRaisesMessage(RuntimeError, 'model crashed'):
+            screen_analyses(job_posting, analyses, BrokenAnalyzer())
+
+        for analysis in ResumeAnalysis.objects.filter(job_posting=job_posting):
+            self.assertEqual(analysis.status, ResumeAnalysis.STATUS_FAILED)
+            self.assertEqual(analysis.feedback, 'Analysis failed: model crashed')
+            self.assertIsNotNone(analysis.completed_at)
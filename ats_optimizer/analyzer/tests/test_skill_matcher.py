@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+
+import spacy
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from ..utils.skill_matcher import SkillMatcher, canonical_skill, load_taxonomy, taxonomy_version
+
+
+class TaxonomyFileTests(SimpleTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def write(self, name, content):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_formats_load_to_lowercase_canonical_names(self):
+        expected = {'kubernetes': ['k8s'], 'machine learning': ['ml'], 'sql': []}
+        paths = [
+            self.write('dict.json', json.dumps({'Kubernetes': ['K8s'], 'Machine Learning': [' ML '], 'SQL': []})),
+            self.write('list.json', json.dumps([
+                {'name': 'Kubernetes', 'aliases': ['K8s']}, {'name': 'machine learning', 'aliases': ['ml']},
+                {'name': 'sql'}
+            ])),
+            self.write('skills.csv', "skill,aliases\nKubernetes,K8s\nMachine Learning,ml|\nSQL,\n"),
+        ]
+
+        for path in paths:
+            with self.subTest(path=os.path.basename(path)):
+                self.assertEqual(load_taxonomy(path), expected)
+
+        with self.assertRaises(ValueError):
+            load_taxonomy(self.write('skills.yaml', ''))
+
+    def test_canonical_skill(self):
+        path = self.write('skills.json', json.dumps({'kubernetes': ['k8s'], 'machine learning': ['ml']}))
+
+        self.assertEqual(canonical_skill(' K8S ', path), 'kubernetes')
+        self.assertEqual(canonical_skill('Machine Learning', path), 'machine learning')
+        self.assertEqual(canonical_skill('COBOL', path), 'cobol')
+        self.assertEqual(canonical_skill('K8s', os.path.join(self.temp_dir, 'missing.json')), 'k8s')
+
+    def test_version_follows_the_file_content(self):
+        path = self.write('skills.json', json.dumps({'go': ['golang']}))
+        version = taxonomy_version(path)
+
+        os.utime(path, (0, 0))
+        self.assertEqual(taxonomy_version(path), version)
+        self.write('skills.json', json.dumps({'go': []}))
+        self.assertNotEqual(taxonomy_version(path), version)
+        self.assertEqual(taxonomy_version(os.path.join(self.temp_dir, 'missing.json')), 'missing')
+
+
+class SkillMatcherTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.nlp = spacy.blank('en')
+        cls.matcher = SkillMatcher(cls.nlp, load_taxonomy(settings.ANALYZER_SKILL_TAXONOMY))
+
+    def match(self, text):
+        return self.matcher.match(self.nlp(text))
+
+    def test_aliases_and_case_variants_match_the_canonical_name(self):
+        self.assertEqual(
+            self.match("Wrote PYTHON3 services in Golang and TypeScript; shell scripting for deploys"),
+            {'python', 'go', 'typescript', 'bash'}
+        )
+
+    def test_multi_word_skills(self):
+        self.assertEqual(self.match("Five years of C Sharp and Machine Learning"), {'c#', 'machine learning'})
+
+    def test_whole_tokens_only(self):
+        self.assertEqual(self.match("Javascript developer"), {'javascript'})
+        self.assertEqual(self.match("Gopher, rusty and perlite"), set())
@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from ..management.commands.startup_profile import HEAVY_PACKAGES, STARTUP_PATHS
+
+
+class LightImportTests(SimpleTestCase):
+    def test_commands_and_startup_paths_do_not_import_model_libraries(self):
+        code = (
+            "import importlib, pkgutil, sys; import django; django.setup(); "
+            "import analyzer.management.commands as commands; "
+            "[importlib.import_module(f'{commands.__name__}.{module.name}') "
+            "for module in pkgutil.iter_modules(commands.__path__)]; "
+            f"[importlib.import_module(module) for modules in {list(STARTUP_PATHS.values())!r} for module in modules]; "
+            f"print(' '.join(package for package in {HEAVY_PACKAGES!r} if package in sys.modules))"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE='ats_optimizer.settings', ANALYZER_PRELOAD_MODELS='False')
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from ..utils.synthetic_corpus import generate_corpus
+
+
+class SyntheticCorpusTests(SimpleTestCase):
+    def generate(self, seed):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        corpus = generate_corpus(temp_dir.name, seed=seed, lengths=(300, 900), per_length=2, jobs=3)
+        files = {}
+        for resume in corpus['resumes']:
+            if resume['format'] == 'docx':
+                continue  # DOCX files embed their creation time
+            with open(resume['path'], 'rb') as f:
+                files[os.path.basename(resume['path'])] = f.read()
+        return corpus, files
+
+    def test_same_seed_gives_identical_files(self):
+        corpus, files = self.generate(7)
+        again, files_again = self.generate(7)
+
+        self.assertEqual(corpus['jobs'], again['jobs'])
+        self.assertEqual(files, files_again)
+        self.assertEqual(len(corpus['resumes']), 2 * 2 * 3)
+        self.assertTrue(all(content.startswith(b'%PDF-') for name, content in files.items() if name.endswith('.pdf')))
+
+    def test_resumes_reach_the_target_length(self):
+        _, files = self.generate(7)
+
+        for name, content in files.items():
+            if name.endswith('.txt'):
+                target = int(name.split('_')[1].rstrip('w'))
+                self.assertGreaterEqual(len(content.split()), target)
+
+    def test_other_seed_gives_other_texts(self):
+        corpus, files = self.generate(7)
+        other, other_files = self.generate(8)
+
+        self.assertNotEqual(corpus['jobs'], other['jobs'])
+        self.assertNotEqual(files['resume_300w_0.txt'], other_files['resume_300w_0.txt'])
@@ -1,15 +1,29 @@
 from django.urls import path
-from .views import ResumeUploadView, ProcessResumeView
-from .views import ResultsView, AnalysisHistoryView
-from .views import AnalysisAPIView
+from .views import ResumeUploadView, BatchUploadView
+from .views import ResultsView, AnalysisHistoryView, CandidateSearchView, JobMatchView
+from .views import AnalysisAPIView, AnalysisDetailAPIView, AnalysisStatusView, AnalysisTextView
+from .views import BatchAnalysisAPIView
+from .views import CandidateSearchAPIView, JobMatchAPIView, KeywordSearchAPIView, HistoryAPIView
+from .views import MetricsView
 
 app_name = 'analyzer'
 
 urlpatterns = [
     path('', ResumeUploadView.as_view(), name='upload'),
-    path('process/', ProcessResumeView.as_view(), name='process_resume'),
+    path('batch/', BatchUploadView.as_view(), name='batch_upload'),
     path('results/', ResultsView.as_view(), name='results'),
     path('results/<int:analysis_id>/', ResultsView.as_view(), name='results_detail'),
     path('history/', AnalysisHistoryView.as_view(), name='history'),
+    path('match/', JobMatchView.as_view(), name='job_match'),
+    path('postings/<int:job_posting_id>/candidates/', CandidateSearchView.as_view(), name='candidates'),
     path('api/analyze/', AnalysisAPIView.as_view(), name='api_analyze'),
+    path('api/batch/', BatchAnalysisAPIView.as_view(), name='api_batch'),
+    path('api/analysis/<int:analysis_id>/', AnalysisDetailAPIView.as_view(), name='api_analysis_detail'),
+    path('api/analysis/<int:analysis_id>/status/', AnalysisStatusView.as_view(), name='api_analysis_status'),
+    path('api/analysis/<int:analysis_id>/text/', AnalysisTextView.as_view(), name='api_analysis_text'),
+    path('api/postings/<int:job_posting_id>/candidates/', CandidateSearchAPIView.as_view(), name='api_candidates'),
+    path('api/match/', JobMatchAPIView.as_view(), name='api_job_match'),
+    path('api/search/', KeywordSearchAPIView.as_view(), name='api_keyword_search'),
+    path('api/history/', HistoryAPIView.as_view(), name='api_history'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
@@ -0,0 +1,157 @@
+"""Split resume text into sections and bounded windows for embedding.
+
+The similarity model only reads its first few hundred tokens, so a whole
+resume encoded as one input is silently cut short. Instead every section
+(experience, skills, education, ...) is split into overlapping word windows
+that fit the model, and the windows are encoded and scored separately.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+
+import numpy as np
+from django.conf import settings
+
+# Heading variants per section. Extracted text has its line breaks collapsed,
+# so headings are found inline: only Title Case or UPPER CASE forms count,
+# which keeps "5 years of experience" in a sentence from opening a section.
+SECTION_HEADINGS = {
+    'summary': ['Summary', 'Professional Summary', 'Profile', 'Objective', 'About Me'],
+    'experience': [
+        'Experience', 'Work Experience', 'Professional Experience', 'Employment History',
+        'Work History', 'Employment',
+    ],
+    'skills': ['Skills', 'Technical Skills', 'Core Competencies', 'Technologies'],
+    'projects': ['Projects', 'Personal Projects', 'Key Projects'],
+    'education': ['Education', 'Academic Background', 'Qualifications'],
+    'certifications': ['Certifications', 'Certificates', 'Licenses'],
+}
+
+# Relative weight of each section in the "weighted" aggregation
+SECTION_WEIGHTS = {
+    'experience': 1.0,
+    'skills': 1.0,
+    'projects': 0.8,
+    'summary': 0.8,
+    'certifications': 0.5,
+    'education': 0.5,
+    'other': 0.5,
+}
+
+DEFAULT_SECTION = 'other'
+
+
+def _heading_pattern():
+    variants = {}
+    for section, headings in SECTION_HEADINGS.items():
+        for heading in headings:
+            variants[heading] = section
+            variants[heading.upper()] = section
+    # Longest first so "Work Experience" wins over "Experience"
+    alternatives = sorted(variants, key=len, reverse=True)
+    pattern = re.compile(
+        r'(?<![\w])(' + '|'.join(re.escape(heading) for heading in alternatives) + r')(?![\w])\s*:?'
+    )
+    return pattern, variants
+
+
+HEADING_PATTERN, HEADING_SECTIONS = _heading_pattern()
+
+
+@dataclass(frozen=True)
+class Chunk:
+    section: str
+    text: str
+
+    @property
+    def hash(self):
+        return hashlib.sha256(self.text.encode('utf-8')).hexdigest()
+
+
+def split_sections(text):
+    """Split text into (section, text) pairs at recognised headings"""
+    sections = []
+    section = DEFAULT_SECTION
+    position = 0
+    for match in HEADING_PATTERN.finditer(text):
+        body = text[position:match.start()].strip()
+        if body:
+            sections.append((section, body))
+        section = HEADING_SECTIONS[match.group(1)]
+        position = match.end()
+
+    body = text[position:].strip()
+    if body:
+        sections.append((section, body))
+    return sections
+
+
+def window_words(text, max_words=None, overlap=None):
+    """Split text into windows of at most max_words words, overlapping by overlap"""
+    max_words = max_words or settings.ANALYZER_CHUNK_MAX_WORDS
+    overlap = settings.ANALYZER_CHUNK_OVERLAP_WORDS if overlap is None else overlap
+    words = text.split()
+    if len(words) <= max_words:
+        return [' '.join(words)] if words else []
+
+    step = max(1, max_words - overlap)
+    windows = []
+    for start in range(0, len(words), step):
+        windows.append(' '.join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return windows
+
+
+def chunk_resume(text, max_words=None, overlap=None):
+    """Section-tagged chunks of a resume, each small enough for the model"""
+    chunks = []
+    for section, body in split_sections(text or ''):
+        for window in window_words(body, max_words, overlap):
+            chunks.append(Chunk(section, window))
+    return chunks
+
+
+def aggregate_scores(chunks, scores, method=None):
+    """Combine per-chunk scores into an overall score and per-section scores.
+
+    A section scores as its best chunk. ``method`` is "max" (best chunk
+    overall), "mean" (average over chunks) or "weighted" (section scores
+    averaged with SECTION_WEIGHTS).
+    """
+    if not chunks:
+        return 0.0, {}
+
+    overall, sections, section_scores = aggregate_score_matrix(chunks, [scores], method)
+    return float(overall[0]), {
+        section: float(score) for section, score in zip(sections, section_scores[0])
+    }
+
+
+def aggregate_score_matrix(chunks, scores, method=None):
+    """aggregate_scores for many queries at once.
+
+    ``scores`` has one row per query and one column per chunk. Returns the
+    overall score per query, the section names, and a (queries, sections)
+    matrix of section scores.
+    """
+    method = method or settings.ANALYZER_SIMILARITY_AGGREGATION
+    scores = np.atleast_2d(np.asarray(scores, dtype=np.float32))
+    chunk_sections = [chunk.section for chunk in chunks]
+    sections = list(dict.fromkeys(chunk_sections))
+    section_scores = np.column_stack([
+        scores[:, [position for position, name in enumerate(chunk_sections) if name == section]].max(axis=1)
+        for section in sections
+    ])
+
+    if method == 'max':
+        overall = scores.max(axis=1)
+    elif method == 'mean':
+        overall = scores.mean(axis=1)
+    elif method == 'weighted':
+        weights = np.array([SECTION_WEIGHTS.get(section, 0.5) for section in sections], dtype=np.float32)
+        overall = section_scores @ weights / weights.sum()
+    else:
+        raise ValueError(f"Unknown similarity aggregation: {method}")
+
+    return overall, sections, section_scores
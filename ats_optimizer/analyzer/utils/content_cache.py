@@ -0,0 +1,141 @@
+"""Content-addressed caches for extracted text, embeddings and analysis results.
+
+Entries are keyed by the SHA-256 of the resume file bytes, so re-uploading
+the same file (under any name) hits the cache. Analysis results are also
+keyed by the job description hash and the analysis version, so a changed
+job, model or scoring rule never serves a stale result. Chunk embeddings
+are keyed by the chunk text hash, so an edited resume only re-encodes the
+chunks that changed.
+
+The results cache is the exception: it holds the rendered results of
+completed analyses by analysis id, and entries are deleted when the
+analysis or its job posting is saved (see analyzer/signals.py).
+"""
+import hashlib
+import logging
+import threading
+
+from django.core.cache import caches
+
+from .embeddings import embedding_from_bytes, embedding_to_bytes
+from .hashing import description_hash
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE = 'extraction'
+ANALYSIS_CACHE = 'analysis'
+EMBEDDING_CACHE = 'embeddings'
+RESULTS_CACHE = 'results'
+
+# Representations of an analysis held in the results cache
+RESULT_KINDS = ('html', 'json')
+
+_stats_lock = threading.Lock()
+_stats = {
+    EXTRACTION_CACHE: {'hits': 0, 'misses': 0},
+    ANALYSIS_CACHE: {'hits': 0, 'misses': 0},
+    EMBEDDING_CACHE: {'hits': 0, 'misses': 0},
+    RESULTS_CACHE: {'hits': 0, 'misses': 0},
+}
+
+
+def get_cache_stats():
+    """Hit/miss counters of this process, per cache tier"""
+    with _stats_lock:
+        return {tier: dict(counts) for tier, counts in _stats.items()}
+
+
+def _record(tier, hit, count=1):
+    with _stats_lock:
+        _stats[tier]['hits' if hit else 'misses'] += count
+
+
+def _lookup(tier, key):
+    try:
+        value = caches[tier].get(key)
+    except Exception as e:
+        logger.warning(f"{tier} cache read failed: {str(e)}")
+        value = None
+    _record(tier, value is not None)
+    return value
+
+
+def _store(tier, key, value):
+    try:
+        caches[tier].set(key, value)
+    except Exception as e:
+        logger.warning(f"{tier} cache write failed: {str(e)}")
+
+
+def get_extracted_text(file_hash):
+    return _lookup(EXTRACTION_CACHE, f"extraction:{file_hash}")
+
+
+def set_extracted_text(file_hash, extraction):
+    _store(EXTRACTION_CACHE, f"extraction:{file_hash}", extraction)
+
+
+def analysis_key(file_hash, job_description, version):
+    digest = hashlib.sha256(
+        f"{file_hash}:{description_hash(job_description)}:{version}".encode('utf-8')
+    ).hexdigest()
+    return f"analysis:{digest}"
+
+
+def get_cached_analysis(file_hash, job_description, version):
+    return _lookup(ANALYSIS_CACHE, analysis_key(file_hash, job_description, version))
+
+
+def set_cached_analysis(file_hash, job_description, version, result):
+    _store(ANALYSIS_CACHE, analysis_key(file_hash, job_description, version), result)
+
+
+def _embedding_key(chunk_hash, model_version):
+    return f"embedding:{model_version}:{chunk_hash}"
+
+
+def get_chunk_embeddings(chunk_hashes, model_version):
+    """Cached embeddings for the given chunk hashes, as {chunk_hash: vector}"""
+    keys = {_embedding_key(chunk_hash, model_version): chunk_hash for chunk_hash in chunk_hashes}
+    try:
+        found = caches[EMBEDDING_CACHE].get_many(list(keys))
+    except Exception as e:
+        logger.warning(f"{EMBEDDING_CACHE} cache read failed: {str(e)}")
+        found = {}
+    _record(EMBEDDING_CACHE, True, len(found))
+    _record(EMBEDDING_CACHE, False, len(keys) - len(found))
+    return {keys[key]: embedding_from_bytes(value) for key, value in found.items()}
+
+
+def set_chunk_embeddings(embeddings, model_version):
+    """Store {chunk_hash: vector} embeddings"""
+    try:
+        caches[EMBEDDING_CACHE].set_many({
+            _embedding_key(chunk_hash, model_version): embedding_to_bytes(vector)
+            for chunk_hash, vector in embeddings.items()
+        })
+    except Exception as e:
+        logger.warning(f"{EMBEDDING_CACHE} cache write failed: {str(e)}")
+
+
+def _results_key(analysis_id, kind):
+    return f"results:{kind}:{analysis_id}"
+
+
+def get_cached_results(analysis_id, kind):
+    return _lookup(RESULTS_CACHE, _results_key(analysis_id, kind))
+
+
+def set_cached_results(analysis_id, kind, entry):
+    _store(RESULTS_CACHE, _results_key(analysis_id, kind), entry)
+
+
+def invalidate_cached_results(analysis_ids):
+    """Drop every cached representation of these analyses"""
+    keys = [_results_key(analysis_id, kind) for analysis_id in analysis_ids for kind in RESULT_KINDS]
+    if not keys:
+        return
+    try:
+        caches[RESULTS_CACHE].delete_many(keys)
+    except Exception as e:
+        logger.warning(f"{RESULTS_CACHE} cache invalidation failed: {str(e)}")
@@ -0,0 +1,167 @@
+"""Interchangeable inference backends for the sentence similarity model.
+
+``torch`` runs the SentenceTransformer as before. ``onnx`` and ``onnx-int8``
+run a model exported by ``manage.py export_embedding_model`` with
+onnxruntime (the int8 variant is dynamically quantized), which needs neither
+PyTorch nor a GPU at serving time. Every backend exposes the same
+``encode(texts, batch_size=..., convert_to_numpy=True)`` call.
+"""
+import json
+import os
+
+import numpy as np
+
+BACKEND_TORCH = 'torch'
+BACKEND_ONNX = 'onnx'
+BACKEND_ONNX_INT8 = 'onnx-int8'
+BACKENDS = [BACKEND_TORCH, BACKEND_ONNX, BACKEND_ONNX_INT8]
+
+ONNX_MODEL_FILES = {
+    BACKEND_ONNX: 'model.onnx',
+    BACKEND_ONNX_INT8: 'model.int8.onnx',
+}
+TOKENIZER_FILE = 'tokenizer.json'
+ENCODER_CONFIG_FILE = 'encoder_config.json'
+
+# Transformer inputs, in the positional order of BertModel.forward
+ONNX_INPUTS = ['input_ids', 'attention_mask', 'token_type_ids']
+
+
+def load_embedding_model(backend, model_name, onnx_model_dir=None, threads=0):
+    """Load the similarity model for the given backend"""
+    if backend == BACKEND_TORCH:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+
+    if backend in ONNX_MODEL_FILES:
+        return OnnxSentenceEncoder(onnx_model_dir, ONNX_MODEL_FILES[backend], threads=threads)
+
+    raise ValueError(f"Unknown embedding backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+
+def pool_embeddings(token_embeddings, attention_mask, pooling='mean', normalize=True):
+    """Pool token embeddings into sentence embeddings like SentenceTransformer does"""
+    if pooling == 'cls':
+        embeddings = token_embeddings[:, 0]
+    else:
+        mask = attention_mask[..., np.newaxis].astype(token_embeddings.dtype)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    if normalize:
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.clip(norms, 1e-12, None)
+    return embeddings.astype(np.float32)
+
+
+class OnnxSentenceEncoder:
+    """SentenceTransformer-compatible encoder running an exported model on onnxruntime"""
+
+    def __init__(self, model_dir, model_file, threads=0):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, model_file)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"{model_path} not found; run `manage.py export_embedding_model` first"
+            )
+
+        with open(os.path.join(model_dir, ENCODER_CONFIG_FILE)) as f:
+            self.config = json.load(f)
+
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(
+            model_path, options, providers=['CPUExecutionProvider']
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        pad_token = self.config.get('pad_token', '[PAD]')
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token), pad_token=pad_token)
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batches.append(self._encode_batch(texts[start:start + batch_size]))
+        embeddings = np.vstack(batches) if batches else np.zeros((0, self.config['dimensions']), np.float32)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            'input_ids': np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            'attention_mask': np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            'token_type_ids': np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        feed = {name: value for name, value in inputs.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, feed)[0]
+        return pool_embeddings(
+            token_embeddings, inputs['attention_mask'],
+            pooling=self.config.get('pooling', 'mean'),
+            normalize=self.config.get('normalize', True)
+        )
+
+
+def export_onnx(model_name, output_dir, quantize=True, opset=14):
+    """Export a SentenceTransformer to ONNX (and an int8 copy) for the onnx backends.
+
+    Returns the paths of the written model files, keyed by backend.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device='cpu')
+    pooling = model[1].get_pooling_mode_str() if len(model) > 1 else 'mean'
+    if pooling not in ('mean', 'cls'):
+        raise ValueError(f"Unsupported pooling mode for ONNX export: {pooling}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = model.tokenizer
+    sample = tokenizer(["ONNX export sample"], return_tensors='pt')
+    input_names = [name for name in ONNX_INPUTS if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *args):
+            return self.transformer(*args)[0]
+
+    paths = {BACKEND_ONNX: os.path.join(output_dir, ONNX_MODEL_FILES[BACKEND_ONNX])}
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['token_embeddings']}
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(model[0].auto_model).eval(),
+            tuple(sample[name] for name in input_names),
+            paths[BACKEND_ONNX],
+            input_names=input_names,
+            output_names=['token_embeddings'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    with open(os.path.join(output_dir, ENCODER_CONFIG_FILE), 'w') as f:
+        json.dump({
+            'model_name': model_name,
+            'max_seq_length': model.max_seq_length,
+            'dimensions': model.get_sentence_embedding_dimension(),
+            'pooling': pooling,
+            'normalize': any(type(module).__name__ == 'Normalize' for module in model),
+            'pad_token': tokenizer.pad_token,
+        }, f, indent=2)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        paths[BACKEND_ONNX_INT8] = os.path.join(output_dir, ONNX_MODEL_FILES[BACKEND_ONNX_INT8])
+        quantize_dynamic(paths[BACKEND_ONNX], paths[BACKEND_ONNX_INT8], weight_type=QuantType.QInt8)
+
+    return paths
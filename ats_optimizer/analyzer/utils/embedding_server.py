@@ -0,0 +1,241 @@
+"""Shared embedding server and its client.
+
+One process (``manage.py run_embedding_server``) holds the similarity model
+and listens on a Unix socket. Web and worker processes send their encode
+calls there through EmbeddingClient instead of each loading a copy of the
+model. Requests that arrive together are merged into micro-batches of up to
+``ANALYZER_EMBEDDING_SERVER_MAX_BATCH`` texts, waiting at most
+``ANALYZER_EMBEDDING_SERVER_MAX_WAIT_MS`` for more to arrive.
+
+Messages are pickled over ``multiprocessing.connection``, so the socket is
+only readable by its owner and clients must present
+``ANALYZER_EMBEDDING_SERVER_KEY``; only processes of this deployment can
+connect.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+import numpy as np
+from django.conf import settings
+
+from ..metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_REQUESTS, timed
+from .model_registry import current_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+def server_authkey():
+    return settings.ANALYZER_EMBEDDING_SERVER_KEY.encode('utf-8')
+
+
+def is_insecure_key(key):
+    """True for Django's generated development keys, which are committed with the project"""
+    return not key or key.startswith('django-insecure-')
+
+
+class EmbeddingServerError(RuntimeError):
+    """The server answered with an error, e.g. its model failed on a batch"""
+
+
+class _Request:
+    __slots__ = ('texts', 'done', 'result', 'error')
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Merges concurrent encode calls into batched model.encode calls on one thread"""
+
+    def __init__(self, model, max_batch_size=64, max_wait=0.005):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._stats = {'requests': 0, 'batches': 0, 'texts': 0}
+        self._stats_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+        self._thread.start()
+
+    def encode(self, texts):
+        """Encode texts as part of the next batch; blocks until it is done"""
+        request = _Request(list(texts))
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    @property
+    def stats(self):
+        """Requests, batches and texts encoded so far"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                with timed('embedding_batch'):
+                    embeddings = np.asarray(self.model.encode(
+                        texts, batch_size=self.max_batch_size, convert_to_numpy=True
+                    ), dtype=np.float32)
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(texts)} texts failed: {str(e)}")
+                for request in batch:
+                    request.error = RuntimeError(f"Embedding server error: {str(e)}")
+                    request.done.set()
+                continue
+
+            EMBEDDING_BATCH_SIZE.observe(len(texts))
+            with self._stats_lock:
+                self._stats['requests'] += len(batch)
+                self._stats['batches'] += 1
+                self._stats['texts'] += len(texts)
+            offset = 0
+            for request in batch:
+                request.result = embeddings[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+                request.done.set()
+
+
+def _serve_connection(connection, batcher):
+    with connection:
+        while True:
+            try:
+                command, payload = connection.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                if command == 'encode':
+                    response = ('ok', batcher.encode(payload))
+                elif command == 'stats':
+                    response = ('ok', {**batcher.stats, 'rss_mb': current_rss_mb()})
+                else:
+                    response = ('error', f"Unknown command: {command}")
+            except Exception as e:
+                response = ('error', str(e))
+            try:
+                connection.send(response)
+            except OSError:
+                return
+
+
+def serve(address, model, max_batch_size=64, max_wait=0.005):
+    """Serve encode requests on a Unix socket until interrupted"""
+    if os.path.exists(address):
+        os.unlink(address)  # Left behind by a server that did not shut down cleanly
+
+    batcher = MicroBatcher(model, max_batch_size, max_wait)
+    listener = Listener(address, family='AF_UNIX', authkey=server_authkey())
+    os.chmod(address, 0o600)  # Unpickling is only safe for this deployment's own processes
+    logger.info(f"Embedding server listening on {address}")
+    try:
+        while True:
+            try:
+                connection = listener.accept()
+            except AuthenticationError:
+                logger.warning("Rejected an embedding client with the wrong key")
+                continue
+            threading.Thread(target=_serve_connection, args=(connection, batcher), daemon=True).start()
+    finally:
+        listener.close()
+
+
+class EmbeddingClient:
+    """SentenceTransformer-compatible ``encode`` that runs on the embedding server.
+
+    While the server cannot be reached or answers with an error, texts are
+    encoded by the model that ``fallback()`` loads into this process; the
+    server is tried again after ``ANALYZER_EMBEDDING_SERVER_RETRY`` seconds.
+    Without a fallback the error is raised.
+    """
+
+    def __init__(self, address, fallback=None, timeout=None, retry_interval=None):
+        self.address = address
+        self.fallback = fallback
+        self.timeout = timeout or settings.ANALYZER_EMBEDDING_SERVER_TIMEOUT
+        self.retry_interval = settings.ANALYZER_EMBEDDING_SERVER_RETRY if retry_interval is None else retry_interval
+        self._local = threading.local()  # One connection per thread
+        self._local_model = None
+        self._lock = threading.Lock()
+        self._server_down_until = 0.0
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+
+        if time.monotonic() >= self._server_down_until or self.fallback is None:
+            try:
+                embeddings = self._request('encode', texts)
+                EMBEDDING_REQUESTS.inc(target='server')
+                return embeddings[0] if single else embeddings
+            except (OSError, EOFError, AuthenticationError, EmbeddingServerError) as e:
+                self._close()
+                if self.fallback is None:
+                    raise
+                self._server_down_until = time.monotonic() + self.retry_interval
+                logger.warning(f"Embedding server unavailable, encoding in-process: {str(e)}")
+
+        EMBEDDING_REQUESTS.inc(target='local')
+        embeddings = self._get_local_model().encode(
+            texts, batch_size=batch_size or settings.ANALYZER_BATCH_SIZE, convert_to_numpy=True
+        )
+        return embeddings[0] if single else embeddings
+
+    def server_stats(self):
+        """Batching statistics and memory of the server"""
+        return self._request('stats', None)
+
+    def _request(self, command, payload):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = Client(
+                self.address, family='AF_UNIX', authkey=server_authkey()
+            )
+        connection.send((command, payload))
+        if not connection.poll(self.timeout):
+            raise TimeoutError(f"No response from the embedding server within {self.timeout}s")
+        status, result = connection.recv()
+        if status != 'ok':
+            raise EmbeddingServerError(result)
+        return result
+
+    def _close(self):
+        connection = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+
+    def _get_local_model(self):
+        with self._lock:
+            if self._local_model is None:
+                self._local_model = self.fallback()
+            return self._local_model
@@ -0,0 +1,54 @@
+import numpy as np
+
+EMBEDDING_DTYPE = np.float32
+# Stored per resume, so half precision keeps the candidate index small
+RESUME_EMBEDDING_DTYPE = np.float16
+
+
+def embedding_to_bytes(embedding, dtype=EMBEDDING_DTYPE):
+    """Serialize a 1-D embedding to compact float32 bytes for a BinaryField"""
+    return np.asarray(embedding, dtype=dtype).tobytes()
+
+
+def embedding_from_bytes(data, dtype=EMBEDDING_DTYPE):
+    """Inverse of embedding_to_bytes"""
+    if not data:
+        return None
+    return np.frombuffer(bytes(data), dtype=dtype)
+
+
+def mean_embedding(matrix):
+    """Unit-length mean of a matrix of embeddings, or None for no rows"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if not len(matrix):
+        return None
+    mean = matrix.mean(axis=0)
+    norm = np.linalg.norm(mean)
+    return mean / norm if norm else mean
+
+
+def cosine_similarity(a, b):
+    """Cosine similarity of two 1-D vectors"""
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    if not norm:
+        return 0.0
+    return float(np.dot(a, b) / norm)
+
+
+def cosine_similarities(vector, matrix):
+    """Cosine similarity of one vector against every row of a matrix"""
+    matrix = np.asarray(matrix)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    norms[norms == 0] = 1.0
+    return (matrix @ vector) / norms
+
+
+def cosine_similarity_matrix(a, b):
+    """Cosine similarity of every row of a against every row of b"""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    a_norms = np.linalg.norm(a, axis=1, keepdims=True)
+    b_norms = np.linalg.norm(b, axis=1, keepdims=True)
+    a_norms[a_norms == 0] = 1.0
+    b_norms[b_norms == 0] = 1.0
+    return (a / a_norms) @ (b / b_norms).T
@@ -1,24 +1,46 @@
+import multiprocessing
 import os
+import queue
 import re
-from PyPDF2 import PdfReader
-from docx import Document
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait
+from django.conf import settings
 import logging
 
+from ..metrics import timed
+
 logger = logging.getLogger(__name__)
 
+# text: normalized text, truncated: True when a page/character/time budget cut it short
+ExtractionResult = namedtuple('ExtractionResult', ['text', 'truncated', 'page_count'])
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Marks the end of the pages read by _collect_pages' helper thread
+_END_OF_PAGES = object()
+
 def extract_text_from_file(file_path):
     """Main entry point for text extraction"""
+    return extract_document(file_path).text
+
+def extract_document(file_path):
+    """Extract text plus truncation info, enforcing the configured budgets"""
     try:
         ext = os.path.splitext(file_path)[1].lower()
         
-        if ext == '.pdf':
-            return extract_text_pdf(file_path)
-        elif ext == '.docx':
-            return extract_text_docx(file_path)
-        elif ext == '.txt':
-            return extract_text_txt(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {ext}")
+        with timed('extract', ext.lstrip('.')):
+            if ext == '.pdf':
+                return extract_pdf(file_path)
+            elif ext == '.docx':
+                return _limit(extract_text_docx(file_path), page_count=None)
+            elif ext == '.txt':
+                text, truncated = read_text_txt(file_path)
+                return _limit(text, page_count=None, truncated=truncated)
+            else:
+                raise ValueError(f"Unsupported file format: {ext}")
     
     except Exception as e:
         logger.error(f"Error extracting text from {file_path}: {str(e)}")
@@ -26,25 +48,141 @@ def extract_text_from_file(file_path):
 
 def extract_text_pdf(file_path):
     """Extract text from PDF files"""
+    return extract_pdf(file_path).text
+
+def extract_pdf(file_path, max_pages=None, max_chars=None, time_budget=None):
+    """Extract a PDF within page, character and wall-clock budgets.
+
+    Small documents are read serially; long ones are split into page ranges
+    and extracted across a process pool. The pages read in order up to the
+    point where a budget runs out are returned with ``truncated=True``.
+    """
+    max_pages = settings.ANALYZER_PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = settings.ANALYZER_MAX_TEXT_CHARS if max_chars is None else max_chars
+    time_budget = settings.ANALYZER_EXTRACTION_TIME_BUDGET if time_budget is None else time_budget
+    deadline = time.time() + time_budget
+    
     try:
+        from PyPDF2 import PdfReader
         reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return normalize_text(text)
+        page_count = len(reader.pages)
+        pages_to_read = min(page_count, max_pages)
+        
+        if pages_to_read >= settings.ANALYZER_PDF_PARALLEL_MIN_PAGES and settings.ANALYZER_PDF_WORKERS > 1:
+            pages, truncated = _extract_pdf_parallel(file_path, pages_to_read, deadline)
+        else:
+            pages, truncated = _collect_pages(iter_pdf_pages(reader, 0, pages_to_read), max_chars, deadline)
+        
+        if pages_to_read < page_count:
+            logger.warning(f"PDF {file_path} has {page_count} pages, reading the first {pages_to_read}")
+            truncated = True
+        
+        return _limit("\n".join(pages), page_count, max_chars, truncated=truncated)
     except Exception as e:
         logger.error(f"PDF extraction error: {str(e)}")
         raise
 
+def iter_pdf_pages(reader, start=0, stop=None):
+    """Yield the text of each non-empty page in [start, stop) as it is read"""
+    stop = len(reader.pages) if stop is None else stop
+    for index in range(start, stop):
+        page_text = reader.pages[index].extract_text()
+        if page_text:
+            yield page_text
+
+def _collect_pages(pages, max_chars, deadline):
+    """Drain a page generator until it ends or the character/time budget is spent.
+
+    Pages are read on a helper thread, so one slow page cannot hold the
+    caller past the deadline. A page still being read then is abandoned and
+    the thread stops after it.
+    """
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def read():
+        try:
+            for page_text in pages:
+                results.put(page_text)
+                if stop.is_set():
+                    return
+            results.put(_END_OF_PAGES)
+        except Exception as e:
+            results.put(e)
+
+    threading.Thread(target=read, name='pdf-pages', daemon=True).start()
+    collected = []
+    total_chars = 0
+    try:
+        while True:
+            try:
+                page_text = results.get(timeout=max(0.0, deadline - time.time()))
+            except queue.Empty:
+                return collected, True
+            if page_text is _END_OF_PAGES:
+                return collected, False
+            if isinstance(page_text, Exception):
+                raise page_text
+            collected.append(page_text)
+            total_chars += len(page_text)
+            if total_chars > max_chars:
+                return collected, True
+    finally:
+        stop.set()
+
+def _extract_page_range(file_path, start, stop, deadline):
+    """Process-pool task: extract one page range, stopping at the deadline"""
+    from PyPDF2 import PdfReader
+    reader = PdfReader(file_path)
+    pages = []
+    for page_text in iter_pdf_pages(reader, start, stop):
+        pages.append(page_text)
+        if time.time() > deadline:
+            return pages, True
+    return pages, False
+
+def _get_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=settings.ANALYZER_PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pdf_pool
+
+def _extract_pdf_parallel(file_path, page_count, deadline):
+    step = settings.ANALYZER_PDF_PAGES_PER_TASK
+    pool = _get_pdf_pool()
+    futures = [
+        pool.submit(_extract_page_range, file_path, start, min(start + step, page_count), deadline)
+        for start in range(0, page_count, step)
+    ]
+    wait(futures, timeout=max(0.0, deadline - time.time()))
+    
+    # Keep the ranges up to the first one that did not finish, so the text
+    # stays a prefix of the document; running ranges cannot be cancelled
+    # and finish in the background
+    pages = []
+    for index, future in enumerate(futures):
+        if not future.done():
+            for pending in futures[index:]:
+                pending.cancel()
+            return pages, True
+        range_pages, range_truncated = future.result()
+        pages.extend(range_pages)
+        if range_truncated:
+            for pending in futures[index + 1:]:
+                pending.cancel()
+            return pages, True
+    return pages, False
+
 def extract_text_docx(file_path):
     """Extract text from DOCX files"""
     try:
+        from docx import Document
         doc = Document(file_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
         return normalize_text(text)
     except Exception as e:
         logger.error(f"DOCX extraction error: {str(e)}")
@@ -52,14 +190,28 @@ def extract_text_docx(file_path):
 
 def extract_text_txt(file_path):
     """Extract text from TXT files"""
+    return normalize_text(read_text_txt(file_path)[0])
+
+def read_text_txt(file_path, max_chars=None):
+    """Read at most max_chars raw characters; returns (text, truncated)"""
+    max_chars = settings.ANALYZER_MAX_TEXT_CHARS if max_chars is None else max_chars
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
-        return normalize_text(text)
+            # Read one character past the budget so truncation can be detected.
+            # Decided on the raw text: normalizing can shrink it under the limit
+            raw = f.read(max_chars + 1)
+        return raw[:max_chars], len(raw) > max_chars
     except Exception as e:
         logger.error(f"TXT extraction error: {str(e)}")
         raise
 
+def _limit(text, page_count, max_chars=None, truncated=False):
+    max_chars = settings.ANALYZER_MAX_TEXT_CHARS if max_chars is None else max_chars
+    text = normalize_text(text)
+    if len(text) > max_chars:
+        return ExtractionResult(text[:max_chars], True, page_count)
+    return ExtractionResult(text, truncated, page_count)
+
 def normalize_text(text):
     """Clean and normalize text"""
     if not text:
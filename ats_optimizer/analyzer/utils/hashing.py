@@ -0,0 +1,28 @@
+import hashlib
+import re
+
+
+def normalize_description(text):
+    """Normalize a job description so trivially different copies hash the same"""
+    if not text:
+        return ""
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def description_hash(text):
+    """SHA-256 hex digest of a normalized job description"""
+    return hashlib.sha256(normalize_description(text).encode('utf-8')).hexdigest()
+
+
+def text_sha256(text):
+    """SHA-256 hex digest of a text's UTF-8 bytes"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_sha256(file_path, chunk_size=64 * 1024):
+    """SHA-256 hex digest of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
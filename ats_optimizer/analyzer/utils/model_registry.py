@@ -0,0 +1,152 @@
+import logging
+import os
+import resource
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SPACY_EXCLUDED_COMPONENTS = ['parser']
+
+WARMUP_TEXT = (
+    "Senior Python developer with experience in Django, REST APIs, "
+    "machine learning and cloud deployment on AWS."
+)
+
+
+def current_rss_mb():
+    """Return the resident memory of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Not on Linux: fall back to peak RSS (KB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def resolve_model_path(name):
+    """Path of a model saved under ANALYZER_MODEL_DIR, or the name itself when there is none"""
+    local_path = Path(settings.ANALYZER_MODEL_DIR) / name
+    return str(local_path) if local_path.is_dir() else name
+
+
+def apply_offline_mode():
+    """Keep the model libraries off the network when ANALYZER_MODELS_OFFLINE is set"""
+    if settings.ANALYZER_MODELS_OFFLINE:
+        # huggingface_hub reads these when it is first imported
+        os.environ.setdefault('HF_HUB_OFFLINE', '1')
+        os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+
+def load_local_similarity_model():
+    """Load the similarity model into this process"""
+    from .embedding_backends import load_embedding_model
+    apply_offline_mode()
+    return load_embedding_model(
+        settings.ANALYZER_EMBEDDING_BACKEND,
+        resolve_model_path(settings.ANALYZER_SIMILARITY_MODEL),
+        onnx_model_dir=settings.ANALYZER_ONNX_MODEL_DIR,
+        threads=settings.ANALYZER_ONNX_THREADS
+    )
+
+
+class ModelRegistry:
+    """Process-wide, thread-safe holder for the NLP models.
+
+    Every model is loaded at most once per process and shared by all
+    NLPProcessor instances.
+    """
+
+    def __init__(self):
+        # Re-entrant: some loaders need another model (the skill matcher needs spaCy)
+        self._lock = threading.RLock()
+        self._models = {}
+        self.stats = {}
+        self.warmed_up = False
+
+    def get_nlp(self):
+        """Return the shared spaCy pipeline"""
+        return self._get('spacy', self._load_spacy)
+
+    def get_similarity_model(self):
+        """Return the shared sentence embedding model (see ANALYZER_EMBEDDING_BACKEND)"""
+        return self._get('similarity', self._load_similarity_model)
+
+    def get_skill_matcher(self):
+        """Return the shared skill matcher compiled from the configured taxonomy"""
+        return self._get('skills', self._load_skill_matcher)
+
+    def warm_up(self):
+        """Load every model and run one inference so the first request is fast"""
+        if self.warmed_up:
+            return self.stats
+
+        start = time.perf_counter()
+        nlp = self.get_nlp()
+        similarity_model = self.get_similarity_model()
+        skill_matcher = self.get_skill_matcher()
+        skill_matcher.match(nlp(WARMUP_TEXT))
+        similarity_model.encode([WARMUP_TEXT])
+
+        with self._lock:
+            self.warmed_up = True
+            self.stats['warmup'] = {
+                'seconds': time.perf_counter() - start,
+                'rss_mb': current_rss_mb(),
+            }
+        logger.info(
+            f"NLP models warmed up in {self.stats['warmup']['seconds']:.2f}s "
+            f"(RSS {self.stats['warmup']['rss_mb']:.0f} MB)"
+        )
+        return self.stats
+
+    def _get(self, name, loader):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            model = self._models.get(name)
+            if model is None:
+                rss_before = current_rss_mb()
+                start = time.perf_counter()
+                model = loader()
+                elapsed = time.perf_counter() - start
+                rss_after = current_rss_mb()
+
+                self._models[name] = model
+                self.stats[name] = {
+                    'load_seconds': elapsed,
+                    'rss_mb': rss_after,
+                    'rss_delta_mb': rss_after - rss_before,
+                }
+                logger.info(
+                    f"Loaded {name} model in {elapsed:.2f}s "
+                    f"(+{rss_after - rss_before:.0f} MB, RSS {rss_after:.0f} MB)"
+                )
+        return model
+
+    def _load_spacy(self):
+        import spacy
+        # Nothing uses dependency parses, so the parser is never loaded
+        return spacy.load(resolve_model_path(settings.ANALYZER_SPACY_MODEL), exclude=SPACY_EXCLUDED_COMPONENTS)
+
+    def _load_similarity_model(self):
+        if settings.ANALYZER_EMBEDDING_SERVER_SOCKET:
+            # The model lives in the shared embedding server; it is loaded
+            # here only if the server cannot be reached
+            from .embedding_server import EmbeddingClient
+            return EmbeddingClient(settings.ANALYZER_EMBEDDING_SERVER_SOCKET, fallback=load_local_similarity_model)
+        return load_local_similarity_model()
+
+    def _load_skill_matcher(self):
+        from .skill_matcher import SkillMatcher, load_taxonomy
+        return SkillMatcher(self.get_nlp(), load_taxonomy(settings.ANALYZER_SKILL_TAXONOMY))
+
+
+model_registry = ModelRegistry()
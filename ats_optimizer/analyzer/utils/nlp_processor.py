@@ -1,98 +1,190 @@
-import spacy
 import re
-from sentence_transformers import SentenceTransformer, util
 import logging
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+import numpy as np
+
+from .chunking import aggregate_scores, chunk_resume
+from .content_cache import get_chunk_embeddings, set_chunk_embeddings
+from .embeddings import cosine_similarities, cosine_similarity, mean_embedding
+from .model_registry import model_registry
+from .skill_matcher import taxonomy_version
 
 logger = logging.getLogger(__name__)
 
+# Bump when keyword extraction changes so stored job features are recomputed
+KEYWORD_EXTRACTION_VERSION = 2
+
+KEYWORD_POS = {'NOUN', 'PROPN', 'VERB'}
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE)
+PHONE_PATTERN = re.compile(r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b')
+
+@dataclass
+class DocumentFeatures:
+    """Everything extracted from a single spaCy parse of a text"""
+    lemmas: list = field(default_factory=list)
+    keywords: set = field(default_factory=set)
+    skills: set = field(default_factory=set)
+    names: list = field(default_factory=list)
+    emails: list = field(default_factory=list)
+    phones: list = field(default_factory=list)
+
+def embedding_model_version():
+    """Identifies the similarity model and the backend running it"""
+    return f"{settings.ANALYZER_SIMILARITY_MODEL}@{settings.ANALYZER_EMBEDDING_BACKEND}"
+
+def features_version():
+    """Identifies the models and extraction logic behind stored features"""
+    return (
+        f"{settings.ANALYZER_SPACY_MODEL}:{embedding_model_version()}"
+        f":kw{KEYWORD_EXTRACTION_VERSION}"
+        f":skills-{taxonomy_version(settings.ANALYZER_SKILL_TAXONOMY)}"
+    )
+
 class NLPProcessor:
     def __init__(self):
         try:
-            self.nlp = spacy.load("en_core_web_sm")
-            self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Models are shared process-wide, so creating a processor is cheap
+            self.nlp = model_registry.get_nlp()
+            self.similarity_model = model_registry.get_similarity_model()
+            self.skill_matcher = model_registry.get_skill_matcher()
         except Exception as e:
             logger.error(f"Error initializing NLP models: {str(e)}")
             raise
 
-    def extract_keywords(self, text, include_skills=True):
-        """Extract keywords using spaCy"""
+    @property
+    def features_version(self):
+        return features_version()
+
+    def analyze_document(self, text):
+        """Parse a text once and extract everything the analyzer needs from it.
+
+        Model errors are raised rather than returned as empty features, so
+        they are never scored and cached as a real result.
+        """
         if not text:
-            return set()
+            return DocumentFeatures()
         
-        try:
-            doc = self.nlp(text.lower())
-            keywords = set()
-            
-            for token in doc:
-                if token.is_stop or token.is_punct or token.is_space:
-                    continue
-                if token.pos_ in ['NOUN', 'PROPN', 'VERB']:
-                    keywords.add(token.lemma_)
-            
-            if include_skills:
-                skill_keywords = self.extract_skill_entities(doc)
-                keywords.update(skill_keywords)
-            
-            return keywords
-        
-        except Exception as e:
-            logger.error(f"Keyword extraction error: {str(e)}")
-            return set()
+        return self._features_from_doc(self.nlp(text))
 
-    def extract_skill_entities(self, doc):
-        """Extract technology skills"""
-        tech_patterns = [
-            r'\b(?:python|java|javascript|react|angular|vue|node|django|flask|sql|mongodb|aws|azure|docker|kubernetes|git)\b',
-            r'\b(?:machine learning|data science|artificial intelligence|deep learning|nlp|computer vision)\b',
-            r'\b(?:html|css|bootstrap|tailwind|jquery|typescript|php|ruby|c\+\+|c#|go|rust)\b'
+    def analyze_documents(self, texts, batch_size=None):
+        """Batched analyze_document, streaming all texts through nlp.pipe"""
+        batch_size = batch_size or settings.ANALYZER_BATCH_SIZE
+        return [
+            self._features_from_doc(doc)
+            for doc in self.nlp.pipe(texts, batch_size=batch_size)
         ]
+
+    def _features_from_doc(self, doc):
+        features = DocumentFeatures()
         
-        skills = set()
-        text_lower = doc.text.lower()
+        for token in doc:
+            if token.is_stop or token.is_punct or token.is_space:
+                continue
+            lemma = token.lemma_.lower()
+            features.lemmas.append(lemma)
+            if token.pos_ in KEYWORD_POS:
+                features.keywords.add(lemma)
         
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            skills.update(matches)
+        features.skills = self.extract_skill_entities(doc)
+        features.keywords.update(features.skills)
         
-        return skills
+        features.names = [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
+        features.emails = EMAIL_PATTERN.findall(doc.text)
+        features.phones = PHONE_PATTERN.findall(doc.text)
+        return features
+
+    def extract_keywords(self, text, include_skills=True):
+        """Extract keywords using spaCy"""
+        features = self.analyze_document(text)
+        if include_skills:
+            return features.keywords
+        return features.keywords - features.skills
+
+    def extract_skill_entities(self, doc):
+        """Extract technology skills as canonical taxonomy names"""
+        return self.skill_matcher.match(doc)
 
     def extract_named_entities(self, text):
         """Extract names, emails, phones"""
-        if not text:
-            return [], [], []
-        
-        try:
-            doc = self.nlp(text)
-            
-            # Extract names
-            names = [ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"]
-            
-            # Extract emails
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, text, re.IGNORECASE)
-            
-            # Extract phone numbers
-            phone_pattern = r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b'
-            phones = re.findall(phone_pattern, text)
-            
-            return names, emails, phones
-        
-        except Exception as e:
-            logger.error(f"Entity extraction error: {str(e)}")
-            return [], [], []
+        features = self.analyze_document(text)
+        return features.names, features.emails, features.phones
 
-    def compute_semantic_similarity(self, text1, text2):
-        """Calculate semantic similarity"""
+    def encode(self, texts, batch_size=None):
+        """Encode a list of texts into a float32 embedding matrix"""
+        batch_size = batch_size or settings.ANALYZER_BATCH_SIZE
+        return self.similarity_model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+
+    def compute_semantic_similarity(self, text1, text2, embedding1=None):
+        """Calculate semantic similarity (embedding1 skips re-encoding text1)"""
         try:
             if not text1 or not text2:
                 return 0.0
             
-            embedding1 = self.similarity_model.encode(text1, convert_to_tensor=True)
-            embedding2 = self.similarity_model.encode(text2, convert_to_tensor=True)
+            if embedding1 is None:
+                embedding1, embedding2 = self.encode([text1, text2])
+            else:
+                embedding2 = self.encode([text2])[0]
             
-            similarity = util.pytorch_cos_sim(embedding1, embedding2)
-            return float(similarity.item())
+            return cosine_similarity(embedding1, embedding2)
         
         except Exception as e:
             logger.error(f"Similarity calculation error: {str(e)}")
             return 0.0
+
+    def encode_chunks(self, chunks, batch_size=None):
+        """Embedding matrix for chunks, encoding only those not cached by hash"""
+        model_version = embedding_model_version()
+        hashes = [chunk.hash for chunk in chunks]
+        cached = get_chunk_embeddings(set(hashes), model_version)
+
+        missing = {}
+        for chunk_hash, chunk in zip(hashes, chunks):
+            if chunk_hash not in cached:
+                missing.setdefault(chunk_hash, chunk.text)
+
+        if missing:
+            encoded = dict(zip(missing, self.encode(list(missing.values()), batch_size=batch_size)))
+            set_chunk_embeddings(encoded, model_version)
+            cached.update(encoded)
+
+        return np.vstack([cached[chunk_hash] for chunk_hash in hashes])
+
+    def embed_documents(self, texts, batch_size=None):
+        """Chunk each text and encode the chunks of all texts in one batched call.
+
+        Returns ``(chunks, chunk_embeddings)`` per text.
+        """
+        chunked = [chunk_resume(text) for text in texts]
+        chunks = [chunk for text_chunks in chunked for chunk in text_chunks]
+        matrix = self.encode_chunks(chunks, batch_size=batch_size) if chunks else None
+
+        documents = []
+        offset = 0
+        for text_chunks in chunked:
+            documents.append((text_chunks, matrix[offset:offset + len(text_chunks)] if text_chunks else None))
+            offset += len(text_chunks)
+        return documents
+
+    def compute_section_similarities(self, embedding, texts, batch_size=None):
+        """Section-aware similarity of many texts against one embedding.
+
+        Each text is chunked by section and token window, the chunks of all
+        texts are encoded together, and the chunk scores are aggregated.
+        Returns ``(similarity, section_scores, document_embedding)`` per text,
+        where the document embedding is the mean of its chunk embeddings.
+        Encoding errors are raised, not turned into a 0 similarity.
+        """
+        documents = self.embed_documents(texts, batch_size=batch_size)
+
+        results = []
+        for chunks, chunk_embeddings in documents:
+            if not chunks:
+                results.append((0.0, {}, None))
+                continue
+            scores = [float(score) for score in cosine_similarities(embedding, chunk_embeddings)]
+            similarity, section_scores = aggregate_scores(chunks, scores)
+            results.append((similarity, section_scores, mean_embedding(chunk_embeddings)))
+        return results
@@ -1,77 +1,230 @@
-from .extract_utils import extract_text_from_file
-from .nlp_processor import NLPProcessor
+from .content_cache import get_cached_analysis, get_extracted_text
+from .content_cache import set_cached_analysis, set_extracted_text
+from .extract_utils import extract_document
+from .hashing import file_sha256
+from .nlp_processor import NLPProcessor, embedding_model_version, features_version
+from ..metrics import timed
 import logging
+import os
+
+from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Bump when scoring, feedback or result fields change so cached results are recomputed
+SCORING_VERSION = 4
+
+def analysis_version():
+    """Identifies everything that shapes an analysis result"""
+    return (
+        f"{features_version()}:score{SCORING_VERSION}"
+        f":chunks{settings.ANALYZER_CHUNK_MAX_WORDS}-{settings.ANALYZER_CHUNK_OVERLAP_WORDS}"
+        f"-{settings.ANALYZER_SIMILARITY_AGGREGATION}"
+    )
+
+def extract_resume_text(resume_file_path, file_hash=None):
+    """Extract resume text, reusing earlier extractions of identical file bytes.
+
+    Returns ``(text, truncated)``; ``truncated`` is True when an extraction
+    budget (pages, characters or time) cut the document short.
+    """
+    file_hash = file_hash or file_sha256(resume_file_path)
+    cached = get_extracted_text(file_hash)
+    if cached is not None:
+        return cached
+
+    extraction = extract_document(resume_file_path)
+    if extraction.text:
+        set_extracted_text(file_hash, (extraction.text, extraction.truncated))
+    return extraction.text, extraction.truncated
+
 class ResumeAnalyzer:
     def __init__(self):
         self.nlp_processor = NLPProcessor()
 
-    def analyze_resume(self, resume_file_path, job_description):
-        """Main analysis method - returns results immediately"""
-        try:
-            # Step 1: Extract text
-            logger.info("Extracting text from resume...")
-            resume_text = extract_text_from_file(resume_file_path)
-            
-            if not resume_text:
-                raise ValueError("Could not extract text from resume")
+    def analyze_resume(self, resume_file_path, job_description, job_features=None):
+        """Main analysis method - returns results immediately
+
+        ``job_features`` (from compute_job_features) skips re-processing a job
+        description whose keywords and embedding were stored earlier.
+
+        A file that cannot be read gives a failed result. Model and embedding
+        errors are raised instead: they may be transient, so the caller can
+        retry, and no result is cached for them.
+        """
+        file_format = os.path.splitext(resume_file_path)[1].lower().lstrip('.')
+        with timed('analyze', file_format) as span:
+            try:
+                # Identical file bytes against the same job give the same result
+                file_hash = file_sha256(resume_file_path)
+                version = analysis_version()
+                cached = get_cached_analysis(file_hash, job_description, version)
+                if cached is not None:
+                    logger.info("Returning cached analysis")
+                    span['outcome'] = 'cached'
+                    return cached
+                
+                # Step 1: Extract text
+                logger.info("Extracting text from resume...")
+                resume_text, text_truncated = extract_resume_text(resume_file_path, file_hash)
+                
+                if not resume_text:
+                    raise ValueError("Could not extract text from resume")
             
-            # Step 2: Process keywords
-            logger.info("Processing keywords...")
-            resume_keywords = self.nlp_processor.extract_keywords(resume_text)
-            job_keywords = self.nlp_processor.extract_keywords(job_description)
+            except Exception as e:
+                logger.error(f"Resume analysis failed: {str(e)}")
+                span['outcome'] = 'error'
+                return self._failed_result(e)
             
-            # Step 3: Match keywords
-            logger.info("Matching keywords...")
-            matching_keywords, missing_keywords = self.match_keywords(job_keywords, resume_keywords)
+            # Step 2: Parse the resume once for keywords and entities
+            logger.info("Analyzing resume document...")
+            job_features = job_features or self.compute_job_features(job_description)
+            with timed('nlp_parse', file_format):
+                document = self.nlp_processor.analyze_document(resume_text)
             
-            # Step 4: Calculate similarity
+            # Step 3: Calculate similarity section by section
             logger.info("Computing semantic similarity...")
-            semantic_similarity = self.nlp_processor.compute_semantic_similarity(job_description, resume_text)
-            
-            # Step 5: Calculate ATS score
-            logger.info("Calculating ATS score...")
-            ats_score = self.calculate_ats_score(matching_keywords, job_keywords, semantic_similarity)
+            with timed('similarity', file_format):
+                [(semantic_similarity, section_scores, embedding)] = (
+                    self.nlp_processor.compute_section_similarities(job_features['embedding'], [resume_text])
+                )
             
-            # Step 6: Extract entities
-            logger.info("Extracting named entities...")
-            names, emails, phones = self.nlp_processor.extract_named_entities(resume_text)
-            
-            # Step 7: Generate feedback
-            logger.info("Generating feedback...")
-            feedback = self.generate_feedback(ats_score, matching_keywords, missing_keywords, semantic_similarity)
+            # Step 4: Match keywords, score and generate feedback
+            with timed('scoring', file_format):
+                result = self._build_result(
+                    resume_text, job_features['keywords'], document, semantic_similarity,
+                    text_truncated, section_scores, embedding
+                )
             
+            set_cached_analysis(file_hash, job_description, version, result)
             logger.info("Analysis completed successfully!")
-            
+            return result
+
+    def analyze_batch(self, job_description, resume_paths, batch_size=None, job_features=None):
+        """Screen many resumes against one job description.
+
+        The job description is processed once, resumes go through nlp.pipe and
+        a single batched encode call over all resume chunks, and the results come back ranked by ATS
+        score (best first), each with its ``file_path`` and ``rank``.
+        """
+        batch_size = batch_size or settings.ANALYZER_BATCH_SIZE
+        version = analysis_version()
+        results = [None] * len(resume_paths)
+        file_hashes = {}
+
+        # Step 1: Reuse cached results, extract text for the rest
+        texts = {}
+        truncated = {}
+        for index, path in enumerate(resume_paths):
+            try:
+                file_hashes[index] = file_sha256(path)
+                cached = get_cached_analysis(file_hashes[index], job_description, version)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+                
+                text, truncated[index] = extract_resume_text(path, file_hashes[index])
+                if not text:
+                    raise ValueError("Could not extract text from resume")
+                texts[index] = text
+            except Exception as e:
+                logger.error(f"Batch extraction failed for {path}: {str(e)}")
+                results[index] = self._failed_result(e)
+
+        indexes = list(texts)
+        resume_texts = [texts[index] for index in indexes]
+
+        if resume_texts:
+            # Step 2: Process the job description once, resumes in batches
+            logger.info(f"Analyzing batch of {len(resume_texts)} resumes...")
+            job_features = job_features or self.compute_job_features(job_description)
+            with timed('batch_nlp_parse'):
+                documents = self.nlp_processor.analyze_documents(resume_texts, batch_size=batch_size)
+            with timed('batch_similarity'):
+                similarities = self.nlp_processor.compute_section_similarities(
+                    job_features['embedding'], resume_texts, batch_size=batch_size
+                )
+
+            with timed('batch_scoring'):
+                for position, index in enumerate(indexes):
+                    semantic_similarity, section_scores, embedding = similarities[position]
+                    results[index] = self._build_result(
+                        resume_texts[position],
+                        job_features['keywords'],
+                        documents[position],
+                        semantic_similarity,
+                        truncated[index],
+                        section_scores,
+                        embedding
+                    )
+                    set_cached_analysis(file_hashes[index], job_description, version, results[index])
+
+        for path, result in zip(resume_paths, results):
+            result['file_path'] = path
+
+        ranked = sorted(
+            results,
+            key=lambda result: (result['status'] == 'completed', result['ats_score']),
+            reverse=True
+        )
+        for rank, result in enumerate(ranked, start=1):
+            result['rank'] = rank
+        return ranked
+
+    def compute_job_features(self, job_description):
+        """Keywords and embedding of a job description, reusable across resumes"""
+        with timed('job_features'):
             return {
-                'resume_text': resume_text,
-                'ats_score': ats_score,
-                'semantic_similarity': semantic_similarity * 100,  # Convert to percentage
-                'matching_keywords': matching_keywords,
-                'missing_keywords': missing_keywords,
-                'applicant_name': names[0] if names else None,
-                'email': emails[0] if emails else None,
-                'phone_number': phones[0] if phones else None,
-                'feedback': feedback,
-                'status': 'completed'
+                'keywords': self.nlp_processor.extract_keywords(job_description),
+                'embedding': self.nlp_processor.encode([job_description])[0]
             }
+
+    def _build_result(self, resume_text, job_keywords, document, semantic_similarity,
+                      text_truncated=False, section_scores=None, embedding=None):
+        """Score matched keywords and similarity into the analysis result dict"""
+        matching_keywords, missing_keywords = self.match_keywords(job_keywords, document.keywords)
+        ats_score = self.calculate_ats_score(matching_keywords, job_keywords, semantic_similarity)
+        feedback = self.generate_feedback(ats_score, matching_keywords, missing_keywords, semantic_similarity)
+        names, emails, phones = document.names, document.emails, document.phones
         
-        except Exception as e:
-            logger.error(f"Resume analysis failed: {str(e)}")
-            return {
-                'resume_text': '',
-                'ats_score': 0.0,
-                'semantic_similarity': 0.0,
-                'matching_keywords': [],
-                'missing_keywords': [],
-                'applicant_name': None,
-                'email': None,
-                'phone_number': None,
-                'feedback': f"Analysis failed: {str(e)}",
-                'status': 'failed'
-            }
+        return {
+            'resume_text': resume_text,
+            'ats_score': ats_score,
+            'semantic_similarity': semantic_similarity * 100,  # Convert to percentage
+            'section_scores': {
+                section: score * 100 for section, score in (section_scores or {}).items()
+            },
+            'matching_keywords': matching_keywords,
+            'missing_keywords': missing_keywords,
+            'skills': sorted(document.skills),
+            'applicant_name': names[0] if names else None,
+            'email': emails[0] if emails else None,
+            'phone_number': phones[0] if phones else None,
+            'feedback': feedback,
+            'text_truncated': text_truncated,
+            'embedding': embedding,
+            'embedding_version': embedding_model_version(),
+            'status': 'completed'
+        }
+
+    def _failed_result(self, error):
+        return {
+            'resume_text': '',
+            'ats_score': 0.0,
+            'semantic_similarity': 0.0,
+            'section_scores': {},
+            'matching_keywords': [],
+            'missing_keywords': [],
+            'skills': [],
+            'applicant_name': None,
+            'email': None,
+            'phone_number': None,
+            'feedback': f"Analysis failed: {str(error)}",
+            'text_truncated': False,
+            'embedding': None,
+            'embedding_version': '',
+            'status': 'failed'
+        }
 
     def match_keywords(self, job_keywords, resume_keywords):
         """Match job and resume keywords"""
@@ -0,0 +1,102 @@
+"""Skill taxonomy matching.
+
+A taxonomy maps canonical skill names to their aliases ("kubernetes" ->
+["k8s"]). It is compiled once into a spaCy PhraseMatcher, which matches all
+phrases in a single pass over the tokens, so matching time stays nearly flat
+as the taxonomy grows.
+
+Taxonomy files are either JSON (``{"kubernetes": ["k8s"], ...}`` or a list of
+``{"name": ..., "aliases": [...]}`` objects) or CSV with ``skill`` and
+``aliases`` columns, aliases separated by ``|``.
+"""
+import csv
+import hashlib
+import json
+import logging
+import os
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+def load_taxonomy(path):
+    """Load a skill taxonomy file into a {canonical: [aliases]} dict"""
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            data = {entry['name']: entry.get('aliases', []) for entry in data}
+    elif ext == '.csv':
+        with open(path, encoding='utf-8', newline='') as f:
+            data = {
+                row['skill']: [alias for alias in (row.get('aliases') or '').split('|') if alias]
+                for row in csv.DictReader(f)
+            }
+    else:
+        raise ValueError(f"Unsupported skill taxonomy format: {ext}")
+
+    return {
+        name.strip().lower(): [alias.strip().lower() for alias in aliases if alias.strip()]
+        for name, aliases in data.items()
+        if name.strip()
+    }
+
+
+@lru_cache(maxsize=8)
+def _file_digest(path, mtime):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def taxonomy_version(path):
+    """Short content hash of a taxonomy file, so stored features track edits to it"""
+    try:
+        return _file_digest(path, os.path.getmtime(path))
+    except OSError:
+        return 'missing'
+
+
+@lru_cache(maxsize=8)
+def _alias_map(path, version):
+    names = {}
+    for name, aliases in load_taxonomy(path).items():
+        names[name] = name
+        for alias in aliases:
+            names.setdefault(alias, name)
+    return names
+
+
+def canonical_skill(term, path):
+    """Canonical taxonomy name for a skill or alias ("k8s" -> "kubernetes")"""
+    term = term.strip().lower()
+    try:
+        return _alias_map(path, taxonomy_version(path)).get(term, term)
+    except (OSError, ValueError):
+        return term
+
+
+class SkillMatcher:
+    """Compiled multi-pattern matcher that returns canonical skill names"""
+
+    def __init__(self, nlp, taxonomy):
+        from spacy.matcher import PhraseMatcher
+
+        self.matcher = PhraseMatcher(nlp.vocab, attr='LOWER')
+        self.canonical_names = {}
+
+        for name, aliases in taxonomy.items():
+            # Only the tokenizer is needed to build the patterns
+            patterns = list(nlp.tokenizer.pipe([name, *aliases]))
+            self.matcher.add(name, patterns)
+            self.canonical_names[nlp.vocab.strings[name]] = name
+
+        logger.info(f"Compiled skill matcher with {len(taxonomy)} skills")
+
+    def __len__(self):
+        return len(self.canonical_names)
+
+    def match(self, doc):
+        """Return the set of canonical skills mentioned in a spaCy Doc"""
+        return {self.canonical_names[match_id] for match_id, _, _ in self.matcher(doc)}
@@ -0,0 +1,148 @@
+"""Reproducible synthetic resumes and job descriptions for benchmarks.
+
+The same seed always produces the same texts and files, so timings from
+different commits are measured on identical input. Resumes are written as
+PDF (a minimal text-only PDF written by hand, no extra dependency), DOCX
+and TXT.
+"""
+import os
+import random
+
+FIRST_NAMES = ['Jane', 'John', 'Priya', 'Wei', 'Carlos', 'Amara', 'Lukas', 'Sofia', 'Omar', 'Hannah']
+LAST_NAMES = ['Doe', 'Smith', 'Patel', 'Chen', 'Garcia', 'Okafor', 'Muller', 'Rossi', 'Haddad', 'Kim']
+ROLES = [
+    'Software Engineer', 'Backend Developer', 'Data Scientist', 'DevOps Engineer',
+    'Frontend Developer', 'Machine Learning Engineer', 'Platform Engineer', 'Data Engineer',
+]
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Tech']
+SKILLS = [
+    'Python', 'Django', 'Flask', 'FastAPI', 'Java', 'Spring Boot', 'Go', 'Rust', 'JavaScript',
+    'TypeScript', 'React', 'Angular', 'Vue', 'Node.js', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB',
+    'Redis', 'Kafka', 'Docker', 'Kubernetes', 'Terraform', 'AWS', 'Azure', 'GCP', 'Git',
+    'CI/CD', 'machine learning', 'TensorFlow', 'PyTorch', 'pandas', 'NumPy', 'Spark', 'Airflow',
+]
+ACHIEVEMENTS = [
+    'Designed and built {skill} services handling millions of requests per day',
+    'Led a team of {count} engineers delivering {skill} features on schedule',
+    'Reduced infrastructure costs by {count}0% by migrating workloads to {skill}',
+    'Improved API latency by {count}0% through profiling and {skill} optimisations',
+    'Introduced {skill} and {other} into the delivery pipeline, cutting release time in half',
+    'Mentored junior developers on {skill} best practices and code review',
+    'Built data pipelines with {skill} and {other} processing terabytes of events',
+    'Owned the on-call rotation for {skill} systems with 99.9% availability',
+]
+DEGREES = ['BSc Computer Science', 'MSc Software Engineering', 'BEng Electrical Engineering', 'MSc Data Science']
+
+
+def resume_text(rng, target_words):
+    """A plausible resume of roughly target_words words"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS, 12)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "SUMMARY",
+        f"{rng.choice(ROLES)} with {rng.randint(2, 15)} years of experience in {', '.join(skills[:4])}.",
+        "EXPERIENCE",
+    ]
+
+    words = sum(len(line.split()) for line in lines)
+    while words < target_words:
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({rng.randint(2005, 2023)} - present)")
+        for _ in range(rng.randint(3, 6)):
+            line = rng.choice(ACHIEVEMENTS).format(
+                skill=rng.choice(skills), other=rng.choice(skills), count=rng.randint(2, 9)
+            ) + '.'
+            lines.append(line)
+            words += len(line.split())
+
+    lines += ["SKILLS", ', '.join(skills), "EDUCATION", f"{rng.choice(DEGREES)}, University of Somewhere"]
+    return lines
+
+
+def job_description(rng):
+    """A job description asking for a handful of skills"""
+    skills = rng.sample(SKILLS, 6)
+    return (
+        f"We are hiring a {rng.choice(ROLES)} at {rng.choice(COMPANIES)}. You will design, build and "
+        f"operate services using {', '.join(skills[:3])}. Experience with {', '.join(skills[3:])} is a plus. "
+        f"You have {rng.randint(2, 8)}+ years of professional experience, communicate clearly and enjoy "
+        f"mentoring others."
+    )
+
+
+def write_txt(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def write_docx(path, lines):
+    from docx import Document
+
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path, lines, lines_per_page=48, width=95):
+    """Write lines as a minimal multi-page text PDF (Helvetica, ASCII)"""
+    wrapped = []
+    for line in lines:
+        while len(line) > width:
+            cut = line.rfind(' ', 0, width)
+            cut = cut if cut > 0 else width
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip()
+        wrapped.append(line)
+    pages = [wrapped[start:start + lines_per_page] for start in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    def escape(text):
+        return text.encode('ascii', 'replace').replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', b'', b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for page_lines in pages:
+        content = b'BT /F1 10 Tf 50 770 Td 15 TL ' + b' '.join(b'(' + escape(line) + b") '" for line in page_lines) + b' ET'
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(content), content))
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (b' '.join(b'%d 0 R' % kid for kid in kids), len(kids))
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+WRITERS = {'pdf': write_pdf, 'docx': write_docx, 'txt': write_txt}
+
+
+def generate_corpus(output_dir, seed=42, lengths=(300, 900, 3000), per_length=2, jobs=5):
+    """Write resumes in every format and return the corpus description.
+
+    Returns ``{'resumes': [{'path', 'format', 'words'}], 'jobs': [str]}``.
+    """
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    resumes = []
+    for words in lengths:
+        for index in range(per_length):
+            lines = resume_text(rng, words)
+            for file_format, writer in WRITERS.items():
+                path = os.path.join(output_dir, f'resume_{words}w_{index}.{file_format}')
+                writer(path, lines)
+                resumes.append({'path': path, 'format': file_format, 'words': words})
+
+    return {'resumes': resumes, 'jobs': [job_description(rng) for _ in range(jobs)]}
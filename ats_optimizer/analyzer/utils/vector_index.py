@@ -0,0 +1,139 @@
+"""In-memory nearest-neighbour indexes over unit-length embeddings.
+
+``ExactIndex`` scores every stored vector with blocked NumPy matrix-vector
+products, which is exact and fast enough for tens of thousands of rows.
+``HNSWIndex`` (needs ``hnswlib``) is an approximate drop-in for larger
+collections. Both take arbitrary integer ids, replace the vector of an
+id that is added again and can drop ids.
+"""
+import numpy as np
+
+INDEX_EXACT = 'exact'
+INDEX_HNSW = 'hnsw'
+
+
+def normalize_rows(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def create_index(kind, dimensions):
+    """Build an empty index of the given kind ("exact" or "hnsw")"""
+    if kind == INDEX_EXACT:
+        return ExactIndex(dimensions)
+    if kind == INDEX_HNSW:
+        return HNSWIndex(dimensions)
+    raise ValueError(f"Unknown vector index: {kind}")
+
+
+class ExactIndex:
+    """Brute-force cosine top-k over a float16 matrix"""
+
+    def __init__(self, dimensions, dtype=np.float16, block_rows=8192):
+        self.dimensions = dimensions
+        self.block_rows = block_rows
+        self._matrix = np.zeros((0, dimensions), dtype=dtype)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._positions = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, ids, vectors):
+        vectors = normalize_rows(vectors)
+        new_rows = []
+        for item_id, vector in zip(ids, vectors):
+            position = self._positions.get(item_id)
+            if position is None:
+                new_rows.append((item_id, vector))
+            else:
+                self._matrix[position] = vector
+
+        if not new_rows:
+            return
+        self._reserve(self._size + len(new_rows))
+        for item_id, vector in new_rows:
+            self._matrix[self._size] = vector
+            self._ids[self._size] = item_id
+            self._positions[item_id] = self._size
+            self._size += 1
+
+    def remove(self, ids):
+        """Drop ids by moving the last row into each freed slot"""
+        for item_id in ids:
+            position = self._positions.pop(item_id, None)
+            if position is None:
+                continue
+            last = self._size - 1
+            if position != last:
+                self._matrix[position] = self._matrix[last]
+                self._ids[position] = self._ids[last]
+                self._positions[int(self._ids[position])] = position
+            self._size = last
+
+    def search(self, query, k):
+        """Return up to k ``(id, score)`` pairs, best first"""
+        if not self._size or k <= 0:
+            return []
+        query = normalize_rows(query)[0]
+
+        scores = np.empty(self._size, dtype=np.float32)
+        # Upcast block by block so float16 storage never becomes a full float32 copy
+        for start in range(0, self._size, self.block_rows):
+            stop = min(start + self.block_rows, self._size)
+            scores[start:stop] = self._matrix[start:stop].astype(np.float32) @ query
+
+        k = min(k, self._size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[position]), float(scores[position])) for position in top]
+
+    def _reserve(self, size):
+        if size <= len(self._matrix):
+            return
+        capacity = max(size, 2 * len(self._matrix), 1024)
+        matrix = np.zeros((capacity, self.dimensions), dtype=self._matrix.dtype)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids = matrix, ids
+
+
+class HNSWIndex:
+    """Approximate cosine top-k backed by an hnswlib graph"""
+
+    def __init__(self, dimensions, capacity=10000, m=16, ef_construction=200, ef_search=100):
+        import hnswlib
+
+        self.dimensions = dimensions
+        self._index = hnswlib.Index(space='cosine', dim=dimensions)
+        self._index.init_index(max_elements=capacity, M=m, ef_construction=ef_construction)
+        self._index.set_ef(ef_search)
+        self._ids = set()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, ids, vectors):
+        ids = list(ids)
+        needed = len(self._ids | set(ids))
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+        self._index.add_items(normalize_rows(vectors), np.asarray(ids, dtype=np.int64))
+        self._ids.update(ids)
+
+    def remove(self, ids):
+        """Hide ids from searches; adding one again brings it back"""
+        for item_id in set(ids) & self._ids:
+            self._index.mark_deleted(item_id)
+            self._ids.discard(item_id)
+
+    def search(self, query, k):
+        """Return up to k ``(id, score)`` pairs, best first"""
+        k = min(k, len(self._ids))
+        if k <= 0:
+            return []
+        labels, distances = self._index.knn_query(normalize_rows(query), k=k)
+        return [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
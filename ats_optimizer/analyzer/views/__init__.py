@@ -1,9 +1,15 @@
-from .upload_views import ResumeUploadView, ProcessResumeView
+from .upload_views import ResumeUploadView, BatchUploadView
 from .analysis_views import ResultsView, AnalysisHistoryView
-from .api_views import AnalysisAPIView
+from .search_views import CandidateSearchView, JobMatchView
+from .metrics_views import MetricsView
+from .api_views import AnalysisAPIView, AnalysisDetailAPIView, AnalysisStatusView, AnalysisTextView
+from .api_views import BatchAnalysisAPIView
+from .api_views import CandidateSearchAPIView, JobMatchAPIView, KeywordSearchAPIView, HistoryAPIView
 
 __all__ = [
-    'ResumeUploadView', 'ProcessResumeView', 
-    'ResultsView', 'AnalysisHistoryView',
-    'AnalysisAPIView'
+    'ResumeUploadView', 'BatchUploadView',
+    'ResultsView', 'AnalysisHistoryView', 'CandidateSearchView', 'JobMatchView',
+    'AnalysisAPIView', 'AnalysisDetailAPIView', 'AnalysisStatusView', 'AnalysisTextView', 'BatchAnalysisAPIView',
+    'CandidateSearchAPIView', 'JobMatchAPIView', 'KeywordSearchAPIView', 'HistoryAPIView',
+    'MetricsView'
 ]
@@ -1,14 +1,19 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
 from django.views import View
-from django.core.paginator import Paginator
 
+from ..db_routers import ReplicaReadMixin
+from ..history import CursorError, history_page
 from ..models import ResumeAnalysis
+from ..results_cache import cache_results_response, cached_results_response
 
-class ResultsView(View):
+class ResultsView(ReplicaReadMixin, View):
     """Display analysis results"""
     
     template_name = 'analyzer/results.html'
+    processing_template_name = 'analyzer/processing.html'
     
     def get(self, request, analysis_id=None):
         """Display the analysis results"""
@@ -21,7 +26,26 @@ class ResultsView(View):
             return redirect('analyzer:upload')
         
         try:
-            analysis = get_object_or_404(ResumeAnalysis, id=analysis_id)
+            # Completed results are served from the cache without touching the database
+            cached = cached_results_response(request, analysis_id, 'html')
+            if cached is not None:
+                return cached
+
+            analysis = ResumeAnalysis.objects.filter(id=analysis_id).first()
+            if analysis is None or not analysis.is_finished:
+                # The replica may not have caught up with a new or just-finished analysis
+                analysis = get_object_or_404(ResumeAnalysis.objects.using(DEFAULT_DB_ALIAS), id=analysis_id)
+
+            if analysis.status == ResumeAnalysis.STATUS_FAILED:
+                messages.error(request, f'Analysis failed: {analysis.feedback}')
+                return redirect('analyzer:upload')
+
+            if analysis.status != ResumeAnalysis.STATUS_COMPLETED:
+                # Still queued or running: show a page that polls the status endpoint
+                return render(request, self.processing_template_name, {
+                    'analysis': analysis,
+                    'job_posting': analysis.job_posting
+                })
             
             context = {
                 'analysis': analysis,
@@ -32,7 +56,7 @@ class ResultsView(View):
                 'similarity_class': self._get_score_class(analysis.semantic_similarity)
             }
             
-            return render(request, self.template_name, context)
+            return cache_results_response(request, analysis, 'html', render(request, self.template_name, context))
             
         except Exception as e:
             messages.error(request, f'Error displaying results: {str(e)}')
@@ -47,22 +71,27 @@ class ResultsView(View):
         else:
             return 'danger'
 
-class AnalysisHistoryView(View):
+class AnalysisHistoryView(ReplicaReadMixin, View):
     """Display history of all analyses"""
     
     template_name = 'analyzer/history.html'
     
     def get(self, request):
-        """Show paginated list of all analyses"""
-        analyses_list = ResumeAnalysis.objects.all().order_by('-created_at')
-        
-        paginator = Paginator(analyses_list, 20)  # 20 analyses per page
-        page_number = request.GET.get('page')
-        analyses = paginator.get_page(page_number)
+        """Show one page of analyses, newest first"""
+        try:
+            page = history_page(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+                page_size=settings.ANALYZER_HISTORY_PAGE_SIZE
+            )
+        except CursorError:
+            messages.error(request, 'That history page no longer exists.')
+            return redirect('analyzer:history')
         
         context = {
-            'analyses': analyses,
-            'total_analyses': analyses_list.count()
+            'analyses': page.items,
+            'next_cursor': page.next_cursor,
+            'previous_cursor': page.previous_cursor
         }
         
         return render(request, self.template_name, context)
@@ -1,50 +1,484 @@
-from django.http import JsonResponse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import EmptyPage, Paginator
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from django.views import View
-import json
+
+from ..db_routers import ReplicaReadMixin
+from ..forms import ResumeUploadForm
+from ..forms.validation_forms import AnalysisAPIForm, BatchUploadForm
+from ..models import JobPosting, ResumeAnalysis
+from .search_views import get_job_posting_or_404, parse_top_k, search_candidates
+
+def analysis_data(analysis):
+    """Full JSON representation of a finished analysis"""
+    return {
+        'id': analysis.id,
+        'status': analysis.status,
+        'ats_score': analysis.ats_score,
+        'semantic_similarity': analysis.semantic_similarity,
+        'section_scores': analysis.section_scores,
+        'matching_keywords': analysis.matching_keywords,
+        'missing_keywords': analysis.missing_keywords,
+        'skills': analysis.skills,
+        'applicant_name': analysis.applicant_name,
+        'email': analysis.email,
+        'phone_number': analysis.phone_number,
+        'feedback': analysis.feedback,
+        'job_posting': {
+            'id': analysis.job_posting.id,
+            'title': analysis.job_posting.title,
+            'company': analysis.job_posting.company
+        },
+        'results_url': reverse('analyzer:results_detail', args=[analysis.id]),
+        'text_url': reverse('analyzer:api_analysis_text', args=[analysis.id])
+    }
+
+def validated_form(form_class, request):
+    """Bind and validate an upload form (parses the body and may query the database)"""
+    form = form_class(request.POST, request.FILES)
+    form.is_valid()
+    return form
+
+def job_posting_from_form(form):
+    """The posting a validated upload form refers to, creating or reusing one from its fields"""
+    if form.cleaned_data.get('job_posting') is not None:
+        return form.cleaned_data['job_posting']
+    job_posting, _ = JobPosting.objects.get_or_create_for_description(
+        title=form.cleaned_data['job_title'],
+        company=form.cleaned_data['company_name'],
+        description=form.cleaned_data['job_description'],
+        location=form.cleaned_data.get('location', ''),
+        experience_level=form.cleaned_data.get('experience_level', ''),
+        job_type=form.cleaned_data.get('job_type', '')
+    )
+    return job_posting
+
+def pool_busy_response(error):
+    response = JsonResponse({
+        'success': False,
+        'error': str(error)
+    }, status=503)
+    response['Retry-After'] = str(settings.ANALYZER_POOL_QUEUE_TIMEOUT)
+    return response
 
 @method_decorator(csrf_exempt, name='dispatch')
 class AnalysisAPIView(View):
-    """API endpoint for AJAX analysis requests"""
+    """Analyze one resume in a single request, without session state.
+
+    The view is async: the analysis runs in the process pool (see
+    analyzer/analysis_pool.py) while the event loop keeps serving other
+    requests.
+    """
     
-    def post(self, request):
-        """Handle AJAX analysis requests"""
+    async def post(self, request):
+        """Handle multipart requests: resume_file plus job fields or job_posting_id.
+
+        Returns the full analysis, or with ``?async=1`` queues it and returns
+        its id and status URL straight away (202). With ANALYZER_ASYNC_JOBS
+        off no worker takes queued jobs, so the analysis runs in the pool
+        first and the same response comes back finished (200).
+        """
+        form = await sync_to_async(validated_form)(AnalysisAPIForm, request)
+        
+        if form.errors:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
+            }, status=400)
+        
         try:
-            data = json.loads(request.body)
-            job_description = data.get('job_description')
+            from ..analysis_pool import PoolBusy, analyze_in_pool
+            from ..jobs import enqueue_analysis
+            from ..services import fail_analyses, start_analyses
+            
+            job_posting = await sync_to_async(job_posting_from_form)(form)
             
-            if not job_description:
+            if request.GET.get('async') in ('1', 'true'):
+                analysis = await sync_to_async(enqueue_analysis)(job_posting, form.cleaned_data['resume_file'])
+                if not settings.ANALYZER_ASYNC_JOBS and not analysis.is_finished:
+                    try:
+                        await analyze_in_pool(analysis.id)
+                    except Exception as e:
+                        await sync_to_async(fail_analyses)([analysis], e)
+                        raise
+                    await analysis.arefresh_from_db(fields=['status'])
                 return JsonResponse({
-                    'success': False,
-                    'error': 'Job description is required'
-                }, status=400)
+                    'success': True,
+                    'data': {
+                        'id': analysis.id,
+                        'status': analysis.status,
+                        'status_url': reverse('analyzer:api_analysis_status', args=[analysis.id]),
+                        'results_url': reverse('analyzer:results_detail', args=[analysis.id])
+                    }
+                }, status=202 if not analysis.is_finished else 200)
+            
+            [analysis] = await sync_to_async(start_analyses)(job_posting, [form.cleaned_data['resume_file']])
+            try:
+                await analyze_in_pool(analysis.id)
+            except Exception as e:
+                await sync_to_async(fail_analyses)([analysis], e)
+                raise
+            analysis = await ResumeAnalysis.objects.select_related('job_posting').aget(id=analysis.id)
+            
+            completed = analysis.status == ResumeAnalysis.STATUS_COMPLETED
+            return JsonResponse({
+                'success': completed,
+                'data': analysis_data(analysis)
+            }, status=200 if completed else 422)
+            
+        except PoolBusy as e:
+            return pool_busy_response(e)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+    
+    async def get(self, request):
+        """Handle GET requests for API documentation"""
+        return JsonResponse({
+            'message': 'ATS Analyzer API',
+            'endpoints': {
+                'POST /api/analyze/?async=1': 'Analyze one resume (resume_file plus job fields or job_posting_id)',
+                'POST /api/batch/': 'Screen many resumes against one job description',
+                'GET /api/analysis/<id>/': 'Full results of an analysis (cached, supports ETag)',
+                'GET /api/analysis/<id>/status/': 'Poll the status of a queued analysis',
+                'GET /api/analysis/<id>/text/': 'Extracted resume text of an analysis',
+                'GET /api/postings/<id>/candidates/?k=20': 'Top stored resumes for a job posting',
+                'POST /api/match/?k=20': 'Rank all open job postings for one resume',
+                'GET /api/search/?q=python AND kubernetes NOT java&page=1': 'Boolean keyword search over analyses',
+                'GET /api/history/?page_size=20&after=<cursor>': 'Analysis history, newest first',
+                'GET /metrics/': 'Prometheus metrics (stage timings, models, caches, queue)'
+            }
+        })
+
+class AnalysisStatusView(View):
+    """JSON status of a queued analysis, polled by the results page"""
+    
+    async def get(self, request, analysis_id):
+        """Return the job status and, once finished, where to find the results"""
+        try:
+            analysis = await ResumeAnalysis.objects.only(
+                'id', 'status', 'attempts', 'ats_score', 'feedback'
+            ).aget(id=analysis_id)
+        except ResumeAnalysis.DoesNotExist:
+            raise Http404("Analysis not found")
+        
+        data = {
+            'id': analysis.id,
+            'status': analysis.status,
+            'attempts': analysis.attempts,
+            'finished': analysis.is_finished
+        }
+        
+        if analysis.status == ResumeAnalysis.STATUS_COMPLETED:
+            data['ats_score'] = analysis.ats_score
+            data['results_url'] = reverse('analyzer:results_detail', args=[analysis.id])
+        elif analysis.status == ResumeAnalysis.STATUS_FAILED:
+            data['error'] = analysis.feedback
+        
+        return JsonResponse({
+            'success': True,
+            'data': data
+        })
+
+class AnalysisDetailAPIView(View):
+    """Full results of one analysis as JSON"""
+    
+    def get(self, request, analysis_id):
+        """Return the analysis; completed ones are cached and support ETag/If-None-Match"""
+        from ..results_cache import cache_results_response, cached_results_response
+        
+        cached = cached_results_response(request, analysis_id, 'json')
+        if cached is not None:
+            return cached
+        
+        analysis = get_object_or_404(ResumeAnalysis.objects.select_related('job_posting'), id=analysis_id)
+        response = JsonResponse({
+            'success': True,
+            'data': analysis_data(analysis)
+        })
+        return cache_results_response(request, analysis, 'json', response)
+
+class AnalysisTextView(View):
+    """Extracted resume text, fetched only when the results page asks for it"""
+    
+    def get(self, request, analysis_id):
+        """Return the decompressed text of one analysis"""
+        analysis = get_object_or_404(
+            ResumeAnalysis.objects.select_related('stored_text').only('id', 'stored_text'), id=analysis_id
+        )
+        
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'id': analysis.id,
+                'text': analysis.parsed_text or ''
+            }
+        })
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BatchAnalysisAPIView(View):
+    """API endpoint that ranks many resumes against one job description"""
+    
+    async def post(self, request):
+        """Handle multipart batch requests (job fields plus resume_files)"""
+        form = await sync_to_async(validated_form)(BatchUploadForm, request)
+        
+        if form.errors:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
+            }, status=400)
+        
+        try:
+            from ..analysis_pool import PoolBusy, screen_in_pool
+            from ..services import fail_analyses, start_analyses
+            
+            job_posting = await sync_to_async(job_posting_from_form)(form)
+            analyses = await sync_to_async(start_analyses)(job_posting, form.cleaned_data['resume_files'])
+            
+            # The whole batch is one pool task so it keeps the batched NLP path
+            try:
+                ranks = dict(await screen_in_pool(job_posting.id, [analysis.id for analysis in analyses]))
+            except Exception as e:
+                await sync_to_async(fail_analyses)(analyses, e)
+                raise
+            analyses = [
+                analysis async for analysis in ResumeAnalysis.objects.filter(id__in=ranks)
+            ]
+            for analysis in analyses:
+                analysis.rank = ranks[analysis.id]
+            analyses.sort(key=lambda analysis: analysis.rank)
             
-            # This could be expanded for API-based analysis
             return JsonResponse({
                 'success': True,
-                'message': 'Analysis completed',
                 'data': {
-                    'job_description_length': len(job_description)
+                    'job_posting_id': job_posting.id,
+                    'results': [
+                        {
+                            'rank': analysis.rank,
+                            'id': analysis.id,
+                            'file_name': analysis.resume_file.name,
+                            'status': analysis.status,
+                            'ats_score': analysis.ats_score,
+                            'semantic_similarity': analysis.semantic_similarity,
+                            'matching_keywords': analysis.matching_keywords,
+                            'missing_keywords': analysis.missing_keywords,
+                            'applicant_name': analysis.applicant_name,
+                            'email': analysis.email
+                        }
+                        for analysis in analyses
+                    ]
                 }
             })
             
-        except json.JSONDecodeError:
+        except PoolBusy as e:
+            return pool_busy_response(e)
+        except Exception as e:
             return JsonResponse({
                 'success': False,
-                'error': 'Invalid JSON data'
+                'error': str(e)
+            }, status=500)
+
+class CandidateSearchAPIView(View):
+    """Top-k stored resumes for a job posting, from the in-memory vector index"""
+    
+    async def get(self, request, job_posting_id):
+        """Return the ranked candidates with their similarity to the posting"""
+        from ..analysis_pool import PoolBusy
+        
+        job_posting = await get_job_posting_or_404(job_posting_id)
+        
+        try:
+            results, elapsed_ms = await search_candidates(job_posting, k=parse_top_k(request))
+            
+            return JsonResponse({
+                'success': True,
+                'data': {
+                    'job_posting_id': job_posting.id,
+                    'search_ms': round(elapsed_ms, 2),
+                    'candidates': [
+                        {
+                            'rank': rank,
+                            'id': analysis.id,
+                            'score': round(score * 100, 2),
+                            'applicant_name': analysis.applicant_name,
+                            'email': analysis.email,
+                            'ats_score': analysis.ats_score,
+                            'applied_job_posting_id': analysis.job_posting_id,
+                            'results_url': reverse('analyzer:results_detail', args=[analysis.id])
+                        }
+                        for rank, (analysis, score) in enumerate(results, start=1)
+                    ]
+                }
+            })
+            
+        except PoolBusy as e:
+            return pool_busy_response(e)
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=500)
+
+@method_decorator(csrf_exempt, name='dispatch')
+class JobMatchAPIView(View):
+    """API endpoint that ranks every open job posting for one resume; the work runs in the analysis pool"""
+    
+    async def post(self, request):
+        """Handle multipart requests with a resume_file"""
+        form = await sync_to_async(validated_form)(ResumeUploadForm, request)
+        
+        if form.errors:
+            return JsonResponse({
+                'success': False,
+                'errors': form.errors
             }, status=400)
+        
+        try:
+            from ..analysis_pool import PoolBusy, match_in_pool
+            
+            matches, elapsed_ms = await match_in_pool(
+                form.cleaned_data['resume_file'].temporary_file_path(), k=parse_top_k(request)
+            )
+            
+            return JsonResponse({
+                'success': True,
+                'data': {
+                    'match_ms': round(elapsed_ms, 2),
+                    'matches': [
+                        {
+                            'rank': rank,
+                            'job_posting_id': match['job_posting'].id,
+                            'title': match['job_posting'].title,
+                            'company': match['job_posting'].company,
+                            'ats_score': match['ats_score'],
+                            'semantic_similarity': match['semantic_similarity'],
+                            'matching_keywords': match['matching_keywords'],
+                            'missing_keywords': match['missing_keywords']
+                        }
+                        for rank, match in enumerate(matches, start=1)
+                    ]
+                }
+            })
+            
+        except PoolBusy as e:
+            return pool_busy_response(e)
         except Exception as e:
             return JsonResponse({
                 'success': False,
                 'error': str(e)
             }, status=500)
+
+class KeywordSearchAPIView(View):
+    """Boolean keyword search over completed analyses via the inverted index"""
+    
+    page_size = 50
+    max_page_size = 200
     
     def get(self, request):
-        """Handle GET requests for API documentation"""
+        """Return one page of matching analyses, newest first"""
+        from ..keyword_index import QueryError, search
+        
+        try:
+            ids = search(request.GET.get('q', ''))
+        except QueryError as e:
+            return JsonResponse({
+                'success': False,
+                'error': f'Invalid query: {str(e)}'
+            }, status=400)
+        
+        try:
+            page_size = max(1, min(int(request.GET.get('page_size', self.page_size)), self.max_page_size))
+            page = Paginator(ids, page_size).page(request.GET.get('page', 1))
+        except (ValueError, EmptyPage) as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        
+        page_ids = [int(analysis_id) for analysis_id in page.object_list]
+        analyses = ResumeAnalysis.objects.select_related('job_posting').defer(
+            'embedding'
+        ).in_bulk(page_ids)
+        
         return JsonResponse({
-            'message': 'ATS Analyzer API',
-            'endpoints': {
-                'POST /api/analyze/': 'Submit analysis request'
+            'success': True,
+            'data': {
+                'total': page.paginator.count,
+                'page': page.number,
+                'num_pages': page.paginator.num_pages,
+                'results': [
+                    {
+                        'id': analysis.id,
+                        'applicant_name': analysis.applicant_name,
+                        'email': analysis.email,
+                        'ats_score': analysis.ats_score,
+                        'skills': analysis.skills,
+                        'job_posting_id': analysis.job_posting_id,
+                        'job_title': analysis.job_posting.title,
+                        'results_url': reverse('analyzer:results_detail', args=[analysis.id])
+                    }
+                    for analysis in (analyses[analysis_id] for analysis_id in page_ids if analysis_id in analyses)
+                ]
+            }
+        })
+
+class HistoryAPIView(ReplicaReadMixin, View):
+    """Analysis history as JSON, paged with opaque cursors"""
+    
+    max_page_size = 200
+    
+    def get(self, request):
+        """Return one page of analyses, newest first, optionally for one job posting"""
+        from ..history import CursorError, history_page, history_queryset
+        
+        queryset = history_queryset()
+        try:
+            page_size = max(1, min(
+                int(request.GET.get('page_size', settings.ANALYZER_HISTORY_PAGE_SIZE)), self.max_page_size
+            ))
+            if request.GET.get('job_posting_id'):
+                queryset = queryset.filter(job_posting_id=int(request.GET['job_posting_id']))
+            if request.GET.get('status'):
+                queryset = queryset.filter(status=request.GET['status'])
+            page = history_page(
+                queryset,
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+                page_size=page_size
+            )
+        except (ValueError, CursorError) as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=400)
+        
+        return JsonResponse({
+            'success': True,
+            'data': {
+                'next_cursor': page.next_cursor,
+                'previous_cursor': page.previous_cursor,
+                'results': [
+                    {
+                        'id': analysis.id,
+                        'status': analysis.status,
+                        'applicant_name': analysis.applicant_name,
+                        'ats_score': analysis.ats_score,
+                        'semantic_similarity': analysis.semantic_similarity,
+                        'created_at': analysis.created_at.isoformat(),
+                        'job_posting_id': analysis.job_posting_id,
+                        'job_title': analysis.job_posting.title,
+                        'company': analysis.job_posting.company,
+                        'results_url': reverse('analyzer:results_detail', args=[analysis.id])
+                    }
+                    for analysis in page.items
+                ]
             }
         })
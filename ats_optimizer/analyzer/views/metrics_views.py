@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views import View
+
+class MetricsView(View):
+    """Stage timings, model, cache and queue metrics in Prometheus text format"""
+    
+    def get(self, request):
+        if not settings.ANALYZER_METRICS_ENABLED:
+            raise Http404("Metrics are disabled")
+        from ..metrics import CONTENT_TYPE, has_metrics_token, render_metrics
+        
+        if not has_metrics_token(request.headers.get('Authorization')):
+            response = HttpResponse("Metrics token required", status=401, content_type='text/plain')
+            response['WWW-Authenticate'] = 'Bearer'
+            return response
+        
+        return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
@@ -0,0 +1,89 @@
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.http import Http404
+from django.shortcuts import redirect, render
+from django.views import View
+
+from ..forms import ResumeUploadForm
+from ..models import JobPosting
+
+# Rendering reads the session (messages), so it runs off the event loop
+async_render = sync_to_async(render)
+
+async def get_job_posting_or_404(job_posting_id):
+    try:
+        return await JobPosting.objects.aget(id=job_posting_id)
+    except JobPosting.DoesNotExist:
+        raise Http404("Job posting not found")
+
+async def search_candidates(job_posting, k=None):
+    """find_candidates, with the posting's features computed in the analysis pool when missing"""
+    from ..analysis_pool import job_features_in_pool
+    from ..candidates import find_candidates
+    from ..utils.nlp_processor import features_version
+    
+    if not job_posting.has_features(features_version()):
+        await job_features_in_pool(job_posting.id)
+        job_posting = await JobPosting.objects.aget(id=job_posting.id)
+    return await sync_to_async(find_candidates)(job_posting, k=k)
+
+class CandidateSearchView(View):
+    """Rank all stored resumes against a job posting"""
+    
+    template_name = 'analyzer/candidates.html'
+    
+    async def get(self, request, job_posting_id):
+        """Show the top candidates for the posting"""
+        job_posting = await get_job_posting_or_404(job_posting_id)
+        
+        try:
+            results, elapsed_ms = await search_candidates(job_posting, k=parse_top_k(request))
+        except Exception as e:
+            messages.error(request, f'Error searching candidates: {str(e)}')
+            return redirect('analyzer:history')
+        
+        return await async_render(request, self.template_name, {
+            'job_posting': job_posting,
+            'candidates': [(analysis, score * 100) for analysis, score in results],
+            'elapsed_ms': elapsed_ms
+        })
+
+class JobMatchView(View):
+    """Rank every open job posting for one uploaded resume.
+
+    Extraction, parsing and encoding of the resume run in the analysis pool.
+    """
+    
+    template_name = 'analyzer/job_matches.html'
+    form_class = ResumeUploadForm
+    
+    async def get(self, request):
+        """Display the resume upload form"""
+        return await async_render(request, self.template_name, {'form': self.form_class()})
+    
+    async def post(self, request):
+        """Score the resume against all open postings, best fit first"""
+        from .api_views import validated_form
+        
+        form = await sync_to_async(validated_form)(self.form_class, request)
+        context = {'form': form}
+        
+        if not form.errors:
+            try:
+                from ..analysis_pool import match_in_pool
+                
+                matches, elapsed_ms = await match_in_pool(
+                    form.cleaned_data['resume_file'].temporary_file_path(), k=parse_top_k(request)
+                )
+                context.update({'matches': matches, 'elapsed_ms': elapsed_ms})
+            except Exception as e:
+                messages.error(request, f'Error matching resume: {str(e)}')
+        
+        return await async_render(request, self.template_name, context)
+
+def parse_top_k(request):
+    """Number of results requested with ?k=, if any"""
+    try:
+        return max(1, min(int(request.GET.get('k') or request.POST['k']), 500))
+    except (KeyError, ValueError):
+        return None
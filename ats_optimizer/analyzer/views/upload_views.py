@@ -1,126 +1,111 @@
-from django.shortcuts import render, redirect
+from asgiref.sync import sync_to_async
+from django.shortcuts import redirect
 from django.contrib import messages
 from django.views import View
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.conf import settings
 
-from ..forms.validation_forms import CombinedUploadForm
-from ..models import JobPosting
+from ..forms.validation_forms import CombinedUploadForm, BatchUploadForm
+from ..models import ResumeAnalysis
+from .api_views import job_posting_from_form, validated_form
+from .search_views import async_render
 
 class ResumeUploadView(View):
-    """Handle resume upload and job description input"""
+    """Handle resume upload and job description input.
+
+    Async like the API views: with ANALYZER_ASYNC_JOBS off the analysis runs
+    in the process pool instead of on the server's shared sync thread.
+    """
     
     template_name = 'analyzer/upload.html'
     form_class = CombinedUploadForm
     
-    def get(self, request):
+    async def get(self, request):
         """Display the upload form"""
         form = self.form_class()
-        return render(request, self.template_name, {'form': form})
+        return await async_render(request, self.template_name, {'form': form})
     
-    def post(self, request):
-        """Process form submission and redirect to analysis"""
-        form = self.form_class(request.POST, request.FILES)
+    async def post(self, request):
+        """Queue the analysis and redirect to its results page"""
+        form = await sync_to_async(validated_form)(self.form_class, request)
         
-        if form.is_valid():
+        if not form.errors:
             try:
-                # Create JobPosting instance
-                job_posting = JobPosting.objects.create(
-                    title=form.cleaned_data['job_title'],
-                    description=form.cleaned_data['job_description'],
-                    company=form.cleaned_data['company_name'],
-                    location=form.cleaned_data.get('location', ''),
-                    experience_level=form.cleaned_data.get('experience_level', ''),
-                    job_type=form.cleaned_data.get('job_type', '')
-                )
-                
-                # Save uploaded file temporarily
-                resume_file = form.cleaned_data['resume_file']
-                file_name = f"temp_resume_{job_posting.id}_{resume_file.name}"
-                file_path = default_storage.save(file_name, ContentFile(resume_file.read()))
-                full_file_path = default_storage.path(file_path)
-                
-                # Store file info in session for processing view
-                request.session['analysis_data'] = {
-                    'job_posting_id': job_posting.id,
-                    'file_path': full_file_path,
-                    'original_filename': resume_file.name
-                }
+                from ..analysis_pool import analyze_in_pool
+                from ..jobs import enqueue_analysis
+                from ..services import fail_analyses
+
+                # Reuse an identical posting so its stored features are shared
+                job_posting = await sync_to_async(job_posting_from_form)(form)
                 
+                # Queue the analysis; the resume file is stored on the row itself
+                analysis = await sync_to_async(enqueue_analysis)(job_posting, form.cleaned_data['resume_file'])
+
+                if not settings.ANALYZER_ASYNC_JOBS and not analysis.is_finished:
+                    try:
+                        await analyze_in_pool(analysis.id)
+                    except Exception as e:
+                        # No worker will pick it up, so do not leave it pending
+                        await sync_to_async(fail_analyses)([analysis], e)
+                        raise
+
+                await sync_to_async(request.session.__setitem__)('analysis_id', analysis.id)
+
                 messages.success(request, 'Resume uploaded successfully! Processing analysis...')
-                return redirect('analyzer:process_resume')
+                return redirect('analyzer:results_detail', analysis_id=analysis.id)
                 
             except Exception as e:
                 messages.error(request, f'Error uploading resume: {str(e)}')
         
-        return render(request, self.template_name, {'form': form})
+        return await async_render(request, self.template_name, {'form': form})
 
-class ProcessResumeView(View):
-    def get(self, request):
-        print("=== STARTING RESUME PROCESSING ===")
-        analysis_data = request.session.get('analysis_data')
-        
-        if not analysis_data:
-            messages.error(request, 'No analysis data found.')
-            return redirect('analyzer:upload')
+class BatchUploadView(View):
+    """Screen many resumes against one job description.
+
+    The batch is screened in the process pool, so a large upload does not
+    hold up other pages while it runs.
+    """
+    
+    template_name = 'analyzer/batch_upload.html'
+    results_template_name = 'analyzer/batch_results.html'
+    form_class = BatchUploadForm
+    
+    async def get(self, request):
+        """Display the batch upload form"""
+        form = self.form_class()
+        return await async_render(request, self.template_name, {'form': form})
+    
+    async def post(self, request):
+        """Analyze every resume and show them ranked by ATS score"""
+        form = await sync_to_async(validated_form)(self.form_class, request)
         
-        try:
-            from ..models import JobPosting, ResumeAnalysis
-            from ..services import create_resume_processor
-            import os
-            
-            # Get job posting
-            job_posting = JobPosting.objects.get(id=analysis_data['job_posting_id'])
-            print(f"Processing for job: {job_posting.title}")
-            
-            # Create analyzer and process
-            analyzer = create_resume_processor()
-            print("Starting analysis...")
-            
-            analysis_result = analyzer.analyze_resume(
-                analysis_data['file_path'],
-                job_posting.description
-            )
-            
-            print(f"Analysis complete with status: {analysis_result['status']}")
-            
-            # Check if analysis was successful
-            if analysis_result['status'] != 'completed':
-                messages.error(request, f"Analysis failed: {analysis_result['feedback']}")
-                return redirect('analyzer:upload')
-            
-            # Save results to database
-            with open(analysis_data['file_path'], 'rb') as f:
-                file_content = ContentFile(f.read())
-                file_content.name = analysis_data['original_filename']
+        if not form.errors:
+            try:
+                from ..analysis_pool import screen_in_pool
+                from ..services import fail_analyses, start_analyses
+                
+                job_posting = await sync_to_async(job_posting_from_form)(form)
+                analyses = await sync_to_async(start_analyses)(job_posting, form.cleaned_data['resume_files'])
                 
-                resume_analysis = ResumeAnalysis.objects.create(
-                    job_posting=job_posting,
-                    resume_file=file_content,
-                    ats_score=analysis_result['ats_score'],
-                    semantic_similarity=analysis_result['semantic_similarity'],
-                    matching_keywords=analysis_result['matching_keywords'],
-                    missing_keywords=analysis_result['missing_keywords'],
-                    applicant_name=analysis_result['applicant_name'],
-                    email=analysis_result['email'],
-                    phone_number=analysis_result['phone_number'],
-                    parsed_text=analysis_result['resume_text'],
-                    status=analysis_result['status'],
-                    feedback=analysis_result['feedback']
-                )
-            
-            # Clean up temp file
-            if os.path.exists(analysis_data['file_path']):
-                os.remove(analysis_data['file_path'])
-            
-            # Update session and redirect to results
-            del request.session['analysis_data']
-            request.session['analysis_id'] = resume_analysis.id
-            
-            messages.success(request, 'Resume analysis completed successfully!')
-            return redirect('analyzer:results')
-            
-        except Exception as e:
-            print(f"ERROR in processing: {str(e)}")
-            messages.error(request, f'Processing failed: {str(e)}')
-            return redirect('analyzer:upload')
+                try:
+                    ranks = dict(await screen_in_pool(job_posting.id, [analysis.id for analysis in analyses]))
+                except Exception as e:
+                    await sync_to_async(fail_analyses)(analyses, e)
+                    raise
+                
+                analyses = [
+                    analysis async for analysis in ResumeAnalysis.objects.filter(id__in=ranks)
+                ]
+                for analysis in analyses:
+                    analysis.rank = ranks[analysis.id]
+                analyses.sort(key=lambda analysis: analysis.rank)
+                
+                return await async_render(request, self.results_template_name, {
+                    'job_posting': job_posting,
+                    'analyses': analyses,
+                    'completed_count': sum(1 for a in analyses if a.status == 'completed')
+                })
+                
+            except Exception as e:
+                messages.error(request, f'Error screening resumes: {str(e)}')
+        
+        return await async_render(request, self.template_name, {'form': form})
@@ -40,6 +40,12 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are streamed to a temp dir inside MEDIA_ROOT in chunks and then
+# renamed into place, so each upload is written exactly once (the dir is
+# created by AnalyzerConfig.ready)
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+FILE_UPLOAD_TEMP_DIR = MEDIA_ROOT / 'tmp_uploads'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -89,12 +95,81 @@ WSGI_APPLICATION = 'ats_optimizer.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# DATABASE_URL selects the database (SQLite in BASE_DIR by default). Server
+# databases keep each thread's connection open for DB_CONN_MAX_AGE seconds
+# (default 600) and check it before reuse, instead of connecting per request.
+# SQLite connections are cheap and closed after each request by default
+
+DB_CONN_MAX_AGE = int(os.environ['DB_CONN_MAX_AGE']) if os.environ.get('DB_CONN_MAX_AGE') else None
+DB_SERVER_CONN_MAX_AGE = 600
+
+# SQLite (development and tests) runs in WAL mode and waits up to this many
+# seconds for a busy database instead of failing with "database is locked"
+DB_SQLITE_BUSY_TIMEOUT = int(os.environ.get('DB_SQLITE_BUSY_TIMEOUT', 20))
+
+
+def database_config(url, conn_max_age=None):
+    database = dj_database_url.parse(url, conn_health_checks=True)
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        database['ENGINE'] = 'analyzer.db_backends.sqlite3'
+        database.setdefault('OPTIONS', {})['timeout'] = DB_SQLITE_BUSY_TIMEOUT
+        database['CONN_MAX_AGE'] = 0 if conn_max_age is None else conn_max_age
+    else:
+        database['CONN_MAX_AGE'] = DB_SERVER_CONN_MAX_AGE if conn_max_age is None else conn_max_age
+    return database
+
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': database_config(
+        os.environ.get('DATABASE_URL') or f"sqlite:///{BASE_DIR / 'db.sqlite3'}", DB_CONN_MAX_AGE
+    )
+}
+
+# Optional read replica for the results and history pages (see analyzer/db_routers.py)
+if os.environ.get('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_config(os.environ['DATABASE_REPLICA_URL'], DB_CONN_MAX_AGE)
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['analyzer.db_routers.PrimaryReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The analyzer caches extracted text and analysis results by file content hash.
+# The file-based LRU backend is shared by web and worker processes; set
+# ANALYZER_CACHE_BACKEND=locmem for a per-process in-memory cache instead.
+
+ANALYZER_CACHE_DIR = Path(os.environ.get('ANALYZER_CACHE_DIR', BASE_DIR / 'cache'))
+ANALYZER_CACHE_MAX_ENTRIES = int(os.environ.get('ANALYZER_CACHE_MAX_ENTRIES', 2000))
+
+
+def analyzer_cache(name, timeout=None):
+    if os.environ.get('ANALYZER_CACHE_BACKEND', 'file') == 'locmem':
+        backend = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'analyzer-{name}',
+        }
+    else:
+        backend = {
+            'BACKEND': 'analyzer.cache_backends.LRUFileBasedCache',
+            'LOCATION': ANALYZER_CACHE_DIR / name,
+        }
+    return {
+        **backend,
+        'TIMEOUT': timeout,  # None: content-addressed entries never go stale
+        'OPTIONS': {'MAX_ENTRIES': ANALYZER_CACHE_MAX_ENTRIES, 'CULL_FREQUENCY': 10},
     }
+
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'extraction': analyzer_cache('extraction'),
+    'analysis': analyzer_cache('analysis'),
+    'embeddings': analyzer_cache('embeddings'),
+    # Rendered results of completed analyses, dropped when an analysis is saved.
+    # The timeout bounds staleness for per-process (locmem) caches
+    'results': analyzer_cache('results', timeout=int(os.environ.get('ANALYZER_RESULTS_CACHE_TIMEOUT', 86400))),
 }
 
 # Password validation
@@ -135,5 +210,105 @@ USE_TZ = True
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
-
-
+# Analyzer
+# NLP models are loaded once per process and shared by every analysis
+
+ANALYZER_SPACY_MODEL = os.environ.get('ANALYZER_SPACY_MODEL', 'en_core_web_sm')
+ANALYZER_SIMILARITY_MODEL = os.environ.get('ANALYZER_SIMILARITY_MODEL', 'all-MiniLM-L6-v2')
+
+# Models saved by `manage.py download_models` are loaded from <dir>/<model name>.
+# Offline mode stops the model libraries from contacting the Hugging Face hub
+ANALYZER_MODEL_DIR = Path(os.environ.get('ANALYZER_MODEL_DIR', BASE_DIR / 'models'))
+ANALYZER_MODELS_OFFLINE = os.environ.get('ANALYZER_MODELS_OFFLINE', 'True') == 'True'
+
+# Similarity model runtime: torch, onnx or onnx-int8 (CPU, no PyTorch needed).
+# The ONNX backends read the model written by `manage.py export_embedding_model`
+ANALYZER_EMBEDDING_BACKEND = os.environ.get('ANALYZER_EMBEDDING_BACKEND', 'torch')
+ANALYZER_ONNX_MODEL_DIR = Path(os.environ.get(
+    'ANALYZER_ONNX_MODEL_DIR', ANALYZER_MODEL_DIR / f'{ANALYZER_SIMILARITY_MODEL}-onnx'
+))
+# onnxruntime intra-op threads (0 lets onnxruntime decide)
+ANALYZER_ONNX_THREADS = int(os.environ.get('ANALYZER_ONNX_THREADS', 0))
+
+# Shared embedding server (`manage.py run_embedding_server`). When the socket is
+# set, processes send encode calls there instead of loading their own model,
+# and fall back to in-process inference while the server is unreachable
+ANALYZER_EMBEDDING_SERVER_SOCKET = os.environ.get('ANALYZER_EMBEDDING_SERVER_SOCKET', '')
+# Concurrent requests are merged into batches of up to this many texts,
+# waiting at most this long for more requests to arrive
+ANALYZER_EMBEDDING_SERVER_MAX_BATCH = int(os.environ.get('ANALYZER_EMBEDDING_SERVER_MAX_BATCH', 64))
+ANALYZER_EMBEDDING_SERVER_MAX_WAIT_MS = float(os.environ.get('ANALYZER_EMBEDDING_SERVER_MAX_WAIT_MS', 5))
+# Seconds to wait for a response, and before retrying a server that was down
+ANALYZER_EMBEDDING_SERVER_TIMEOUT = float(os.environ.get('ANALYZER_EMBEDDING_SERVER_TIMEOUT', 30))
+ANALYZER_EMBEDDING_SERVER_RETRY = float(os.environ.get('ANALYZER_EMBEDDING_SERVER_RETRY', 30))
+# Shared secret clients present to the server (defaults to SECRET_KEY). The
+# server refuses to start with the development key committed above
+ANALYZER_EMBEDDING_SERVER_KEY = os.environ.get('ANALYZER_EMBEDDING_SERVER_KEY', SECRET_KEY)
+
+# Load and warm up the models when the app starts (enable for web/worker processes)
+ANALYZER_PRELOAD_MODELS = os.environ.get('ANALYZER_PRELOAD_MODELS', 'False') == 'True'
+
+# Analysis job queue (see analyzer/jobs.py and `manage.py run_analysis_worker`)
+# When disabled, uploads are analyzed inside the request as before
+ANALYZER_ASYNC_JOBS = os.environ.get('ANALYZER_ASYNC_JOBS', 'True') == 'True'
+ANALYZER_WORKER_CONCURRENCY = int(os.environ.get('ANALYZER_WORKER_CONCURRENCY', 2))
+ANALYZER_WORKER_POLL_INTERVAL = float(os.environ.get('ANALYZER_WORKER_POLL_INTERVAL', 1.0))
+ANALYZER_JOB_MAX_RETRIES = int(os.environ.get('ANALYZER_JOB_MAX_RETRIES', 2))
+# Seconds a job may stay in "processing" before it is considered stuck
+ANALYZER_JOB_STUCK_TIMEOUT = int(os.environ.get('ANALYZER_JOB_STUCK_TIMEOUT', 600))
+# Seconds between stuck-job checks by each worker, whether or not the queue is empty
+ANALYZER_JOB_RECLAIM_INTERVAL = float(os.environ.get('ANALYZER_JOB_RECLAIM_INTERVAL', 60))
+
+# Batch screening: texts per nlp.pipe / encode batch, and resumes per request
+ANALYZER_BATCH_SIZE = int(os.environ.get('ANALYZER_BATCH_SIZE', 32))
+ANALYZER_MAX_BATCH_FILES = int(os.environ.get('ANALYZER_MAX_BATCH_FILES', 500))
+DATA_UPLOAD_MAX_NUMBER_FILES = ANALYZER_MAX_BATCH_FILES
+
+# Skill taxonomy (JSON or CSV) compiled into the skill matcher; see analyzer/utils/skill_matcher.py
+ANALYZER_SKILL_TAXONOMY = os.environ.get(
+    'ANALYZER_SKILL_TAXONOMY', str(BASE_DIR / 'analyzer' / 'data' / 'skills.json')
+)
+
+# Extraction budgets: longer documents are cut short and flagged as truncated
+ANALYZER_PDF_MAX_PAGES = int(os.environ.get('ANALYZER_PDF_MAX_PAGES', 50))
+ANALYZER_MAX_TEXT_CHARS = int(os.environ.get('ANALYZER_MAX_TEXT_CHARS', 200000))
+ANALYZER_EXTRACTION_TIME_BUDGET = float(os.environ.get('ANALYZER_EXTRACTION_TIME_BUDGET', 20.0))
+# PDFs with at least this many pages are extracted in page ranges across a process pool
+ANALYZER_PDF_PARALLEL_MIN_PAGES = int(os.environ.get('ANALYZER_PDF_PARALLEL_MIN_PAGES', 16))
+ANALYZER_PDF_PAGES_PER_TASK = int(os.environ.get('ANALYZER_PDF_PAGES_PER_TASK', 8))
+ANALYZER_PDF_WORKERS = int(os.environ.get('ANALYZER_PDF_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Resumes are embedded section by section in windows that fit the similarity
+# model (MiniLM reads 256 word pieces, roughly 150-200 words)
+ANALYZER_CHUNK_MAX_WORDS = int(os.environ.get('ANALYZER_CHUNK_MAX_WORDS', 150))
+ANALYZER_CHUNK_OVERLAP_WORDS = int(os.environ.get('ANALYZER_CHUNK_OVERLAP_WORDS', 30))
+# How chunk scores combine into the similarity score: max, mean or weighted
+ANALYZER_SIMILARITY_AGGREGATION = os.environ.get('ANALYZER_SIMILARITY_AGGREGATION', 'weighted')
+
+# Candidate search over stored resume embeddings: "exact" (NumPy) or "hnsw" (needs hnswlib)
+ANALYZER_VECTOR_INDEX = os.environ.get('ANALYZER_VECTOR_INDEX', 'exact')
+ANALYZER_CANDIDATES_TOP_K = int(os.environ.get('ANALYZER_CANDIDATES_TOP_K', 20))
+# Job postings listed when one resume is matched against all open postings
+ANALYZER_MATCH_TOP_K = int(os.environ.get('ANALYZER_MATCH_TOP_K', 20))
+
+# Process pool behind the async analyze endpoints (0 runs analyses in a thread instead);
+# each process keeps warm models, so budget roughly one model set of memory per worker
+ANALYZER_POOL_WORKERS = int(os.environ.get('ANALYZER_POOL_WORKERS', 2))
+# Analyses submitted per pool process at once; beyond that requests wait for a slot
+ANALYZER_POOL_MAX_IN_FLIGHT = int(os.environ.get('ANALYZER_POOL_MAX_IN_FLIGHT', 2))
+# Seconds a request waits for a free slot before it is refused with 503
+ANALYZER_POOL_QUEUE_TIMEOUT = int(os.environ.get('ANALYZER_POOL_QUEUE_TIMEOUT', 30))
+# Scheduling priority offset of pool processes, so request handling wins the CPU
+ANALYZER_POOL_NICE = int(os.environ.get('ANALYZER_POOL_NICE', 10))
+
+# Analyses per history page (keyset pagination, see analyzer/history.py)
+ANALYZER_HISTORY_PAGE_SIZE = int(os.environ.get('ANALYZER_HISTORY_PAGE_SIZE', 20))
+
+# Prometheus-format stage timings, model, cache and queue metrics at /metrics.
+# Off by default since they expose queue depth and memory; when a token is set,
+# scrapers must send it as "Authorization: Bearer <token>"
+ANALYZER_METRICS_ENABLED = os.environ.get('ANALYZER_METRICS_ENABLED', 'False') == 'True'
+ANALYZER_METRICS_TOKEN = os.environ.get('ANALYZER_METRICS_TOKEN', '')
+# Interface of the --metrics-port servers of the worker and embedding server
+# (same token); set to 0.0.0.0 to scrape them from another host
+ANALYZER_METRICS_HOST = os.environ.get('ANALYZER_METRICS_HOST', '127.0.0.1')
@@ -4,8 +4,8 @@ set -o errexit
 
 pip install -r requirements.txt
 
-# Download the spaCy model
-python -m spacy download en_core_web_sm
+# Save the NLP models locally so workers never download them at startup
+python manage.py download_models
 
 python manage.py collectstatic --no-input
 python manage.py migrate
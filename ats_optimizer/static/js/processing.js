@@ -0,0 +1,31 @@
+// Processing page: poll the analysis status until the job finishes
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('analysisStatus');
+    if (!container) return;
+
+    const statusUrl = container.dataset.statusUrl;
+    const statusText = document.getElementById('statusText');
+    const statusError = document.getElementById('statusError');
+    const pollInterval = 2000;
+
+    function poll() {
+        fetch(statusUrl, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(payload => {
+                const data = payload.data;
+                statusText.textContent = data.status;
+
+                if (data.status === 'completed') {
+                    window.location.href = data.results_url;
+                } else if (data.status === 'failed') {
+                    statusError.textContent = data.error || 'Analysis failed.';
+                    statusError.classList.remove('d-none');
+                } else {
+                    setTimeout(poll, pollInterval);
+                }
+            })
+            .catch(() => setTimeout(poll, pollInterval * 2));
+    }
+
+    setTimeout(poll, pollInterval);
+});
@@ -0,0 +1,27 @@
+// Results page: fetch the extracted resume text only when it is shown
+document.addEventListener('DOMContentLoaded', function() {
+    const container = document.getElementById('resumeText');
+    if (!container) return;
+
+    const button = document.getElementById('showResumeText');
+    const body = document.getElementById('resumeTextBody');
+    const content = document.getElementById('resumeTextContent');
+    let loaded = false;
+
+    button.addEventListener('click', function() {
+        const hidden = body.classList.toggle('d-none');
+        button.textContent = hidden ? 'Show' : 'Hide';
+        if (hidden || loaded) return;
+
+        loaded = true;
+        fetch(container.dataset.textUrl, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(payload => {
+                content.textContent = payload.data.text || 'No text was extracted.';
+            })
+            .catch(() => {
+                loaded = false;
+                content.textContent = 'Could not load the text.';
+            });
+    });
+});